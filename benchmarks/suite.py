@@ -0,0 +1,956 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks of tinyDisplay rendering.
+
+Each scenario builds the widgets it measures and prints its results.  Run a
+scenario with `python -m benchmarks.suite <scenario> [options]` from the
+root of the repository and use `--help` to list the scenarios or the
+options of one of them.
+"""
+
+import argparse
+import functools
+import gc
+import inspect
+import multiprocessing
+import os
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from PIL import ImageFont
+
+from tinyDisplay.cfg import load
+from tinyDisplay.font import bmImageFont
+from tinyDisplay.render.character import hd44780
+from tinyDisplay.render.collection import canvas
+from tinyDisplay.render.parallel import renderPool
+from tinyDisplay.render.widget import rectangle, scroll, text
+from tinyDisplay.utility import animate, dataset
+
+
+REFERENCE = Path(__file__).parent.parent / "tests/reference"
+
+SCENARIOS = {}
+
+
+def scenario(*options):
+    """
+    Register a scenario along with its command line options.
+
+    :param options: (args, kwargs) for each option of the scenario, as
+        given to `argparse.ArgumentParser.add_argument`
+    """
+
+    def register(func):
+        SCENARIOS[func.__name__] = (func, options)
+        return func
+
+    return register
+
+
+def option(*args, **kwargs):
+    """Return a scenario option (see `scenario`)."""
+    return (args, kwargs)
+
+
+def time_frames(render, frames, update=None):
+    """
+    Return the time per frame in ms.
+
+    :param render: Renders a frame
+    :param frames: The number of frames to render
+    :param update: Called with the frame number before each frame
+    """
+    start = time.perf_counter()
+    for i in range(frames):
+        if update is not None:
+            update(i)
+        render()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+# Widget state
+
+
+def make_menu_groups(count, ds, perGroup=10):
+    """Make count menu items arranged in groups of perGroup."""
+    groups = []
+    for g in range(count // perGroup):
+        group = canvas(
+            name=f"group{g}",
+            size=(128, 8),
+            dactiveWhen=f"menu['selected'] == {g % 8}",
+            dataset=ds,
+        )
+        items = [
+            text(
+                name=f"item{g * perGroup + j}",
+                dvalue=f"f\"{{menu['prefix']}} {g * perGroup + j}\"",
+                dataset=ds,
+            )
+            for j in range(perGroup)
+        ]
+        groups.append((group, items))
+    return groups
+
+
+@scenario(
+    option("--count", type=int, default=1000),
+    option("--renders", type=int, default=20),
+)
+def widget_memory(args):
+    """
+    Measure the memory used by a large page of widgets.
+
+    Builds a canvas containing a generated menu of text widgets (each with a
+    dynamic value and an activeWhen test) and reports the memory allocated
+    per widget along with the time taken to render the page.
+
+    Only the widget layout of the checked out revision is measured.  To
+    compare layouts, run the scenario on a checkout of each revision.
+    """
+    ds = dataset({"menu": {"prefix": "Item", "selected": 0}})
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    groups = make_menu_groups(args.count, ds)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    page = canvas(name="menu", size=(256, 64), dataset=ds)
+    for g, (group, items) in enumerate(groups):
+        for j, item in enumerate(items):
+            group.append(item, placement=(j * 12, 0))
+        page.append(group, placement=(0, (g % 8) * 8))
+
+    elapsed = time_frames(
+        page.render,
+        args.renders,
+        lambda i: ds.update("menu", {"selected": i % 8}, merge=True),
+    )
+
+    used = after - before
+    print(f"Widgets:           {args.count}")
+    print(f"Total memory:      {used / 1024:.1f} KiB")
+    print(f"Memory per widget: {used / args.count:.0f} bytes")
+    print(f"Render time:       {elapsed:.2f} ms/frame")
+
+
+@scenario(
+    option("--count", type=int, default=100),
+    option("--renders", type=int, default=300),
+)
+def idle_render(args):
+    """
+    Measure the cost of rendering a page whose content is not changing.
+
+    Builds a canvas of text widgets that all depend upon the same dataset
+    value and reports the time taken to render the page when none of the
+    data changes.
+    """
+    ds = dataset({"db": {"value": 1}})
+    page = canvas(name="page", size=(256, 64), dataset=ds)
+    for i in range(args.count):
+        page.append(
+            text(name=f"t{i}", dvalue="db['value']", dataset=ds),
+            placement=((i % 16) * 16, (i // 16) * 8),
+        )
+    page.render()
+
+    elapsed = time_frames(page.render, args.renders)
+    print(f"Widgets:     {args.count}")
+    print(f"Render time: {elapsed:.3f} ms/frame")
+
+
+# Concurrent rendering
+
+
+def make_panel(index, ds, lines=8):
+    """Make a panel of text widgets that change every frame."""
+    panel = canvas(name=f"panel{index}", size=(128, 64), dataset=ds)
+    for j in range(lines):
+        panel.append(
+            text(
+                dvalue=f"f\"Panel {index} line {j} frame {{db['frame']}}\"",
+                dataset=ds,
+            ),
+            placement=(0, j * 8),
+        )
+    return panel
+
+
+@scenario(
+    option("--panels", type=int, default=8),
+    option("--frames", type=int, default=50),
+    option(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, multiprocessing.cpu_count()}),
+    ),
+)
+def parallel_render(args):
+    """
+    Measure how rendering independent subtrees scales across processes.
+
+    Builds a page of panels, each containing several text widgets that
+    change every frame, and reports the time per frame when the page is
+    rendered serially and when its panels are rendered by a renderPool with
+    an increasing number of processes.
+    """
+
+    def placement(i):
+        return ((i % 2) * 128, (i // 2) * 64)
+
+    ds = dataset({"db": {"frame": 0}})
+    page = canvas(name="page", size=(256, 256), dataset=ds)
+    for i in range(args.panels):
+        page.append(make_panel(i, ds), placement=placement(i))
+    serial = time_frames(
+        page.render, args.frames, lambda i: ds.update("db", {"frame": i})
+    )
+    print(f"CPUs: {multiprocessing.cpu_count()}  Panels: {args.panels}")
+    print(f"Serial:        {serial:.2f} ms/frame")
+
+    for n in args.processes:
+        ds = dataset({"db": {"frame": 0}})
+        with renderPool(dataset=ds, processes=n) as pool:
+            page = canvas(name="page", size=(256, 256), dataset=ds)
+            for i in range(args.panels):
+                page.append(
+                    pool.subtree(functools.partial(make_panel, i)),
+                    placement=placement(i),
+                )
+            elapsed = time_frames(
+                functools.partial(pool.render, page),
+                args.frames,
+                lambda i: ds.update("db", {"frame": i}),
+            )
+        print(
+            f"{n} process{'es' if n > 1 else '  '}:   {elapsed:.2f} ms/frame "
+            f"({serial / elapsed:.2f}x)"
+        )
+
+
+@scenario(
+    option("--count", type=int, default=8),
+    option("--frames", type=int, default=100),
+    option("--size", type=int, default=28),
+)
+def threaded_canvas(args):
+    """
+    Compare sequential and threaded rendering of a canvas's widgets.
+
+    Builds a canvas of TrueType text widgets that change every frame and
+    reports the time per frame with and without `threaded=True`.
+    """
+    font = ImageFont.load_default(size=args.size)
+    print(f"CPUs: {os.cpu_count()}  Widgets: {args.count}")
+    for threaded in (False, True):
+        ds = dataset({"db": {"frame": 0}})
+        page = canvas(
+            name="page",
+            size=(512, 32 * args.count),
+            threaded=threaded,
+            dataset=ds,
+        )
+        for i in range(args.count):
+            page.append(
+                text(
+                    dvalue=f"f\"Line {i} of the page at frame "
+                    f"{{db['frame']}}\"",
+                    font=font,
+                    dataset=ds,
+                ),
+                placement=(0, i * 32),
+            )
+        elapsed = time_frames(
+            page.render, args.frames, lambda i: ds.update("db", {"frame": i})
+        )
+        label = "Threaded" if threaded else "Sequential"
+        print(f"{label}: {elapsed:.2f} ms/frame")
+
+
+# Skipping work
+
+
+@scenario(
+    option("--seconds", type=float, default=5),
+    option("--cps", type=int, default=30),
+)
+def lookahead(args):
+    """
+    Measure the CPU used by an animate thread with and without lookahead.
+
+    Builds a page with a clock (changing once per second), a paused scroll
+    and a block of text that only changes when its data is updated, then
+    animates it for a number of seconds with and without passing the page
+    to animate as its widget.  Reports the renders performed and the CPU
+    time consumed.
+    """
+    for name, ahead in (("Fixed rate", False), ("Lookahead", True)):
+        ds = dataset(
+            {"db": {"title": "A title that is too long to fit", "value": 1}}
+        )
+        page = canvas(name="page", size=(128, 32), dataset=ds)
+        page.append(
+            text(
+                name="clock", dvalue="time.strftime('%H:%M:%S')", dataset=ds
+            ),
+            placement=(0, 0),
+        )
+        page.append(
+            scroll(
+                name="title",
+                widget=text(dvalue="db['title']", dataset=ds),
+                size=(128, 8),
+                actions=[("pause", 1000), ("rtl",)],
+                dataset=ds,
+            ),
+            placement=(0, 8),
+        )
+        for i in range(16):
+            page.append(
+                text(name=f"t{i}", dvalue="db['value']", dataset=ds),
+                placement=((i % 8) * 16, 16 + (i // 8) * 8),
+            )
+
+        a = animate(
+            function=page.render,
+            cps=args.cps,
+            queueSize=1000000,
+            widget=page if ahead else None,
+        )
+        page.resetRenderStats()
+        start = time.process_time()
+        a.start()
+        time.sleep(args.seconds)
+        a.stop()
+        cpu = time.process_time() - start
+        print(
+            f"{name:12} {page.renderStats['calls']:5d} renders  "
+            f"{cpu / args.seconds * 100:5.1f}% CPU"
+        )
+
+
+@scenario(
+    option("--frames", type=int, default=600),
+    option("--count", type=int, default=12),
+    option("--cps", type=int, default=30),
+)
+def update_period(args):
+    """
+    Measure the effect of giving slow changing widgets an update period.
+
+    Builds a page with a scroll that moves every tick, a seconds clock and a
+    panel of status widgets whose values are recomputed from the dataset.
+    The page is rendered at a fixed rate with and without `updateEvery` on
+    the clock and status widgets, and the time per frame and the number of
+    widget renders are reported.
+    """
+    for name, clockEvery, statusEvery in (
+        ("Every tick", None, None),
+        ("updateEvery", "1s", args.cps),
+    ):
+        ds = dataset(
+            {
+                "db": {
+                    "title": "A title that is too long to fit on the display"
+                },
+                "sys": {"load": [1.5] * 8, "temp": [40, 45, 50]},
+            }
+        )
+        page = canvas(
+            name="page", size=(128, 16 + 8 * args.count), dataset=ds
+        )
+        page.append(
+            scroll(
+                widget=text(dvalue="db['title']", dataset=ds),
+                size=(128, 8),
+                actions=[("rtl",)],
+                dataset=ds,
+            ),
+            placement=(0, 0),
+        )
+        page.append(
+            text(
+                dvalue="time.strftime('%H:%M:%S')",
+                updateEvery=clockEvery,
+                dataset=ds,
+            ),
+            placement=(0, 8),
+        )
+        for i in range(args.count):
+            page.append(
+                text(
+                    dvalue=f"f\"CPU {{sum(sys['load'][:{i + 1}]):.1f}}% "
+                    f"{{max(sys['temp'])}}C\"",
+                    updateEvery=statusEvery,
+                    dataset=ds,
+                ),
+                placement=(0, 16 + i * 8),
+            )
+
+        def update(i):
+            if i % args.cps == 0:
+                ds.update("sys", {"load": [1.5 + i % 7] * 8})
+
+        page.resetRenderStats()
+        elapsed = time_frames(page.render, args.frames, update)
+        renders = sum(
+            w.renderStats["calls"] for w, off, just in page._placements
+        )
+        print(f"{name:12} {elapsed:6.3f} ms/frame  {renders:6d} renders")
+
+
+@scenario(
+    option("--frames", type=int, default=300),
+    option("--count", type=int, default=8),
+)
+def occlusion(args):
+    """
+    Measure the effect of culling widgets hidden beneath an opaque overlay.
+
+    Builds a page with a busy background (a scroll and a panel of text
+    widgets that change every frame) and a full screen alert above it.  The
+    page is rendered with the alert showing, once with an opaque alert (the
+    background is culled) and once with a transparent one (the background
+    renders).
+    """
+    for name, opaque in (("Transparent", False), ("Opaque", True)):
+        ds = dataset(
+            {"db": {"title": "A title that is too long to fit", "frame": 0}}
+        )
+        page = canvas(name="page", size=(128, 8 + 8 * args.count), dataset=ds)
+        page.append(
+            scroll(
+                widget=text(dvalue="db['title']", dataset=ds),
+                size=(128, 8),
+                actions=[("rtl",)],
+                dataset=ds,
+            ),
+            placement=(0, 0),
+        )
+        for i in range(args.count):
+            page.append(
+                text(
+                    dvalue=f"f\"Line {i} frame {{db['frame']}}\"",
+                    size=(128, 8),
+                    dataset=ds,
+                ),
+                placement=(0, 8 + i * 8),
+            )
+        alert = canvas(
+            name="alert",
+            size=page.size,
+            background="black",
+            opaque=opaque,
+            dataset=ds,
+        )
+        alert.append(text(value="ALERT", dataset=ds), placement="mm")
+        page.append(alert, z=canvas.ZHIGH)
+
+        page.resetRenderStats()
+        elapsed = time_frames(
+            page.render, args.frames, lambda i: ds.update("db", {"frame": i})
+        )
+        renders = page.renderReport()
+        hidden = sum(c["calls"] for c in renders["children"][:-1])
+        print(f"{name:12} {elapsed:6.3f} ms/frame  {hidden:6d} hidden renders")
+
+
+@scenario(
+    option("--count", type=int, default=48),
+    option("--frames", type=int, default=2000),
+)
+def canvas_placement(args):
+    """
+    Measure the fixed per-frame cost of compositing a canvas with many widgets.
+
+    Builds a canvas of small text widgets placed with a mix of
+    justifications.  One widget changes on every frame so the canvas is
+    composited each time, while the others reuse their images.  Reports the
+    time per frame.
+    """
+    justs = ("lt", "mt", "rt", "lm", "mm", "rm", "lb", "mb", "rb")
+    ds = dataset({"db": {"frame": 0}})
+    page = canvas(name="page", size=(256, 64), dataset=ds)
+    page.append(text(dvalue="str(db['frame'])", dataset=ds), placement="mm")
+    for i in range(args.count - 1):
+        page.append(
+            text(value=f"{i:02d}", dataset=ds),
+            placement=((i % 8) * 4, (i // 8) * 2, justs[i % len(justs)]),
+        )
+    elapsed = time_frames(
+        page.render, args.frames, lambda i: ds.update("db", {"frame": i})
+    )
+    print(f"{args.count} widgets: {elapsed:.3f} ms/frame")
+
+
+@scenario(
+    option("--count", type=int, default=8),
+    option("--frames", type=int, default=5000),
+)
+def frozen(args):
+    """
+    Measure the cost of rendering a static menu with and without freezing it.
+
+    Builds a menu canvas of labels and a border that never change after they
+    are loaded and renders it every tick, first normally and then frozen.
+    """
+    for name, freeze in (("Normal", False), ("Frozen", True)):
+        ds = dataset()
+        menu = canvas(name="menu", size=(128, 8 * args.count + 4), dataset=ds)
+        menu.append(
+            rectangle(
+                xy=(0, 0, 127, 8 * args.count + 3), outline="white", dataset=ds
+            )
+        )
+        for i in range(args.count):
+            menu.append(
+                text(value=f"Menu item {i + 1}", dataset=ds),
+                placement=(4, 2 + i * 8),
+            )
+        if freeze:
+            menu.freeze()
+        elapsed = time_frames(menu.render, args.frames) * 1000
+        print(f"{name:8} {elapsed:8.2f} us/frame")
+
+
+# Fonts and text
+
+
+@scenario(
+    option("--font", default=str(REFERENCE / "fonts/latin1_5x8.fnt")),
+    option("--count", type=int, default=5000),
+)
+def bitmap_font(args):
+    """
+    Measure bitmap font text rendering.
+
+    Renders strings with `bmImageFont.getmask`, both strings that have not
+    been seen before and a small set of strings that repeat (e.g. a clock),
+    and reports the time per call.
+    """
+
+    def measure(strings, mode):
+        start = time.perf_counter()
+        for s in strings:
+            font.getmask(s, mode)
+        return (time.perf_counter() - start) / len(strings) * 1e6
+
+    font = bmImageFont(args.font)
+    unique = [
+        f"Elapsed {i // 60}:{i % 60:02d} of 4:13" for i in range(args.count)
+    ]
+    repeated = [f"{i % 10:02d}:{i % 60:02d}" for i in range(args.count)]
+    for mode in ("1", "L"):
+        print(
+            f"mode {mode}: unique {measure(unique, mode):7.1f} us  "
+            f"repeated {measure(repeated, mode):7.1f} us"
+        )
+
+
+@scenario(
+    option("--count", type=int, default=50),
+    option("fonts", nargs="*", default=["hd44780.fnt", "latin1_5x8.fnt"]),
+)
+def font_load(args):
+    """
+    Measure the time taken to load a bitmap font.
+
+    Loads each font from its `.fnt` file and images, then from the compiled
+    cache written by the first load.  Reports the time per load.
+    """
+
+    def measure(fileName, cache):
+        start = time.perf_counter()
+        for _ in range(args.count):
+            bmImageFont(fileName, cache=cache)
+        return (time.perf_counter() - start) / args.count * 1000
+
+    for name in args.fonts:
+        fileName = str(REFERENCE / "fonts" / name)
+        bmImageFont(fileName)
+        parsed = measure(fileName, False)
+        cached = measure(fileName, True)
+        print(f"{name:20} parsed {parsed:6.2f} ms  cached {cached:6.2f} ms")
+
+
+@scenario(
+    option("--frames", type=int, default=20000),
+    option("--widgets", type=int, default=4),
+)
+def text_cache(args):
+    """
+    Measure the memory held by text measurement caches on a long running page.
+
+    Renders a group of text widgets showing an elapsed time and a wrapped
+    track title that change on every frame (as a player would over a long
+    uptime) and reports the time per frame, the number of cached
+    measurements and the memory they retain.
+    """
+    ds = dataset({"db": {"elapsed": 0, "title": ""}})
+    clock = "f\"{db['elapsed'] // 60}:{db['elapsed'] % 60:02d}\""
+    widgets = [text(dvalue=clock, dataset=ds) for _ in range(args.widgets)]
+    widgets.append(
+        text(
+            dvalue="db['title']",
+            wrap=True,
+            size=(60, 16),
+            width=60,
+            dataset=ds,
+        )
+    )
+
+    def update(i):
+        title = f"Track {i} by artist {i % 97}"
+        ds.update("db", {"elapsed": i, "title": title})
+
+    def render():
+        for w in widgets:
+            w.render()
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    elapsed = time_frames(render, args.frames, update)
+    retained = (tracemalloc.get_traced_memory()[0] - base) / 1024
+    tracemalloc.stop()
+
+    caches = {
+        id(getattr(w, c)): getattr(w, c)
+        for w in widgets
+        for c in ("_size_cache", "_advance_cache")
+    }
+    entries = sum(len(c) for c in caches.values())
+    print(
+        f"{args.frames} frames: {elapsed:.3f} ms/frame  "
+        f"{entries} cached measurements  {retained:.0f} KiB retained"
+    )
+
+
+@scenario(
+    option("--count", type=int, default=48),
+    option("--frames", type=int, default=1000),
+)
+def text_images(args):
+    """
+    Measure the cost of drawing text that other widgets have already drawn.
+
+    Builds a page of text widgets showing clock digits, counters and unit
+    labels that repeat across widgets and over time, updates the values
+    every frame and reports the time per frame.
+    """
+    ds = dataset({"db": {"tick": 0}})
+    page = canvas(name="page", size=(256, 64), dataset=ds)
+    for i in range(args.count):
+        value = (
+            f"f\"{{(db['tick'] + {i}) % 60:02d}}\"",
+            f"f\"{{(db['tick'] // 10 + {i}) % 100}}%\"",
+            "'dB'" if i % 2 else "'kHz'",
+        )[i % 3]
+        page.append(
+            text(dvalue=value, dataset=ds),
+            placement=((i % 8) * 32, (i // 8) * 8),
+        )
+    elapsed = time_frames(
+        page.render, args.frames, lambda i: ds.update("db", {"tick": i})
+    )
+    print(f"{args.count} widgets: {elapsed:.3f} ms/frame")
+
+
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while singing along to "
+    "songs about summer nights and long drives through empty streets"
+).split()
+
+
+@scenario(
+    option("--count", type=int, default=300),
+    option("--words", type=int, default=200),
+    option("--width", type=int, default=100),
+)
+def wrap(args):
+    """
+    Measure wrapping long text that changes on every render.
+
+    Wraps paragraphs of generated words (as an RSS description or lyrics
+    display would) with a different paragraph each time, and reports the
+    time per wrap.
+    """
+    rnd = random.Random(0)
+    values = [
+        " ".join(rnd.choice(WORDS) for _ in range(args.words))
+        for _ in range(args.count)
+    ]
+    w = text(value="")
+    start = time.perf_counter()
+    for value in values:
+        w._makeWrapped(value, args.width)
+    elapsed = (time.perf_counter() - start) / args.count * 1000
+    print(f"{args.words} words: {elapsed:.3f} ms/wrap")
+
+
+STATUSWORDS = (
+    "the quick brown fox jumps over lazy dog elapsed packets errors load "
+    "artist album title playing paused stopped volume 12:34 99.5% ▶"
+).split()
+
+
+@scenario(option("--count", type=int, default=20000))
+def measure_text(args):
+    """
+    Measure the speed of bitmap font string measurement.
+
+    Measures a set of words and multi-line values with
+    `bmImageFont.getsize` and with a text widget's `_sizeLine` (with its
+    measurement cache cleared so every value is measured), and reports the
+    time per string.
+    """
+    rnd = random.Random(1)
+    words = [rnd.choice(STATUSWORDS) for _ in range(args.count)]
+    values = [
+        "\n".join(
+            " ".join(rnd.choice(STATUSWORDS) for _ in range(4))
+            for _ in range(3)
+        )
+        for _ in range(args.count)
+    ]
+
+    t = text("x")
+    font = t._font
+    for name, strings in (("words", words), ("multi-line", values)):
+        start = time.perf_counter()
+        for s in strings:
+            font.getsize(s)
+        getsize = (time.perf_counter() - start) / len(strings) * 1e6
+
+        start = time.perf_counter()
+        for s in strings:
+            t._size_cache.clear()
+            t._sizeLine(s)
+        sizeLine = (time.perf_counter() - start) / len(strings) * 1e6
+        print(
+            f"{name:10} getsize {getsize:.2f} us, _sizeLine {sizeLine:.2f} us"
+        )
+
+
+ITEM = "Headline {i}: the quick brown fox jumps over the lazy dog.  "
+
+
+@scenario(
+    option("--frames", type=int, default=3000),
+    option("--items", type=int, default=70),
+    option("--mode", default="RGBA"),
+)
+def long_scroll(args):
+    """
+    Measure scrolling a very long line of text.
+
+    Scrolls a news ticker style line (about 20,000 pixels of text) across a
+    128x16 scroll widget, with and without virtual text.  Reports the time
+    to build the widgets, the time per frame and the memory held by the
+    images of the text.
+    """
+
+    def imageBytes(s):
+        images = [s._widget.image]
+        if s._aWI is not None:
+            images.append(s._aWI)
+        tiles = s._widget._tiles
+        if tiles is not None:
+            images += [tiles._tile(i) for i in list(tiles._tiles._items)]
+        return sum(i.width * i.height * len(i.getbands()) for i in images)
+
+    value = "".join(ITEM.format(i=i) for i in range(args.items))
+    for virtual in (False, True):
+        start = time.perf_counter()
+        t = text(value, virtual=virtual, mode=args.mode)
+        s = scroll(widget=t, size=(128, 16), mode=args.mode)
+        built = (time.perf_counter() - start) * 1000
+
+        elapsed = time_frames(s.render, args.frames)
+        kind = "virtual" if virtual else "full"
+        print(
+            f"{kind:8} build {built:.1f} ms, {elapsed:.3f} ms/frame, "
+            f"{imageBytes(s) / 1024:.0f} KiB of text images"
+        )
+
+
+# Character displays
+
+
+STATUSLINES = (
+    "f\"Elapsed     {db['t'] // 60:02d}:{db['t'] % 60:02d}\"",
+    "f\"Packets  {db['rx']:>11d}\"",
+    "f\"Errors   {db['err']:>11d}\"",
+    "f\"Load     {db['load']:>10.1f}%\"",
+)
+
+
+def make_status_page(ds, mode):
+    """Make a 20x4 character page."""
+    page = canvas(name="page", size=(100, 32), mode=mode, dataset=ds)
+    for i, line in enumerate(STATUSLINES):
+        page.append(
+            text(dvalue=line, mode=mode, dataset=ds), placement=(0, i * 8)
+        )
+    return page
+
+
+def update_status(ds, i):
+    """Change the values of the status page by a character or two."""
+    ds.update(
+        "db",
+        {"t": i, "rx": i * 3, "err": i // 50, "load": (i % 1000) / 10},
+    )
+
+
+@scenario(
+    option("--frames", type=int, default=3000),
+    option("--mode", default="1"),
+)
+def cell_render(args):
+    """
+    Measure updating a character display layout one value at a time.
+
+    Builds a 20x4 character layout (four lines of HD44780 style text)
+    showing an elapsed time and counters.  Each frame changes one of the
+    values by a character or two, as a player or status screen would, and
+    the time per frame is reported.
+    """
+    ds = dataset({"db": {"t": 0, "rx": 0, "err": 0, "load": 0.0}})
+    page = make_status_page(ds, args.mode)
+    elapsed = time_frames(
+        page.render, args.frames, functools.partial(update_status, ds)
+    )
+    print(f"{args.mode:5} {elapsed:.3f} ms/frame")
+
+
+class countingInterface:
+    """Count the bytes that would be sent to the display."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def command(self, *cmd):
+        self.bytes += len(cmd)
+
+    def data(self, data):
+        self.bytes += len(data)
+
+
+@scenario(option("--frames", type=int, default=3000))
+def character_mode(args):
+    """
+    Measure driving a 20x4 HD44780 display in character mode.
+
+    Uses the 20x4 status layout of the cell_render scenario.  Each frame is
+    sent to an `hd44780` output either by rendering the page and reading
+    characters back from its pixels or by converting the text widgets
+    straight to characters.  The time per frame and the bytes sent to the
+    display per frame are reported.
+    """
+    for source in ("pixels", "widgets"):
+        ds = dataset({"db": {"t": 0, "rx": 0, "err": 0, "load": 0.0}})
+        interface = countingInterface()
+        lcd = hd44780((20, 4), interface)
+        if source == "pixels":
+            page = make_status_page(ds, "1")
+
+            def render():
+                lcd.display(page.render()[0])
+
+        else:
+            widgets = [
+                (text(dvalue=line, dataset=ds), (0, i))
+                for i, line in enumerate(STATUSLINES)
+            ]
+
+            def render():
+                lcd.displayWidgets(widgets)
+
+        elapsed = time_frames(
+            render, args.frames, functools.partial(update_status, ds)
+        )
+        sent = interface.bytes / args.frames
+        print(f"{source:8} {elapsed:.3f} ms/frame {sent:.1f} bytes/frame")
+
+
+# Page files
+
+
+def make_media_dataset():
+    """Make the dataset used by the basicMedia page file."""
+    ds = dataset()
+    ds.add(
+        "db",
+        {
+            "artist": "David Bowie",
+            "album": "Blackstar",
+            "title": "Sue (Or in a Season of Crime)",
+            "elapsed": 2.34,
+            "length": 93.2,
+            "plPos": 2,
+            "plLen": 7,
+            "state": "play",
+        },
+    )
+    ds.add("sys", {"temp": 53.5, "time": time.time()})
+    return ds
+
+
+@scenario(
+    option("--count", type=int, default=20),
+    option(
+        "pageFile",
+        nargs="?",
+        default=str(REFERENCE / "pageFiles/basicMedia.yaml"),
+    ),
+)
+def page_reload(args):
+    """
+    Measure reloading a page file.
+
+    Loads the same page file repeatedly, as hot reloading or building
+    several displays does, and reports the time per load.
+    """
+    displays = []
+    start = time.perf_counter()
+    for _ in range(args.count):
+        displays.append(load(args.pageFile, dataset=make_media_dataset()))
+    elapsed = (time.perf_counter() - start) / args.count * 1000
+    print(f"{elapsed:.2f} ms/load")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(
+        dest="scenario", metavar="scenario", required=True
+    )
+    for name, (func, options) in SCENARIOS.items():
+        doc = inspect.cleandoc(func.__doc__)
+        sub = subparsers.add_parser(
+            name,
+            help=doc.split("\n")[0],
+            description=doc,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+        for args, kwargs in options:
+            sub.add_argument(*args, **kwargs)
+        sub.set_defaults(func=func)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
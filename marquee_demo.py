@@ -14,6 +14,7 @@ from pathlib import Path
 import time
 from PIL import Image, ImageDraw, ImageFont
 
+from tinyDisplay.font import fonts
 from tinyDisplay.render.widget import text
 from tinyDisplay.render.new_marquee import new_marquee
 
@@ -91,7 +92,7 @@ def create_font(size=14):
     # If default font failed, try common system fonts
     for font_name in ["Arial.ttf", "DejaVuSans.ttf", "Verdana.ttf", "Helvetica.ttf"]:
         try:
-            font = ImageFont.truetype(font_name, size)
+            font = fonts.get(font_name, size)
             print(f"Using system font: {font_name}")
             return font
         except Exception as e:
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of the headless batch renderer for the tinyDisplay system
+"""
+import json
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from tinyDisplay.render.batch import main, run
+from tinyDisplay.utility import image2Text
+
+
+PAGEFILE = Path(__file__).parent / "reference/pageFiles/basicMedia.yaml"
+DATA = {
+    "db": {
+        "artist": "David Bowie",
+        "album": "Blackstar",
+        "title": "Sue (Or in a Season of Crime)",
+        "elapsed": 2.34,
+        "length": 93.2,
+        "plPos": 2,
+        "plLen": 7,
+        "state": "play",
+    },
+    "sys": {"temp": 53.5, "time": 0},
+}
+
+
+def test_batch_replay_png(tmp_path):
+    replay = [{"tick": 4, "db": "sys", "update": {"temp": 102}}]
+    stats = run(
+        PAGEFILE,
+        ticks=5,
+        data=DATA,
+        replay=replay,
+        format="png",
+        output=tmp_path,
+    )
+
+    assert stats["ticks"] == 5 and stats["size"] == [100, 16]
+    lat = stats["latency"]
+    assert 0 < lat["p50"] <= lat["p90"] <= lat["p99"] <= lat["max"]
+
+    # Writing PNG frames slows the run but not the rendering frame rate
+    assert stats["fps"] == pytest.approx(1 / lat["mean"])
+    assert 0 < stats["wallFps"] < stats["fps"]
+
+    frames = sorted(tmp_path.glob("frame*.png"))
+    assert len(frames) == 5
+    ref = Image.open(
+        Path(__file__).parent / "reference/images/basicMediaArtistAlert.png"
+    ).convert("1")
+    with Image.open(frames[-1]) as img:
+        last = img.convert("1")
+    assert image2Text(last) == image2Text(ref)
+
+
+def test_batch_raw(tmp_path):
+    fn = tmp_path / "frames.raw"
+    stats = run(PAGEFILE, ticks=3, data=DATA, format="raw", output=fn)
+    w, h = stats["size"]
+    assert fn.stat().st_size == 3 * w * h * len(stats["mode"])
+
+
+def test_batch_cli(tmp_path, capsys):
+    data = tmp_path / "data.json"
+    data.write_text(json.dumps(DATA))
+    replay = tmp_path / "replay.yaml"
+    replay.write_text("- {tick: 1, db: db, update: {state: stop}}\n")
+    gif = tmp_path / "frames.gif"
+
+    assert (
+        main(
+            [
+                str(PAGEFILE),
+                "--ticks",
+                "20",
+                "--data",
+                str(data),
+                "--replay",
+                str(replay),
+                "--format",
+                "gif",
+                "--output",
+                str(gif),
+                "--tracemalloc",
+                "--json",
+            ]
+        )
+        == 0
+    )
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["ticks"] == 20
+    assert stats["memorySource"] == "tracemalloc" and stats["peakMemory"] > 0
+    with Image.open(gif) as img:
+        assert img.n_frames >= 1
+
+
+def test_batch_invalid_replay():
+    with pytest.raises(ValueError):
+        run(PAGEFILE, ticks=1, data=DATA, replay=[{"tick": 0}])
@@ -12,9 +12,11 @@ from pathlib import Path
 import pytest
 from PIL import Image, ImageChops, ImageDraw
 
+from tinyDisplay.cfg import load
+from tinyDisplay.render import collection
 from tinyDisplay.render.collection import canvas
-from tinyDisplay.render.widget import text
-from tinyDisplay.utility import image2Text
+from tinyDisplay.render.widget import rectangle, scroll, text
+from tinyDisplay.utility import dataset, image2Text
 
 
 def compute_placement(size, wsize, offset, anchor):
@@ -139,3 +141,343 @@ def test_canvas_widget_change():
     img, m2 = c.render()
 
     assert not m1 and m2, "When artist changes, canvas should have changed"
+
+
+def test_canvas_render_plan():
+    db = {"artist": "Sting"}
+    w = text(
+        name="artist", dvalue="db['artist']", dataset={"db": db}, size=(60, 8)
+    )
+    c = canvas(size=(80, 16))
+    c.append(w)
+    c.compileRenderPlan()
+
+    # Only values that can change are evaluated during render
+    assert [name for name, dv in w._evalPlan] == ["_value"]
+
+    entries, waiters = c._renderPlan
+    assert [e[1] for e in entries] == [w] and waiters == []
+
+    # Appending rebuilds the plan
+    s = scroll(widget=text(value="A long line"), size=(20, 8), wait="atStart")
+    c.append(s, placement=(0, 8))
+    entries, waiters = c._renderPlan
+    assert len(entries) == 2 and waiters == [s]
+
+    # Compiling a new value invalidates the widget's plan
+    w._compile("db['artist'] + '!'", "_value", dynamic=True)
+    assert w._evalPlan is None
+    w._dataset.update("db", {"artist": "Moby"})
+    assert c.render()[1]
+    assert w._value == "Moby!"
+
+
+def test_threaded_canvas():
+    def makeCanvas(threaded):
+        c = canvas(size=(19, 24), threaded=threaded)
+        for i, value in enumerate(["Five!", "Four", "Seventeen"]):
+            c.append(
+                scroll(
+                    size=(19, 8),
+                    widget=text(value=value),
+                    actions=[("pause", 5), ("rtl")],
+                    wait="atStart",
+                ),
+                (0, i * 8),
+            )
+        return c
+
+    serial = makeCanvas(False)
+    threaded = makeCanvas(True)
+
+    # Widgets that wait stay aligned and are composited in the same order
+    for _ in range(120):
+        img, changed = threaded.render()
+        simg, schanged = serial.render()
+        assert changed == schanged
+        assert not ImageChops.difference(img, simg).getbbox()
+
+    report = threaded.renderReport()
+    assert report["exclusive"] < report["inclusive"]
+
+
+def test_canvas_update_every():
+    ds = dataset({"db": {"value": 1}})
+    slow = text(dvalue="str(db['value'])", updateEvery=3, dataset=ds)
+    fast = text(dvalue="str(db['value'])", dataset=ds)
+    c = canvas(size=(20, 16), dataset=ds)
+    c.append(slow)
+    c.append(fast, placement=(0, 8))
+    c.resetRenderStats()
+
+    # The slow widget renders once every 3 ticks (counted from the render
+    # caused by the last append) and keeps its last image in between
+    ds.update("db", {"value": 2})
+    renders = []
+    for _ in range(6):
+        c.render()
+        renders.append(slow.renderStats["calls"])
+        assert fast._value == "2"
+    assert renders == [0, 0, 1, 1, 1, 2]
+    assert slow._value == "2"
+    assert fast.renderStats["calls"] == 6
+
+    # Forced renders always include the widget
+    c.render(force=True)
+    assert slow.renderStats["calls"] == 3
+
+    with pytest.raises(ValueError):
+        text(value="x", updateEvery="soon")
+    with pytest.raises(ValueError):
+        text(value="x", updateEvery=0)
+
+
+def test_canvas_update_every_seconds(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(collection, "monotonic", lambda: now[0])
+
+    ds = dataset({"db": {"value": 1}})
+    clock = text(dvalue="str(db['value'])", updateEvery="1s", dataset=ds)
+    c = canvas(size=(20, 8), dataset=ds)
+    c.append(clock)
+    clock.resetRenderStats()
+
+    for t in (100.3, 100.9, 101.0, 101.5, 102.05, 104.2, 104.9):
+        now[0] = t
+        c.render()
+    # Renders at 101.0, 102.05 and 104.2 (a missed period restarts the
+    # schedule from the current time)
+    assert clock.renderStats["calls"] == 3
+    assert clock._nextUpdate == pytest.approx(105.2)
+
+    # Lookahead reports the ticks remaining before the widget is due
+    assert c.nextChange(rate=10) == 3
+
+
+def test_canvas_update_every_page_file(tmp_path):
+    page = tmp_path / "page.yaml"
+    page.write_text(
+        """
+FONTS: {}
+WIDGETS:
+  clock: &clock
+    type: text
+    dvalue: str(db['value'])
+    updateEvery: 4
+DISPLAY:
+  size: [20, 8]
+  items:
+    - name: main
+      type: canvas
+      size: [20, 8]
+      items:
+        - <<: *clock
+"""
+    )
+    ds = dataset({"db": {"value": 1}})
+    display = load(page, dataset=ds)
+    wid = display._placements[0][0]._placements[0][0]
+    assert wid._updateTicks == 4
+
+
+def _overlaid(ds):
+    # A scrolling background beneath a full size alert shown when hot
+    c = canvas(size=(40, 16), dataset=ds)
+    back = scroll(
+        widget=text(value="Background that scrolls", dataset=ds),
+        size=(40, 8),
+        actions=[("pause", 2), ("rtl",)],
+        speed=4,
+        duration=50,
+        dataset=ds,
+    )
+    c.append(back, placement=(0, 4))
+    alert = canvas(
+        size=(40, 16),
+        background="black",
+        opaque=True,
+        activeWhen="sys['temp'] > 100",
+        dataset=ds,
+    )
+    alert.append(text(value="HOT", dataset=ds), placement="mm")
+    c.append(alert, z=canvas.ZHIGH)
+    return c, back
+
+
+def test_canvas_occlusion(monkeypatch):
+    updates = {10: {"temp": 120}, 40: {"temp": 50}, 45: {"temp": 110}}
+
+    def frames():
+        ds = dataset({"sys": {"temp": 50}})
+        c, back = _overlaid(ds)
+        back.resetRenderStats()
+        result = []
+        for t in range(80):
+            if t in updates:
+                ds.update("sys", updates[t])
+            result.append(image2Text(c.render()[0]))
+        return result, back
+
+    culled, back = frames()
+    assert back.renderStats["calls"] < 60
+
+    # The covered widget stays on schedule while it is not rendered
+    with monkeypatch.context() as m:
+        m.setattr(canvas, "_culled", lambda self, *args: False)
+        expected, full = frames()
+    assert full.renderStats["calls"] == 80
+    assert culled == expected
+    assert back._currentDuration == full._currentDuration
+
+
+def test_canvas_off_screen():
+    ds = dataset({"db": {"value": "a"}})
+    c = canvas(size=(20, 8), dataset=ds)
+    hidden = text(dvalue="db['value']", size=(10, 8), dataset=ds)
+    sized = text(dvalue="db['value']", dataset=ds)
+    c.append(hidden, placement=(25, 0))
+    c.append(sized, placement=(25, 0))
+    hidden.resetRenderStats()
+    sized.resetRenderStats()
+    c.render()
+    ds.update("db", {"value": "b"})
+
+    # Only widgets with a fixed size can be culled before rendering
+    assert not c.render()[1]
+    assert hidden.renderStats["calls"] == 0
+    assert sized.renderStats["calls"] == 2
+
+
+def test_canvas_occlusion_active():
+    ds = dataset({"sys": {"temp": 120, "show": True}})
+    c, back = _overlaid(ds)
+    hidden = text(
+        value="Hidden",
+        size=(40, 8),
+        activeWhen="sys['show']",
+        dataset=ds,
+    )
+    c.append(hidden, placement=(0, 0))
+    c.render()
+    assert c._activeList[0] is True
+
+    # Covered widgets still follow their activeWhen
+    ds.update("sys", {"temp": 120, "show": False})
+    hidden.resetRenderStats()
+    c.render()
+    assert hidden.renderStats["calls"] == 0 and c._activeList[0] is False
+
+
+def test_canvas_opacity():
+    c = canvas(size=(20, 8))
+    under = rectangle(xy=(0, 0, 9, 7), fill="white", size=(10, 8))
+    c.append(under)
+
+    # Transparent widgets do not hide the widgets beneath them
+    for mode in ("RGBA", "LA"):
+        c = canvas(size=(20, 8))
+        c.append(under)
+        over = rectangle(
+            xy=(0, 0, 0, 0), fill="white", size=(10, 8), mode=mode
+        )
+        c.append(over, z=canvas.ZHIGH)
+        under.resetRenderStats()
+        c.render(force=True)
+        c.render()
+        assert under.renderStats["calls"] == 2
+
+    # Widgets without transparency, or declared opaque, do
+    for opaque in (
+        rectangle(xy=(0, 0, 0, 0), fill="white", size=(10, 8), mode="RGB"),
+        rectangle(xy=(0, 0, 0, 0), fill="white", size=(10, 8), opaque=True),
+    ):
+        c = canvas(size=(20, 8))
+        c.append(under)
+        c.append(opaque, z=canvas.ZHIGH)
+        under.resetRenderStats()
+        img = c.render(force=True)[0]
+        c.render()
+        assert under.renderStats["calls"] == 1
+        assert img.getpixel((5, 4))[:3] == (0, 0, 0)
+
+
+def test_canvas_placement_cache():
+    ds = dataset({"db": {"value": "ab"}})
+    w = text(dvalue="db['value']", dataset=ds)
+    c = canvas(size=(40, 16), dataset=ds)
+    c.append(w, placement=(-2, -1, "rb"))
+
+    def expected():
+        img = Image.new(c.image.mode, c.image.size, c._background)
+        x, y = compute_placement(c.image.size, w.image.size, (-2, -1), "rb")
+        img.paste(w.image, (x, y), w.image)
+        return image2Text(img)
+
+    c.render()
+    size, wSize, (pos, rect) = c._geometry[0]
+    assert wSize == w.image.size and image2Text(c.image) == expected()
+
+    # The cached position is reused until the widget's image changes size
+    c.render()
+    assert c._geometry[0][2][0] is pos
+    ds.update("db", {"value": "abcdef"})
+    c.render()
+    assert c._geometry[0][1] == w.image.size != wSize
+    assert image2Text(c.image) == expected()
+
+    # Justification is checked when the widget is placed
+    with pytest.raises(AssertionError):
+        c.append(text(value="x"), placement="xx")
+
+
+def test_canvas_damage(monkeypatch):
+    # A 20x4 character layout whose counters change a digit at a time
+    def frames():
+        ds = dataset({"db": {f"c{i}": 0 for i in range(4)}})
+        outer = canvas(size=(110, 40), mode="RGB", dataset=ds)
+        lcd = canvas(size=(100, 32), mode="RGB", dataset=ds)
+        for i in range(4):
+            lcd.append(
+                text(
+                    dvalue=f"f\"Line {i}  {{db['c{i}']:06d}}\"",
+                    mode="RGB",
+                    foreground="yellow",
+                    dataset=ds,
+                ),
+                placement=(0, i * 8),
+            )
+        lcd.append(
+            rectangle(xy=(0, 0, 9, 9), fill="red", mode="RGBA", dataset=ds),
+            placement=(60, 4),
+        )
+        outer.append(lcd, placement=(5, 4))
+        result = []
+        for t in range(60):
+            ds.update("db", {f"c{t % 4}": t * 7}, merge=True)
+            img, changed = outer.render()
+            result.append((img.tobytes(), changed, outer.damage))
+        return result, lcd
+
+    partial, lcd = frames()
+
+    # Only the changed digits were redrawn
+    damage = [d for img, changed, d in partial[1:]]
+    assert all(d is not None for d in damage)
+    for d in damage:
+        assert all((r - l) % 5 == 0 and b - t == 8 for l, t, r, b in d)
+    assert all(sum(r - l for l, t, r, b in d) <= 30 for d in damage)
+
+    # Compare with redrawing the whole canvas
+    renderWidgets = canvas._renderWidgets
+
+    def redrawAll(self, *args, **kwargs):
+        results, changed, damage = renderWidgets(self, *args, **kwargs)
+        return (results, changed, None)
+
+    with monkeypatch.context() as m:
+        m.setattr(canvas, "_renderWidgets", redrawAll)
+        full, lcd = frames()
+    assert all(d is None for img, changed, d in full)
+    assert [(img, changed) for img, changed, d in partial] == [
+        (img, changed) for img, changed, d in full
+    ]
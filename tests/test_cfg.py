@@ -123,3 +123,14 @@ def test_file_open(make_dataset):
         tdl = _tdLoader(pageFile=path)
     except FileNotFoundError as ex:
         assert str(ex) == f"Page File '{path}' not found"
+
+
+def test_shared_fonts(make_dataset):
+    path = Path(__file__).parent / "reference/pageFiles" / "basicMedia.yaml"
+    first = _tdLoader(pageFile=path)
+    first._createFont("small")
+    second = _tdLoader(pageFile=path)
+
+    # Loaders share the fonts held in the font registry
+    assert second._createFont("small") is first._createFont("small")
+    assert isinstance(first._createFont("small"), bmImageFont)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of the HD44780 character mode output.
+
+.. versionadded:: 0.1.4
+"""
+from tinyDisplay.render.character import hd44780
+from tinyDisplay.render.collection import canvas
+from tinyDisplay.render.widget import rectangle, text
+
+
+KATAKANA = "アイウエオカキクケ"
+
+
+class interface:
+    def __init__(self):
+        self.ops = []
+
+    def command(self, *cmd):
+        self.ops.append(("command",) + cmd)
+
+    def data(self, data):
+        self.ops.append(("data", list(data)))
+
+
+def test_character_rom():
+    i = interface()
+    lcd = hd44780((20, 4), i)
+
+    assert lcd.display("Hi\n\n\nthere") == 80
+    assert i.ops[:2] == [("command", 0x80), ("data", [72, 105] + [32] * 18)]
+    assert ("command", 0xC0) in i.ops
+    assert ("command", 0x94) in i.ops
+    assert i.ops[-2:] == [
+        ("command", 0xD4),
+        ("data", [116, 104, 101, 114, 101] + [32] * 15),
+    ]
+
+    # Only changed cells are sent, runs across single unchanged cells
+    i.ops.clear()
+    assert lcd.display(["Ho", "", "", "th r!"]) == 1 + 3
+    assert i.ops == [
+        ("command", 0x81),
+        ("data", [111]),
+        ("command", 0xD6),
+        ("data", [32, 114, 33]),
+    ]
+
+    i.ops.clear()
+    assert lcd.display(["Ho", "", "", "th r!"]) == 0
+    assert i.ops == []
+
+    # Symbols are sent as their ROM code
+    i.ops.clear()
+    lcd.display("▶")
+    assert i.ops[:2] == [("command", 0x80), ("data", [0x10, 0x20])]
+    assert lcd.stats == {"frames": 4, "cells": 91, "cgram": 0}
+
+
+def test_character_cgram():
+    i = interface()
+    lcd = hd44780((16, 2), i)
+
+    lcd.display(KATAKANA[:8])
+    assert i.ops[0] == ("command", 0x40)
+    assert len(i.ops[1][1]) == 8
+    assert i.ops[16:18] == [
+        ("command", 0x80),
+        ("data", list(range(8)) + [32] * 8),
+    ]
+    assert lcd.stats["cgram"] == 8
+
+    # Reuse loaded glyphs and replace the least recently used one not shown
+    i.ops.clear()
+    lcd.display(KATAKANA[1:9])
+    assert lcd.stats["cgram"] == 9
+    assert i.ops[0] == ("command", 0x40)
+    assert i.ops[2:] == [("command", 0x80), ("data", list(range(1, 8)) + [0])]
+
+    # Glyphs beyond the eight slots are shown as the default character
+    i.ops.clear()
+    lcd.display(KATAKANA)
+    assert lcd.stats["cgram"] == 9
+    assert i.ops == [
+        ("command", 0x80),
+        ("data", [32] + list(range(1, 8)) + [0]),
+    ]
+
+    # The A00 ROM includes katakana
+    i.ops.clear()
+    lcd = hd44780((16, 2), i, page=1)
+    lcd.display("アA")
+    assert lcd.stats["cgram"] == 0
+    assert i.ops[:2] == [
+        ("command", 0x80),
+        ("data", [0xB1, 0x41] + [32] * 14),
+    ]
+
+
+def test_character_sources():
+    lines = ["Hello ▶ " + KATAKANA[:2], "  World"]
+
+    c = canvas(size=(100, 32))
+    c.append(text(lines[0]), placement=(0, 0))
+    c.append(text("World"), placement=(10, 8))
+    image = hd44780((20, 4))
+    image.display(c.render()[0])
+
+    lcd = hd44780((20, 4))
+    lcd.display(lines)
+    assert image._shown == lcd._shown
+
+    widgets = hd44780((20, 4))
+    widgets.displayWidgets(
+        [
+            (text(lines[0]), (0, 0)),
+            (text("World", size=(25, 8), just="rt"), (2, 1)),
+        ]
+    )
+    assert widgets._shown == lcd._shown
+
+    # Widgets other than text are rendered and read cell by cell
+    widgets.displayWidgets(
+        [(rectangle((0, 0, 4, 7), fill="white"), (19, 3))]
+    )
+    block = widgets._shown[3][19]
+    assert block not in lcd._shown[3] and widgets.stats["cgram"] == 3
+
+    # Only the character rows of a widget that are on the display are shown
+    lcd = hd44780((16, 2))
+    lcd.displayWidgets(
+        [(rectangle((0, 0, 9, 15), fill="white"), (0, -1))]
+    )
+    block = lcd._shown[0][0]
+    assert lcd._shown[0][:2] == [block, block] and lcd._shown[0][2] == 0x20
+    assert lcd._shown[1] == [0x20] * 16
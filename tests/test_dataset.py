@@ -157,6 +157,12 @@ def test_ischanged():
     ds.update("db", {"title": "b"})
     assert e.eval("Test"), "Title has changed but change was not detected"
 
+    # Each statement tracks its own changes
+    e.compile("changed(db['title'])", name="Other")
+    assert not e.eval("Other") and not e.eval("Test")
+    ds.update("db", {"title": "c"})
+    assert e.eval("Test") and e.eval("Other")
+
 
 def test_validate():
     ds = dataset()
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of the bitmap font for the tinyDisplay system
+"""
+import gc
+import threading
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+from tinyDisplay.font import _cacheFile, bmImageFont, fontRegistry, fonts
+from tinyDisplay.render.widget import create_font, text
+
+
+FONTS = Path(__file__).parent / "reference/fonts"
+
+
+def _measured(font, text):
+    # Measure text a glyph at a time (the original implementation)
+    glyphs = font.tdGlyphs
+    default = ord(font._defaultChar)
+    width = height = 0
+    for line in text.split("\n"):
+        x, y = 0, font.lineHeight
+        for c in line:
+            g = glyphs[ord(c) if ord(c) in glyphs else default]
+            x += font.xadvance if font.xadvance else g[0][0]
+            y = max(y, g[2][3])
+        width = max(width, x)
+        height += y
+    return (width, height)
+
+
+def _pasted(font, text, mode):
+    # Render text by pasting each glyph (the original implementation)
+    glyphs = font.tdGlyphs
+    default = ord(font._defaultChar)
+    img = Image.new(mode, font.getsize(text))
+    yp = 0
+    for line in text.split("\n"):
+        xp = 0
+        yp += font.getsize(line)[1]
+        for c in line:
+            g = glyphs[ord(c) if ord(c) in glyphs else default]
+            img.paste(g[3], (xp + g[1][0], yp + g[1][1]))
+            xp += font.xadvance if font.xadvance else g[0][0]
+    return img
+
+
+@pytest.mark.parametrize(
+    "fontFile, xadvance",
+    [
+        ("latin1_5x8.fnt", None),
+        ("hd44780.fnt", None),
+        ("upperascii_3x5.fnt", None),
+        ("BigFont_10x16.fnt", None),
+        ("latin1_5x8.fnt", 3),
+        ("latin1_5x8.fnt", 7),
+    ],
+)
+def test_getmask(fontFile, xadvance):
+    kwargs = {"xadvance": xadvance} if xadvance else {}
+    font = bmImageFont(str(FONTS / fontFile), **kwargs)
+    for text in ("", "Hello World", "Two\nLines", "A\n\nlonger third\n", "€☃"):
+        for mode in ("1", "L", "RGBA"):
+            font.getmask(text, mode)
+            expected = _pasted(font, text, mode)
+            assert font.gmImage.size == expected.size
+            assert font.gmImage.tobytes() == expected.tobytes(), (text, mode)
+
+
+@pytest.mark.parametrize(
+    "fontFile, xadvance",
+    [
+        ("latin1_5x8.fnt", None),
+        ("hd44780.fnt", None),
+        ("upperascii_3x5.fnt", None),
+        ("BigFont_10x16.fnt", None),
+        ("latin1_5x8.fnt", 3),
+        ("latin1_5x8.fnt", 7),
+    ],
+)
+def test_getsize(fontFile, xadvance):
+    kwargs = {"xadvance": xadvance} if xadvance else {}
+    font = bmImageFont(str(FONTS / fontFile), **kwargs)
+    draw = ImageDraw.Draw(Image.new("1", (1, 1)))
+    for text in (
+        "",
+        "Hello World",
+        "Two\nLines",
+        "A\n\nlonger third\n",
+        "€☃ÿ\x00",
+        "\U0001F600 ▶ ア\U0001F514",
+    ):
+        assert font.getsize(text) == _measured(font, text), text
+        for spacing in (0, 3):
+            bbox = draw.textbbox((0, 0), text, font=font, spacing=spacing)
+            assert font.multilineSize(text, spacing) == (
+                bbox[2] - bbox[0],
+                bbox[3] - bbox[1],
+            ), (text, spacing)
+
+
+def test_getmask_cache():
+    font = bmImageFont(str(FONTS / "latin1_5x8.fnt"), maskCacheSize=2)
+    first = font.getmask("12:00")
+    assert font.getmask("12:00") is first
+    font.getmask("12:01")
+    font.getmask("12:02")
+
+    # Only the most recently used strings are kept
+    assert len(font._masks) == 2
+    assert font.getmask("12:00") is not first
+
+
+def test_getmask_threads():
+    font = bmImageFont(str(FONTS / "latin1_5x8.fnt"))
+    font.getmask("A")
+    expected = font.gmImage
+
+    # Each thread sees the text it rendered last
+    other = []
+
+    def draw():
+        font.getmask("Other")
+        other.append(font.gmImage)
+
+    t = threading.Thread(target=draw)
+    t.start()
+    t.join()
+    assert font.gmImage is expected and other[0].size != expected.size
+
+
+@pytest.fixture
+def fontCopy(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    for fn in ("hd44780.fnt", "hd44780a00.png", "hd44780a02.png"):
+        (tmp_path / fn).write_bytes((FONTS / fn).read_bytes())
+    return tmp_path / "hd44780.fnt"
+
+
+def _same(a, b):
+    assert a.lineHeight == b.lineHeight
+    assert a.tdGlyphs.keys() == b.tdGlyphs.keys()
+    for text in ("Hello World", "Two\nLines", "€☃"):
+        for mode in ("1", "L", "RGBA"):
+            a.getmask(text, mode)
+            b.getmask(text, mode)
+            assert a.gmImage.tobytes() == b.gmImage.tobytes(), (text, mode)
+
+
+def test_font_cache(fontCopy):
+    cacheFile = Path(_cacheFile(str(fontCopy)))
+    font = bmImageFont(str(fontCopy))
+    assert cacheFile.exists()
+    assert cacheFile.is_relative_to(fontCopy.parent / "cache")
+
+    # Nothing is written next to the font
+    assert not list(fontCopy.parent.glob("*.tdfc"))
+
+    # Loaded from the cache rather than the font file
+    cached = bmImageFont(str(fontCopy))
+    assert isinstance(cached._atlas["1"][ord("A")][5], memoryview)
+    _same(font, cached)
+    _same(bmImageFont(str(fontCopy), cache=False), cached)
+
+
+def test_font_cache_stale(fontCopy):
+    cacheFile = Path(_cacheFile(str(fontCopy)))
+    bmImageFont(str(fontCopy))
+    before = cacheFile.read_bytes()
+
+    # Changing a font image invalidates the cache
+    page = fontCopy.parent / "hd44780a02.png"
+    img = Image.open(page)
+    img.paste(0, (0, 0) + img.size)
+    img.save(page)
+    font = bmImageFont(str(fontCopy))
+    assert cacheFile.read_bytes() != before
+    assert not font.getmask("A", "L").getbbox()
+
+
+def test_font_cache_corrupt(fontCopy):
+    cacheFile = Path(_cacheFile(str(fontCopy)))
+    expected = bmImageFont(str(fontCopy))
+    for data in (b"", b"TDFC", cacheFile.read_bytes()[:-100]):
+        cacheFile.write_bytes(data)
+        _same(bmImageFont(str(fontCopy)), expected)
+
+
+def test_font_cache_unwritable(fontCopy, monkeypatch):
+    # A cache directory that cannot be created is ignored
+    blocker = fontCopy.parent / "blocker"
+    blocker.write_bytes(b"")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))
+    _same(bmImageFont(str(fontCopy)), bmImageFont(str(fontCopy), cache=False))
+
+
+def test_font_registry():
+    registry = fontRegistry(keepIdle=1)
+    font = registry.acquire(FONTS / "latin1_5x8.fnt")
+    assert registry.acquire(str(FONTS / "latin1_5x8.fnt")) is font
+    assert registry.refCount(font) == 2
+
+    # Options and types are part of the font's identity
+    fixed = registry.acquire(FONTS / "latin1_5x8.fnt", xadvance=6)
+    assert fixed is not font and fixed.xadvance == 6
+    assert registry.stats == {"loads": 2, "active": 2, "idle": 0}
+
+    # Released fonts stay loaded until keepIdle others are released
+    registry.release(font)
+    registry.release(font)
+    assert registry.refCount(font) == 0
+    assert registry.acquire(FONTS / "latin1_5x8.fnt") is font
+    registry.release(font)
+    registry.release(fixed)
+    assert registry.stats == {"loads": 2, "active": 0, "idle": 1}
+    evicted, font = font, registry.acquire(FONTS / "latin1_5x8.fnt")
+    assert font is not evicted and registry.stats["loads"] == 3
+
+    # get shares fonts without taking a reference
+    assert registry.get(FONTS / "latin1_5x8.fnt") is font
+    assert registry.refCount(font) == 1
+    tiny = registry.get(FONTS / "latin1_5x8.fnt", xadvance=4)
+    assert registry.get(FONTS / "latin1_5x8.fnt", xadvance=4) is tiny
+    assert registry.refCount(tiny) == 0
+    assert registry.stats == {"loads": 4, "active": 1, "idle": 1}
+
+
+def test_font_registry_widget():
+    path = str(FONTS / "latin1_5x8.fnt")
+    font = fonts.acquire(path)
+    refs = fonts.refCount(font)
+    w = text(value="Hello", font=path)
+    assert w.font is font and fonts.refCount(font) == refs + 1
+
+    # The font is released with the widget
+    del w
+    gc.collect()
+    assert fonts.refCount(font) == refs
+    fonts.release(font)
+
+    # TrueType fonts given by name use the default size
+    w = text(value="Hello", font="DejaVuSans.ttf")
+    assert w.font.size == 10 and w.render()[0].size[0] > 0
+
+    # create_font shares its font through the registry
+    font = create_font(10)
+    assert font is w.font and create_font(10) is font
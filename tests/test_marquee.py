@@ -13,7 +13,8 @@ import pytest
 from PIL import Image, ImageChops
 
 from tinyDisplay.render.collection import canvas
-from tinyDisplay.render.widget import popUp, scroll, slide, text
+from tinyDisplay.render.new_marquee import new_marquee
+from tinyDisplay.render.widget import popUp, scroll, slide, text, textTiles
 from tinyDisplay.utility import animate, image2Text
 
 
@@ -253,6 +254,60 @@ def test_scroll_gap(gap):
     ), f"scroll didn't return to start\n{image2Text(img)}\nand\n{image2Text(img2)}"
 
 
+@pytest.mark.parametrize("actions", [[("rtl",)], [("pause", 5), ("ltr",)]])
+def test_virtual_scroll(actions, monkeypatch):
+    """Test that virtual text scrolls exactly as text drawn in full."""
+    monkeypatch.setattr(textTiles, "TILEWIDTH", 32)
+    monkeypatch.setattr(textTiles, "MAXTILES", 3)
+    value = "The quick brown fox jumps over the lazy dog. " * 4
+
+    frames = []
+    for virtual in (False, True):
+        w = text(value, virtual=virtual)
+        sw = scroll(widget=w, size=(40, 8), gap=(10, 0), actions=actions)
+        frames.append([sw.render()[0] for _ in range(len(value) * 5 + 20)])
+
+    tiles = w._tiles
+    assert len(tiles) > 20 and len(tiles._tiles) == 3
+    assert w.image.size == (32, 8) and sw._aWS == (tiles.size[0] + 10, 8)
+    for i, (img, vImg) in enumerate(zip(*frames)):
+        assert not ImageChops.difference(img, vImg).getbbox(), (
+            f"frame {i} differs\n{image2Text(img)}\nand\n{image2Text(vImg)}"
+        )
+
+    # Text with more than one line is drawn in full
+    w = text("Hello\nWorld", virtual=True)
+    assert w._tiles is None and w.image.size == (25, 16)
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda w: slide(widget=w, size=(60, 8), actions=[("rtl",)]),
+        lambda w: popUp(widget=w, size=(60, 8), delay=(2, 2)),
+        lambda w: new_marquee(
+            widget=w, program="MOVE(LEFT, 100) { step=1 };", size=(60, 8)
+        ),
+        lambda w: canvas(size=(60, 8), widgets=[(w, (-40, 0))]),
+    ],
+)
+def test_virtual_other(make, monkeypatch):
+    """Test that virtual text is drawn in full outside of a scroll."""
+    monkeypatch.setattr(textTiles, "TILEWIDTH", 32)
+    value = "The quick brown fox jumps over the lazy dog."
+
+    frames = []
+    for virtual in (False, True):
+        w = text(value, virtual=virtual)
+        sw = make(w)
+        frames.append([sw.render()[0] for _ in range(50)])
+    assert w._tiles is None and w.image.size[0] > 32
+    for i, (img, vImg) in enumerate(zip(*frames)):
+        assert not ImageChops.difference(img, vImg).getbbox(), (
+            f"frame {i} differs\n{image2Text(img)}\nand\n{image2Text(vImg)}"
+        )
+
+
 def test_slide1():
     """Test sliding from left to right to left and test if back to starting position."""
     w = text(value="'This is a test!'")
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of next change lookahead for the tinyDisplay system
+"""
+import random
+import time
+
+from tinyDisplay.render.collection import canvas, sequence
+from tinyDisplay.render.new_marquee import new_marquee
+from tinyDisplay.render.widget import popUp, scroll, text
+from tinyDisplay.utility import animate, dataset, image2Text
+
+
+def _frames(make, ticks, updates, lookahead, seed=0):
+    # Render ticks frames, optionally skipping the renders that nextChange
+    # reports cannot change the image.  Returns the frames and render count.
+    wid, ds = make()
+    rnd = random.Random(seed)
+    frames, renders, t = [], 0, 0
+    while t < ticks:
+        for db, update in updates.get(t, []):
+            ds.update(db, update, merge=True)
+        img, changed = wid.render()
+        renders += 1
+        frames.append(image2Text(img))
+        t += 1
+        if lookahead:
+            n = wid.nextChange()
+            limit = ticks - t if n is None else n - 1
+            # Stop skipping at the next update, as a scheduler would
+            limit = min([limit] + [u - t for u in updates if u >= t])
+            skip = rnd.randint(1, limit) if limit > 0 else 0
+            wid.skip(skip)
+            frames += frames[-1:] * skip
+            t += skip
+    return frames, renders
+
+
+def _compare(make, ticks, updates={}):
+    expected, renders = _frames(make, ticks, updates, False)
+    for seed in range(3):
+        frames, renders = _frames(make, ticks, updates, True, seed)
+        for i, (e, f) in enumerate(zip(expected, frames)):
+            assert e == f, f"Frame {i} differed (seed {seed})"
+    return renders
+
+
+def _coordinated():
+    ds = dataset({"db": {"a": "A short line", "b": "Long enough to scroll"}})
+    c = canvas(size=(60, 16), dataset=ds)
+    for i, k in enumerate("ab"):
+        c.append(
+            scroll(
+                widget=text(dvalue=f"db['{k}']", dataset=ds),
+                size=(60, 8),
+                actions=[("pause", 7), ("rtl",)],
+                wait="atStart",
+                dataset=ds,
+            ),
+            placement=(0, i * 8),
+        )
+    c.append(
+        popUp(
+            widget=text(value="1\n2\n3\n4", dataset=ds),
+            size=(8, 8),
+            delay=(4, 6),
+            dataset=ds,
+        ),
+        placement=(50, 0),
+    )
+    return c, ds
+
+
+def _timed():
+    ds = dataset({"sys": {"temp": 50}})
+    pages = sequence(size=(40, 8), dataset=ds)
+    for i, duration in enumerate((12, 7)):
+        page = canvas(size=(40, 8), duration=duration, dataset=ds)
+        page.append(text(value=f"Page {i}", dataset=ds))
+        pages.append(page)
+    alert = canvas(
+        size=(40, 8),
+        activeWhen="sys['temp'] > 100",
+        duration=5,
+        minDuration=3,
+        coolingPeriod=9,
+        dataset=ds,
+    )
+    alert.append(text(value="HOT", dataset=ds))
+    main = canvas(size=(40, 8), dataset=ds)
+    main.append(pages)
+    main.append(alert, z=canvas.ZHIGH)
+    return main, ds
+
+
+def test_coordinated_marquees_skip():
+    updates = {60: [("db", {"a": "Now this one scrolls too"})]}
+    renders = _compare(_coordinated, 200, updates)
+    assert renders < 200
+
+
+def test_timers_skip():
+    updates = {
+        20: [("sys", {"temp": 120})],
+        60: [("sys", {"temp": 50})],
+        90: [("sys", {"temp": 130})],
+    }
+    renders = _compare(_timed, 150, updates)
+    assert renders < 100
+
+
+def test_new_marquee_skip():
+    def make():
+        ds = dataset()
+        program = """
+        LOOP(2) {
+            MOVE(LEFT, 10) { step=2 };
+            PAUSE(8);
+        } END;
+        """
+        return (
+            new_marquee(
+                widget=text(value="Hello", dataset=ds),
+                program=program,
+                size=(30, 8),
+                dataset=ds,
+            ),
+            ds,
+        )
+
+    renders = _compare(make, 80)
+    assert renders < 80
+
+
+def test_update_every_skip():
+    def make():
+        ds = dataset({"db": {"a": "Slow scrolling line", "b": "Static"}})
+        c = canvas(size=(40, 16), dataset=ds)
+        c.append(
+            scroll(
+                widget=text(dvalue="db['a']", dataset=ds),
+                size=(40, 8),
+                actions=[("pause", 3), ("rtl",)],
+                updateEvery=4,
+                dataset=ds,
+            )
+        )
+        c.append(
+            text(dvalue="db['b']", updateEvery=7, dataset=ds),
+            placement=(0, 8),
+        )
+        return c, ds
+
+    updates = {30: [("db", {"b": "Changed"})]}
+    renders = _compare(make, 120, updates)
+    assert renders < 120
+
+
+def test_next_change_idle():
+    ds = dataset({"db": {"title": "Sting"}})
+    c = canvas(size=(40, 8), dataset=ds)
+    c.append(text(dvalue="db['title']", dataset=ds))
+    c.render()
+    assert c.nextChange() is None
+
+    # The render after a change is needed to let it settle
+    ds.update("db", {"title": "The Police"})
+    c.render()
+    assert c.nextChange() == 1
+    c.render()
+    assert c.nextChange() is None
+
+
+def test_next_change_clock():
+    ds = dataset()
+    t = text(dvalue="time.strftime('%H:%M:%S')", dataset=ds)
+    fixed = text(dvalue="time.strftime('%H', time.gmtime(0))", dataset=ds)
+    counter = text(dvalue="str(time.monotonic())", dataset=ds)
+    for w in (t, fixed, counter):
+        w.render()
+        w.render()
+
+    # Clock values change at most once per second
+    assert t.nextChange() == 1
+    assert 1 <= t.nextChange(rate=20) <= 20
+    assert fixed.nextChange(rate=20) is None
+    assert counter.nextChange(rate=20) == 1
+
+
+def test_animate_lookahead():
+    ds = dataset({"db": {"title": "Sting"}})
+    c = canvas(size=(40, 8), dataset=ds)
+    c.append(text(dvalue="db['title']", dataset=ds))
+
+    a = animate(function=c.render, cps=50, widget=c)
+    a.start()
+    try:
+        time.sleep(0.3)
+        renders = c.renderStats["calls"]
+        time.sleep(0.3)
+
+        # Nothing can change so the display is no longer rendered
+        assert c.renderStats["calls"] == renders
+
+        # A dataset update wakes the animate thread
+        ds.update("db", {"title": "The Police"})
+        time.sleep(0.2)
+        assert c.renderStats["calls"] > renders
+        assert c.renderStats["changed"] > 0
+    finally:
+        a.stop()
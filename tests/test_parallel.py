@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of process pool rendering for the tinyDisplay system
+"""
+from PIL import ImageChops
+
+from tinyDisplay.render.collection import canvas
+from tinyDisplay.render.parallel import renderPool
+from tinyDisplay.render.widget import scroll, text
+from tinyDisplay.utility import dataset
+
+
+def makeArtist(ds):
+    return text(dvalue="db['artist']", dataset=ds)
+
+
+def makeTitle(ds):
+    return text(dvalue="db['title']", dactiveWhen="db['showTitle']", dataset=ds)
+
+
+def makeScroll(ds):
+    return scroll(
+        widget=text(value="A line that scrolls", dataset=ds),
+        size=(40, 8),
+        dataset=ds,
+    )
+
+
+def makePage(ds, artist, title):
+    c = canvas(size=(80, 16), dataset=ds)
+    c.append(artist)
+    c.append(title, placement=(0, 8))
+    return c
+
+
+def same(i1, i2):
+    return ImageChops.difference(i1, i2).getbbox() is None
+
+
+def test_render_pool():
+    data = {"db": {"artist": "Sting", "title": "Desert Rose", "showTitle": True}}
+    sds = dataset(data)
+    serial = makePage(sds, makeArtist(sds), makeTitle(sds))
+
+    ds = dataset(data)
+    with renderPool(dataset=ds, processes=2) as pool:
+        artist = pool.subtree(makeArtist, name="artist")
+        page = makePage(ds, artist, pool.subtree(makeTitle, name="title"))
+        assert artist.size == makeArtist(sds).size
+
+        img, changed = pool.render(page)
+        assert not changed and same(img, serial.render()[0])
+
+        for d in (ds, sds):
+            d.update("db", {"artist": "Moby"}, merge=True)
+        img, changed = pool.render(page)
+        assert changed and same(img, serial.render()[0])
+
+        # Active state is reported by the remote subtree
+        for d in (ds, sds):
+            d.update("db", {"showTitle": False}, merge=True)
+        img, changed = pool.render(page)
+        assert changed and same(img, serial.render()[0])
+
+        # Rendering without the pool renders the subtree synchronously
+        ds.update("db", {"artist": "Enya"}, merge=True)
+        sds.update("db", {"artist": "Enya"}, merge=True)
+        img, changed = page.render()
+        assert changed and same(img, serial.render()[0])
+
+
+def test_render_pool_shared_process():
+    # Subtrees that share a worker are rendered once per frame
+    sds = dataset({"db": {}})
+    serial = canvas(size=(40, 24), dataset=sds)
+    for i in range(3):
+        serial.append(makeScroll(sds), placement=(0, i * 8))
+
+    ds = dataset({"db": {}})
+    with renderPool(dataset=ds, processes=1) as pool:
+        page = canvas(size=(40, 24), dataset=ds)
+        for i in range(3):
+            page.append(pool.subtree(makeScroll), placement=(0, i * 8))
+
+        for _ in range(10):
+            img, changed = pool.render(page)
+            assert changed and same(img, serial.render()[0])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of frame-ahead prerendering for the tinyDisplay system
+"""
+import time
+
+from PIL import ImageChops
+
+from tinyDisplay.render.collection import canvas
+from tinyDisplay.render.widget import scroll, text
+from tinyDisplay.utility import dataset, prerender
+
+
+def makeDisplay():
+    ds = dataset({"db": {"artist": "Sting", "title": "Desert Rose"}})
+    c = canvas(name="main", size=(40, 16), dataset=ds)
+    c.append(text(dvalue="db['artist']", dataset=ds))
+    c.append(
+        scroll(
+            widget=text(dvalue="db['title']", dataset=ds),
+            size=(40, 8),
+            dataset=ds,
+        ),
+        placement=(0, 8),
+    )
+    return c, ds
+
+
+def same(i1, i2):
+    return ImageChops.difference(i1, i2).getbbox() is None
+
+
+def test_prerender_matches_direct_render():
+    direct, dds = makeDisplay()
+    display, ds = makeDisplay()
+    p = prerender(widget=display, frames=5)
+
+    for _ in range(3):
+        p.fill()
+        img, changed = p.render()
+        dimg, dchanged = direct.render()
+        assert same(img, dimg) and changed == dchanged
+
+    assert p.qsize == 4
+
+    # An update discards the queued frames and rewinds to the last delivered frame
+    for d in (ds, dds):
+        d.update("db", {"artist": "The Police"}, merge=True)
+    for _ in range(10):
+        img, changed = p.render()
+        dimg, dchanged = direct.render()
+        assert same(img, dimg) and changed == dchanged
+
+    assert p.discarded == 4
+    assert p.rendered == 3 + 4 + 10
+
+
+def test_prerender_thread():
+    display, ds = makeDisplay()
+    p = prerender(widget=display, frames=3)
+    p.start()
+    try:
+        for _ in range(100):
+            if p.qsize == 3:
+                break
+            time.sleep(0.01)
+        assert p.qsize == 3
+
+        ds.update("db", {"artist": "Moby"}, merge=True)
+        img, changed = p.render()
+        assert changed
+        assert p.discarded >= 3
+    finally:
+        p.stop()
+    assert not p.is_alive()
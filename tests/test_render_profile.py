@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of render timing statistics for the tinyDisplay system
+"""
+import logging
+from time import sleep
+
+from tinyDisplay.render.collection import canvas
+from tinyDisplay.render.widget import scroll, text
+from tinyDisplay.utility import dataset
+
+
+class slowText(text):
+    """Text widget that takes a measurable amount of time to render."""
+
+    def _render(self, *args, **kwargs):
+        sleep(0.01)
+        return super()._render(*args, **kwargs)
+
+
+def makeCanvas():
+    ds = dataset({"db": {"title": "Sting"}})
+    c = canvas(name="main", size=(80, 16), dataset=ds)
+    t = text(name="title", dvalue="db['title']", dataset=ds)
+    s = scroll(
+        name="scroller",
+        widget=slowText(name="slow", value="A long line of text"),
+        size=(40, 8),
+        dataset=ds,
+    )
+    c.append(t)
+    c.append(s, placement=(0, 8))
+    return c, ds
+
+
+def test_render_stats_counts():
+    c, ds = makeCanvas()
+    c.resetRenderStats()
+
+    for _ in range(5):
+        c.render()
+    ds.update("db", {"title": "Sting and the Police"})
+    c.render()
+
+    title = [w for w in c._children() if w.name == "title"][0]
+    stats = title.renderStats
+    assert stats["calls"] == 6
+    assert stats["changed"] == 1
+    assert stats["changedRatio"] == 1 / 6
+    assert stats["inclusive"] >= stats["exclusive"] > 0
+
+
+def test_render_report_tree():
+    c, ds = makeCanvas()
+    c.resetRenderStats()
+
+    for _ in range(3):
+        c.render()
+
+    report = c.renderReport()
+    assert report["name"] == "main"
+    assert report["calls"] == 3
+    children = {r["name"]: r for r in report["children"]}
+    assert set(children) == {"title", "scroller"}
+
+    scroller = children["scroller"]
+    slow = scroller["children"][0]
+    assert slow["name"] == "slow"
+    assert slow["exclusive"] >= 0.03
+
+    # Time spent in children is excluded from the parent's exclusive time
+    assert scroller["exclusive"] < slow["inclusive"]
+    assert report["inclusive"] >= slow["inclusive"]
+    assert report["exclusive"] < report["inclusive"] - slow["inclusive"] + 0.01
+
+
+def test_slow_render_warning(caplog):
+    w = slowText(name="slow", value="abc")
+    w.resetRenderStats()
+    w.slowRender = 0.001
+
+    with caplog.at_level(logging.WARNING, logger="tinyDisplay"):
+        w.render()
+
+    assert w.renderStats["slow"] == 1
+    assert "Slow render for slow.slowText" in caplog.text
+
+    w.slowRender = None
+    w.render()
+    assert w.renderStats["slow"] == 1
@@ -215,7 +215,7 @@ def main():
         
         # Test 1: Change Widget A content - should update A, B, C, D
         logger.info("TEST 1: Changing Widget A - should affect A, B, C, D")
-        text_a.text = "Widget A - UPDATED! All widgets should update"
+        text_a._value = "Widget A - UPDATED! All widgets should update"
         
         # Time how long it takes to recalculate all dependents
         start_time = time.time()
@@ -248,7 +248,7 @@ def main():
         
         # Test 2: Change Widget C content - should only update C and D
         logger.info("TEST 2: Changing Widget C - should only affect C and D")
-        text_c.text = "Widget C - UPDATED! Only C and D should update"
+        text_c._value = "Widget C - UPDATED! Only C and D should update"
         
         # Time how long it takes to recalculate only C and its dependents
         start_time = time.time()
@@ -281,7 +281,7 @@ def main():
         
         # Test 3: Change Widget E content - should only update E (independent)
         logger.info("TEST 3: Changing Widget E - should only affect E")
-        text_e.text = "Widget E - UPDATED! Only E should update"
+        text_e._value = "Widget E - UPDATED! Only E should update"
         
         # Time how long it takes to recalculate only E
         start_time = time.time()
@@ -430,7 +430,7 @@ def test_selective_recalculation():
     
     # Test 1: Change Widget A content - should update A, B, C
     logger.info("TEST 1: Changing Widget A - should affect A, B, C")
-    text_a.text = "Widget A - Updated"
+    text_a._value = "Widget A - Updated"
     
     # Store the initial resolved state
     pre_update_resolved = set(timeline_manager.resolved)
@@ -449,7 +449,7 @@ def test_selective_recalculation():
     
     # Test 2: Change Widget C content - should only update C
     logger.info("TEST 2: Changing Widget C - should only affect C")
-    text_c.text = "Widget C - Updated"
+    text_c._value = "Widget C - Updated"
     
     # Reset just widget C
     marquee_c.mark_for_recalculation()
@@ -9,7 +9,7 @@ Test of Text Widget for the tinyDisplay system.
 """
 from pathlib import Path
 
-from PIL import Image, ImageChops
+from PIL import Image, ImageChops, ImageFont
 
 from tinyDisplay.render.widget import text
 from tinyDisplay.utility import dataset
@@ -42,3 +42,121 @@ def test_text_widget():
     renderImage = w.render()[0]
     bbox = ImageChops.difference(img, renderImage).getbbox()
     assert not bbox, "New Republic image did not match"
+
+
+def test_measure_cache():
+    """Test that text measurements are shared and bounded."""
+    size = text.MEASURECACHESIZE
+    try:
+        text.setMeasureCacheSize(8)
+        ds = dataset({"db": {"t": "0"}})
+        a = text(dvalue="db['t']", dataset=ds, lineSpacing=3)
+        b = text(value="x", dataset=ds, lineSpacing=3)
+        assert a._size_cache is b._size_cache
+        assert a._size_cache is not text(value="x", lineSpacing=2)._size_cache
+
+        text.measureCacheStats(reset=True)
+        for i in range(100):
+            a._sizeLine(f"Elapsed {i}")
+
+        # A value measured by one widget is found by the other
+        assert b._sizeLine("Elapsed 99") == a._sizeLine("Elapsed 99")
+
+        # Values no longer shown are evicted rather than kept forever
+        assert len(a._size_cache) == 8
+        stats = text.measureCacheStats()["size"]
+        assert stats["misses"] >= 100
+        assert stats["evictions"] >= 92
+        assert stats["hits"] >= 1
+
+        # Evicted values are measured again with the same result
+        assert a._sizeLine("Elapsed 0") == b._sizeLine("Elapsed 0")
+    finally:
+        text.setMeasureCacheSize(size)
+
+
+def test_image_cache():
+    """Test that rendered text is shared between widgets."""
+    size = text.IMAGECACHEBYTES
+    try:
+        text.imageCacheStats(reset=True)
+        a = text(value="12:00", foreground="white")
+        b = text(value="12:00", foreground="white")
+        assert text.imageCacheStats()["hits"] >= 1
+        assert a.image.tobytes() == b.image.tobytes()
+
+        # Different settings are drawn separately
+        c = text(value="12:00", foreground="red", mode="RGB")
+        assert c.image.getpixel((1, 1)) in ((255, 0, 0), (0, 0, 0))
+        assert c.image.getcolors() != b.image.convert("RGB").getcolors()
+
+        # Unhashable colors are drawn without the cache
+        d = text(value="12:00", foreground=[255, 0, 0], mode="RGB")
+        assert d.image.tobytes() == c.image.tobytes()
+
+        # The cache stays within its budget
+        text.setImageCacheBytes(2000)
+        for i in range(100):
+            text(value=f"Counter {i}")
+        stats = text.imageCacheStats()
+        assert 0 < stats["bytes"] <= 2000
+        assert stats["evictions"] > 0
+    finally:
+        text.setImageCacheBytes(size)
+
+
+def test_cell_render():
+    """Test that monospaced text only redraws the characters that change."""
+    ds = dataset({"db": {"elapsed": "00:59"}})
+    w = text(dvalue="db['elapsed']", size=(40, 10), just="mm", dataset=ds)
+    for value, damage in (
+        ("01:00", [(13, 1, 18, 9), (23, 1, 33, 9)]),
+        ("01:01", [(28, 1, 33, 9)]),
+        ("1:01", None),
+    ):
+        ds.update("db", {"elapsed": value})
+        img, changed = w.render()
+        assert changed and w.damage == damage
+        expected = text(value=value, size=(40, 10), just="mm").image
+        assert img.tobytes() == expected.tobytes()
+
+
+def test_cell_render_resize():
+    """Test that a change of size is not drawn a character at a time."""
+    ds = dataset({"db": {"elapsed": "00:59", "width": 40}})
+    w = text(
+        dvalue="db['elapsed']",
+        dsize="(db['width'], 8)",
+        just="rt",
+        dataset=ds,
+    )
+    assert w.render()[0].size == (40, 8)
+    ds.update("db", {"elapsed": "01:00", "width": 60})
+    img, changed = w.render()
+    assert changed and img.size == (60, 8)
+    expected = text(value="01:00", size=(60, 8), just="rt").image
+    assert img.tobytes() == expected.tobytes()
+
+
+def test_wrap():
+    """Test wrapping at spaces and newlines."""
+    w = text(value="x")
+    assert (
+        w._makeWrapped("Line one is long\n\nshort\nand another line", 40)
+        == "Line one\nis long\n\nshort\nand\nanother\nline"
+    )
+
+    # Every wrapped line fits unless it is a single word
+    value = "The quick brown fox jumps over the lazy dog " * 20
+    for line in w._makeWrapped(value, 60).split("\n"):
+        assert w._sizeLine(line)[0] <= 60 or " " not in line.strip()
+
+    # TrueType lines are measured with their kerning
+    font = ImageFont.truetype("DejaVuSans.ttf", 20)
+    w = text(value="x", font=font)
+    width = font.getlength("AVAVAV AVAVAV")
+    assert sum(font.getlength(c) for c in "AVAVAV AVAVAV") > width
+    assert (
+        w._makeWrapped("AVAVAV AVAVAV AVAVAV", width)
+        == "AVAVAV AVAVAV\nAVAVAV"
+    )
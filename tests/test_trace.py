@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Test of render tracing for the tinyDisplay system
+"""
+import json
+
+import pytest
+
+from tinyDisplay.render.collection import canvas
+from tinyDisplay.render.widget import scroll, text, widget
+from tinyDisplay.trace import tracer
+from tinyDisplay.utility import dataset
+
+
+def test_trace_spans(tmp_path):
+    ds = dataset({"db": {"title": "Sting"}})
+    c = canvas(name="main", size=(80, 16), dataset=ds)
+    c.append(text(name="title", dvalue="db['title']", dataset=ds))
+    c.append(
+        scroll(name="scroller", widget=text(value="A long line"), size=(20, 8)),
+        placement=(0, 8),
+    )
+
+    t = tracer()
+    with t:
+        c.render()
+        ds.update("db", {"title": "Sting and the Police"})
+        c.render()
+
+    names = {e["name"] for e in t.events()}
+    assert {
+        "render",
+        "_evalAll",
+        "canvas._render",
+        "text._render",
+        "marquee._render",
+        "_place",
+        "canvas._placeAt",
+        "canvas._composite",
+        "dataset.update",
+    } <= names
+
+    # Spans for the top level render enclose the spans of its children
+    renders = [
+        e
+        for e in t.events()
+        if e["name"] == "render" and e["args"]["widget"] == "main"
+    ]
+    title = [
+        e
+        for e in t.events()
+        if e["name"] == "text._render" and e["args"]["widget"] == "title"
+    ]
+    assert len(renders) == 2 and len(title) == 2
+    for r, tr in zip(renders, title):
+        assert r["ts"] <= tr["ts"]
+        assert tr["ts"] + tr["dur"] <= r["ts"] + r["dur"]
+
+    fn = tmp_path / "trace.json"
+    t.save(fn)
+    doc = json.loads(fn.read_text())
+    assert len(doc["traceEvents"]) == len(t.events())
+    assert all(e["ph"] == "X" for e in doc["traceEvents"])
+
+
+def test_trace_restores_methods():
+    original = widget.__dict__["render"]
+    originalTextRender = text.__dict__["_render"]
+
+    t = tracer()
+    t.start()
+    assert widget.__dict__["render"] is not original
+    with pytest.raises(RuntimeError):
+        tracer().start()
+    t.stop()
+
+    assert widget.__dict__["render"] is original
+    assert text.__dict__["_render"] is originalTextRender
+    assert not t.running
+
+    # Nothing is recorded once the tracer is stopped
+    count = len(t.events())
+    text(value="abc").render()
+    assert len(t.events()) == count
+
+
+def test_trace_bounded():
+    t = tracer(maxEvents=10)
+    w = text(value="abc")
+    with t:
+        for _ in range(20):
+            w.render()
+    assert len(t.events()) == 10
@@ -212,4 +212,68 @@ def test_default_buffer_behavior():
     
     # Verify static always returns True
     assert w.static() is True
-    assert w.static(5) is True 
\ No newline at end of file
+    assert w.static(5) is True 
+
+def test_buffer_deduplicates_unchanged_frames():
+    """Test that unchanged renders share a single stored frame."""
+    db = {"value": "initial"}
+    ds = dataset()
+    ds.add("db", db)
+
+    w = text(dvalue="db['value']", dataset=ds, bufferSize=100)
+    w._imageBuffer.clear()
+
+    w.render(force=True)
+    for i in range(50):
+        w.render()
+
+    stats = w.buffer_stats()
+    assert stats["size"] == 51
+    assert stats["changes"] == 1
+    assert stats["runs"] == 1
+
+    buffer = w.get_buffer()
+    assert buffer[0][1] is True
+    assert all(not changed for _, changed in buffer[1:])
+    assert all(img is buffer[0][0] for img, _ in buffer)
+
+    # A change starts a new run
+    ds.update("db", {"value": "changed"})
+    w.render()
+    assert w.buffer_stats()["runs"] == 2
+    assert w.get_buffer()[-1][1] is True
+    assert not ci(buffer[0][0], w.get_buffer()[-1][0])
+
+
+def test_buffer_ring_trims_runs():
+    """Test that the buffer retains only the most recent renders."""
+    w = text(value="Test Text", bufferSize=4)
+    w._imageBuffer.clear()
+
+    w.render(force=True)
+    for i in range(5):
+        w.render()
+
+    buffer = w.get_buffer()
+    assert len(buffer) == 4
+    # The changed render has aged out of the buffer
+    assert all(not changed for _, changed in buffer)
+    assert w.buffer_stats()["runs"] == 1
+
+
+def test_buffer_frames_are_not_modified():
+    """Test that stored frames are unaffected by later renders."""
+    t = text(value="Test Text")
+    s = scroll(widget=t, size=(20, 8), bufferSize=10)
+    s._imageBuffer.clear()
+
+    for i in range(6):
+        s.render()
+
+    buffer = s.get_buffer()
+    snapshots = [img.copy() for img, _ in buffer]
+    for i in range(6):
+        s.render()
+
+    for (img, _), snap in zip(buffer, snapshots):
+        assert ci(img, snap)
@@ -7,10 +7,14 @@ Test of Widget class for the tinyDisplay system
 
 .. versionadded:: 0.0.1
 """
+import weakref
+
 import pytest
 from PIL import Image, ImageChops, ImageDraw
 
 from tinyDisplay import globalVars
+from tinyDisplay.render import collection
+from tinyDisplay.render.collection import canvas
 from tinyDisplay.render.widget import rectangle, text
 from tinyDisplay.utility import compareImage as ci, dataset
 
@@ -126,3 +130,115 @@ def test_bad_four_tuple():
         )
     finally:
         globalVars.__DEBUG__ = False
+
+
+def test_compact_attribute_layout():
+    w = text(value="abc", size=(20, 8))
+
+    assert w.size == (20, 8)
+    assert (w.width, w.height) == (20, 8)
+    assert w._parent is None
+
+    # Reaching the image's attributes through the widget is deprecated
+    with pytest.deprecated_call():
+        assert w.getbbox() == w.image.getbbox()
+    assert not hasattr(w, "_nothing")
+    with pytest.raises(AttributeError):
+        w.nothing
+
+    # Widgets have no instance dictionary but can be weakly referenced
+    c = canvas(size=(20, 8))
+    c.append(w)
+    for wid in (w, c, rectangle((0, 0, 3, 3))):
+        assert not hasattr(wid, "__dict__")
+        assert weakref.ref(wid)() is wid
+    with pytest.raises(AttributeError):
+        w.color = "red"
+    assert not hasattr(w._dV, "__dict__")
+    assert not any(hasattr(dv, "__dict__") for dv in w._dV._statements.values())
+
+
+def test_local_db_incremental():
+    ds = dataset({"db": {"w": 20, "cw": 40, "color": [255, 0, 0]}})
+    c = canvas(name="main", dsize="(db['cw'], 16)", dataset=ds)
+    t = text(
+        name="label",
+        value="abc",
+        dsize="(db['w'], 8)",
+        dforeground="db['color']",
+        dataset=ds,
+    )
+    localDB = t._localDB
+    c.append(t)
+    c.render()
+
+    assert t._localDB is localDB
+    assert localDB["__self__"] == {"name": "label", "just": "lt", "size": (20, 8)}
+    assert localDB["__parent__"] == {"name": "main", "just": "lt", "size": (40, 16)}
+    assert t._foreground == (255, 0, 0)
+
+    # Values are only refreshed when they change
+    selfDB = localDB["__self__"]
+    c.render()
+    assert localDB["__self__"] is selfDB
+
+    ds.update("db", {"w": 30, "cw": 50, "color": [0, 255, 0]})
+    c.render()
+    assert localDB["__self__"]["size"] == (30, 8)
+    assert localDB["__parent__"]["size"] == (50, 16)
+    assert t._foreground == (0, 255, 0)
+
+
+def test_freeze():
+    ds = dataset({"db": {"label": "Volume"}})
+    w = text(dvalue="db['label']", dataset=ds)
+    c = canvas(size=(40, 8), dataset=ds)
+    c.append(w)
+    c.freeze()
+    assert c.frozen and c.nextChange() is None
+    c.resetRenderStats()
+
+    # Frozen widgets keep their image and their contents are not rendered
+    ds.update("db", {"label": "Bass"})
+    img, changed = c.render()
+    assert not changed and w._value == "Volume"
+    assert c.renderStats["calls"] == 0 and w.renderStats["calls"] == 0
+
+    # Invalidating a widget renders it and the frozen widgets containing it
+    w.invalidate()
+    assert c.nextChange() == 1
+    img, changed = c.render()
+    assert changed and w._value == "Bass" and c.frozen
+    assert not c.render()[1] and c.renderStats["calls"] == 1
+
+    # Thawed widgets render normally
+    c.thaw()
+    ds.update("db", {"label": "Treble"})
+    assert c.render()[1] and w._value == "Treble"
+
+
+def test_freeze_current_data():
+    ds = dataset({"db": {"label": "ab"}})
+    w = text(dvalue="db['label']", dataset=ds)
+
+    # Freezing keeps the image of the data at the time of the freeze
+    ds.update("db", {"label": "HELLO"})
+    w.freeze()
+    assert w._value == "HELLO" and w.size == text("HELLO").size
+    ds.update("db", {"label": "ab"})
+    assert not w.render()[1] and w._value == "HELLO"
+
+
+def test_frozen_argument():
+    ds = dataset({"db": {"label": "Volume"}})
+    w = text(dvalue="db['label']", frozen=True, dataset=ds)
+    assert w.frozen and w._value == "Volume"
+    ds.update("db", {"label": "Bass"})
+    assert not w.render()[1]
+
+    # Forced renders still update frozen widgets
+    assert w.render(force=True)[1] and w._value == "Bass"
+
+    # The flag can be set in page files
+    assert "frozen" in collection.PARAMS["canvas"]
+    assert "dfrozen" not in collection.PARAMS["canvas"]
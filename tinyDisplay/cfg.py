@@ -11,13 +11,12 @@ Load tinyDisplay system from yaml file.
 import logging
 import os
 import pathlib
+import weakref
 from copy import deepcopy
 from inspect import getfullargspec
 
 import yaml
-from PIL import ImageFont
-
-from tinyDisplay.font import bmImageFont
+from tinyDisplay.font import fonts
 from tinyDisplay.render import collection, widget
 from tinyDisplay.utility import dataset as Dataset
 
@@ -231,20 +230,25 @@ class _tdLoader:
         if name in self._fonts:
             return self._fonts[name]
 
+        # Fonts come from the process wide registry so loaders (e.g. when a
+        # page file is reloaded) share them instead of loading them again
         fnt = None
         if name in self._pf["FONTS"]:
             cfg = self._pf["FONTS"][name]
             cType = cfg.get("type", "BMFONT")
             if cType == "BMFONT":
                 p = self._findFile(cfg["file"], "fonts")
-                fnt = bmImageFont(p)
+                fnt = fonts.acquire(p, type="BMFONT")
             elif cfg["type"].lower() == "truetype":
-                fnt = ImageFont.truetype(cfg["file"], int(cfg["size"]))
+                fnt = fonts.acquire(
+                    cfg["file"], int(cfg["size"]), type="TRUETYPE"
+                )
         else:
             # Assume that name is a filename instead of a reference to a font description in FONTS
-            fnt = bmImageFont(self._findFile(name, "fonts"))
+            fnt = fonts.acquire(self._findFile(name, "fonts"), type="BMFONT")
         if fnt:
             self._fonts[name] = fnt
+            weakref.finalize(self, fonts.release, fnt)
         return fnt
 
     @staticmethod
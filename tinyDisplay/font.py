@@ -11,10 +11,43 @@ and multipage (e.g. >256 char) font files
 .. versionadded:: 0.0.1
 """
 
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+
 from PIL import Image, ImageFont
 
+logger = logging.getLogger("tinyDisplay")
+
+# Image modes that are rendered by copying glyph rows into a byte buffer.
+# Values are the raw mode used to read the buffer (one byte per pixel).
+_BYTEMODES = {"1": "1;8", "L": "L"}
+
+# Code points measured from the dense tables of a bitmap font (see
+# bmImageFont._measureTables)
+_TABLESIZE = 0x10000
+
+# Size of TrueType fonts acquired without one (the PIL default)
+_TTFSIZE = 10
+
+# Compiled font cache file layout (little endian).  The header is followed
+# by the files the font was compiled from, the font's modes, a record for
+# each glyph and finally the glyph pixel data.
+_CACHEMAGIC = b"TDFC"
+_CACHEVERSION = 1
+_CACHESUFFIX = ".tdfc"
+_CACHEHEADER = struct.Struct("<4sHH")
+_CACHESOURCE = struct.Struct("<Hqq")
+_CACHEFONT = struct.Struct("<iIB")
+_CACHEGLYPH = struct.Struct("<i6h2HB2I")
 
-def _readGlyphData(fileName):
+
+def _readGlyphData(fileName, sources=None):
     def _readGlyphPage(fp, pages, count, glyphs):
         from os.path import dirname
 
@@ -23,7 +56,10 @@ def _readGlyphData(fileName):
             try:
                 sketches[p] = Image.open(fn)
             except FileNotFoundError:
-                sketches[p] = Image.open(dirname(fileName) + "/" + fn)
+                fn = dirname(fileName) + "/" + fn
+                sketches[p] = Image.open(fn)
+            if sources is not None:
+                sources.append(fn)
             sketches[p].convert(mode="1")
 
         i = 0
@@ -91,6 +127,140 @@ def _readGlyphData(fileName):
     return (lineHeight, glyphs)
 
 
+def _cacheFile(fileName):
+    # Location of a font's compiled cache in the user's cache directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    digest = hashlib.sha1(os.path.abspath(fileName).encode()).hexdigest()
+    return os.path.join(base, "tinyDisplay", "fonts", digest + _CACHESUFFIX)
+
+
+def _writeFontCache(fileName, sources, lineHeight, glyphs, bitmaps):
+    """
+    Save a compiled copy of a font.
+
+    :param fileName: The font file
+    :type fileName: str
+    :param sources: The files the font was read from
+    :type sources: list
+    :param lineHeight: The font's line height
+    :type lineHeight: int
+    :param glyphs: The font's glyphs (see `_readGlyphData`)
+    :type glyphs: dict
+    :param bitmaps: The mode '1' bitmap (one byte per pixel) of each glyph
+    :type bitmaps: dict
+    :returns: The cache file that was written or None if none could be
+    :rtype: str
+    """
+    parts = [_CACHEHEADER.pack(_CACHEMAGIC, _CACHEVERSION, len(sources))]
+    for src in sources:
+        st = os.stat(src)
+        path = os.path.abspath(src).encode()
+        parts += [_CACHESOURCE.pack(len(path), st.st_mtime_ns, st.st_size)]
+        parts.append(path)
+
+    modes = sorted({g[3].mode for g in glyphs.values()})
+    parts.append(_CACHEFONT.pack(lineHeight, len(glyphs), len(modes)))
+    for m in modes:
+        parts += [bytes([len(m)]), m.encode()]
+
+    data = []
+    offset = 0
+    for ch, ((dx, dy), (l, t, r, b), (_, _, w, h), gImg) in glyphs.items():
+        pixels = gImg.tobytes()
+        parts.append(
+            _CACHEGLYPH.pack(
+                ch, dx, dy, l, t, r, b, w, h, modes.index(gImg.mode),
+                offset, offset + len(pixels),
+            )
+        )
+        data += [pixels, bytes(bitmaps[ch])]
+        offset += len(pixels) + w * h
+    parts += data
+
+    cacheFile = _cacheFile(fileName)
+    tmp = f"{cacheFile}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        os.makedirs(os.path.dirname(cacheFile), exist_ok=True)
+        with open(tmp, "wb") as fp:
+            fp.write(b"".join(parts))
+        os.replace(tmp, cacheFile)
+        return cacheFile
+    except OSError as ex:
+        logger.debug(f"Unable to write font cache {cacheFile}: {ex}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return None
+
+
+def _readFontCache(fileName):
+    """
+    Load a compiled copy of a font.
+
+    The cache file is memory mapped so the glyph data is read on demand and
+    shared by every process that loads the font.
+
+    :param fileName: The font file
+    :type fileName: str
+    :returns: The line height, glyphs (see `_readGlyphData`) and mode '1'
+        bitmaps of the font or None if there is no up to date cache
+    :rtype: (int, dict, dict)
+    """
+    cacheFile = _cacheFile(fileName)
+    try:
+        with open(cacheFile, "rb") as fp:
+            mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        return _parseFontCache(memoryview(mm))
+    except (struct.error, ValueError, IndexError, OSError) as ex:
+        logger.debug(f"Ignoring font cache {cacheFile}: {ex}")
+    return None
+
+
+def _parseFontCache(mv):
+    # See _writeFontCache.  Raises ValueError if the cache is out of date.
+    magic, version, count = _CACHEHEADER.unpack_from(mv, 0)
+    if magic != _CACHEMAGIC or version != _CACHEVERSION:
+        raise ValueError("not a current font cache")
+    pos = _CACHEHEADER.size
+    for _ in range(count):
+        n, mtime, size = _CACHESOURCE.unpack_from(mv, pos)
+        pos += _CACHESOURCE.size
+        st = os.stat(bytes(mv[pos : pos + n]).decode())
+        pos += n
+        if st.st_mtime_ns != mtime or st.st_size != size:
+            raise ValueError("font has changed")
+
+    lineHeight, count, nModes = _CACHEFONT.unpack_from(mv, pos)
+    pos += _CACHEFONT.size
+    modes = []
+    for _ in range(nModes):
+        n = mv[pos]
+        modes.append(bytes(mv[pos + 1 : pos + 1 + n]).decode())
+        pos += n + 1
+
+    end = pos + count * _CACHEGLYPH.size
+    records = _CACHEGLYPH.iter_unpack(mv[pos:end])
+    data = mv[end:]
+    glyphs = {}
+    bitmaps = {}
+    for ch, dx, dy, l, t, r, b, w, h, m, offset, bOffset in records:
+        mode = modes[m]
+        if w and h:
+            pixels = data[offset:bOffset]
+            gImg = Image.frombuffer(mode, (w, h), pixels, "raw", mode, 0, 1)
+        else:
+            gImg = Image.new(mode, (w, h))
+        glyphs[ch] = (dx, dy), (l, t, r, b), (0, 0, w, h), gImg
+        bitmaps[ch] = data[bOffset : bOffset + w * h]
+    return (lineHeight, glyphs, bitmaps)
+
+
 class bmImageFont(ImageFont.ImageFont):
     """
     Load BMFONT using a PIL ImageFont style interface.
@@ -102,16 +272,165 @@ class bmImageFont(ImageFont.ImageFont):
     :param defaultChar: Character to display if a glyph is requested that
         does not exist in the font
     :type defaultChar: str
+    :param maskCacheSize: The number of recently rendered strings to keep
+    :type maskCacheSize: int
+    :param cache: Load the font from a compiled cache file when one is up to
+        date, and create one when it is not
+    :type cache: bool
+
+    ..note:
+        Glyphs are converted into an atlas of per-mode bitmaps when they are
+        first needed (mode '1' when the font is loaded).  Strings are
+        rendered by joining glyph cells rather than pasting each glyph.
+
+    ..note:
+        The compiled cache is written to the user's cache directory
+        ($XDG_CACHE_HOME or ~/.cache, under tinyDisplay/fonts) and is rebuilt
+        whenever the font file or its images change.  If it cannot be
+        written the font is simply loaded from its files each time.
+
+    ..note:
+        Strings are measured from tables of the advance and height of every
+        code point in the font (see getsize).
+
+    ..note:
+        A font can be shared by widgets rendered on different threads.  The
+        atlas, cells and rendered strings are built under a lock and
+        gmImage is kept per thread.
     """
 
-    def __init__(self, fileName, defaultChar=" ", *args, **kwargs):
+    def __init__(
+        self,
+        fileName,
+        defaultChar=" ",
+        maskCacheSize=128,
+        cache=True,
+        *args,
+        **kwargs,
+    ):
         self._defaultChar = defaultChar
+        self._maskCacheSize = maskCacheSize
+        self._masks = OrderedDict()
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._cache = cache
         self._load(fileName, **kwargs)
         self.font = self
 
     def _load(self, fileName, *args, **kwargs):
-        self.lineHeight, self.tdGlyphs = _readGlyphData(fileName)
         self.xadvance = kwargs["xadvance"] if "xadvance" in kwargs else None
+        self._atlas = {}
+        self._cells = {}
+        self._cellWidths = {}
+
+        cached = _readFontCache(fileName) if self._cache else None
+        if cached is not None:
+            self.lineHeight, self.tdGlyphs, bitmaps = cached
+            self._atlas["1"] = {
+                ch: (self.xadvance or dx, l, t, w, h, bitmaps[ch])
+                for ch, ((dx, dy), (l, t, r, b), (_, _, w, h), gImg) in (
+                    self.tdGlyphs.items()
+                )
+            }
+            self._measureTables()
+            return
+
+        sources = [str(fileName)]
+        self.lineHeight, self.tdGlyphs = _readGlyphData(fileName, sources)
+        self._measureTables()
+        atlas = self._glyphAtlas("1")
+        if self._cache:
+            _writeFontCache(
+                fileName,
+                sources,
+                self.lineHeight,
+                self.tdGlyphs,
+                {ch: g[5] for ch, g in atlas.items()},
+            )
+
+    def _measureTables(self):
+        """
+        Build the tables used to measure strings.
+
+        Every code point up to the largest in the font's basic multilingual
+        plane (or the default character) has an entry holding the advance
+        and line height of its glyph.  Code points without a glyph hold the
+        measurements of the default character and glyphs beyond the table
+        are kept in a dictionary.  When every value fits in a byte, the
+        first 256 entries are also kept as byte strings so that latin-1 text
+        can be measured with bytes.translate.
+        """
+        glyphs = self.tdGlyphs
+        default = ord(self._defaultChar)
+
+        def measure(ch):
+            g = glyphs.get(ch)
+            if g is None:
+                return (0, self.lineHeight)
+            return (self.xadvance or g[0][0], max(self.lineHeight, g[2][3]))
+
+        size = 1 + max(
+            max((c for c in glyphs if c < _TABLESIZE), default=0), default
+        )
+        self._defaultSize = dAdvance, dHeight = measure(default)
+        self._advances = array("H", [dAdvance]) * size
+        self._heights = array("H", [dHeight]) * size
+        self._wide = {}
+        for ch in glyphs:
+            if ch < size:
+                self._advances[ch], self._heights[ch] = measure(ch)
+            else:
+                self._wide[ch] = measure(ch)
+
+        # Lines are only taller than lineHeight if a glyph is
+        heights = [h for a, h in self._wide.values()]
+        self._tall = max(self._heights.tolist() + heights) > self.lineHeight
+
+        latin1 = [
+            (self._advances[c], self._heights[c])
+            if c < size
+            else (dAdvance, dHeight)
+            for c in range(256)
+        ]
+        self._latin1 = None
+        if all(a < 256 and h < 256 for a, h in latin1):
+            self._latin1 = (
+                bytes(a for a, h in latin1),
+                bytes(h for a, h in latin1),
+            )
+
+    def _glyphAtlas(self, mode):
+        """
+        Return the glyphs of the font prepared for rendering in a mode.
+
+        :param mode: The image mode
+        :type mode: str
+        :returns: (advance, xoffset, top, width, height, bitmap) for each
+            character.  Top is relative to the bottom of the line.  The bitmap
+            holds one byte per pixel for the modes in _BYTEMODES and is an
+            image in the requested mode otherwise.
+        :rtype: dict
+        """
+        atlas = self._atlas.get(mode)
+        if atlas is not None:
+            return atlas
+
+        with self._lock:
+            atlas = self._atlas.get(mode)
+            if atlas is not None:
+                return atlas
+
+            atlas = {}
+            for ch, ((dx, dy), (l, t, r, b), (_, _, w, h), gImg) in (
+                self.tdGlyphs.items()
+            ):
+                # Convert exactly as pasting the glyph would
+                bitmap = gImg.convert(mode)
+                if mode in _BYTEMODES:
+                    bitmap = bitmap.convert("L").tobytes()
+                atlas[ch] = (self.xadvance or dx, l, t, w, h, bitmap)
+            self._atlas[mode] = atlas
+            return atlas
 
     def getsize(self, text, *args, **kwargs):
         """
@@ -132,25 +451,112 @@ class bmImageFont(ImageFont.ImageFont):
             inclusion of args and kwargs is to prevent an exception if getsize
             is passed arguments that it does not need.
         """
-        xsize = xLineSize = 0
-        ysize = yLineSize = 0
+        if "\n" not in text:
+            return self._lineSize(text)
 
+        xsize = ysize = 0
         for line in text.split("\n"):
-            xLineSize = 0
-            yLineSize = self.lineHeight
-            for s in line:
-                i = (
-                    ord(s)
-                    if ord(s) in self.tdGlyphs
-                    else ord(self._defaultChar)
+            x, y = self._lineSize(line)
+            xsize = max(xsize, x)
+            ysize += y
+        return (xsize, ysize)
+
+    def _lineSize(self, line):
+        # Measure a line with the tables built by _measureTables
+        if self._latin1 is not None:
+            try:
+                b = line.encode("latin-1")
+            except UnicodeEncodeError:
+                pass
+            else:
+                advances, heights = self._latin1
+                return (
+                    sum(b.translate(advances)),
+                    max(b.translate(heights), default=self.lineHeight)
+                    if self._tall
+                    else self.lineHeight,
                 )
-                xLineSize += (
-                    self.xadvance if self.xadvance else self.tdGlyphs[i][0][0]
+
+        codes = list(map(ord, line))
+        try:
+            x = sum(map(self._advances.__getitem__, codes))
+        except IndexError:
+            # Code points beyond the table are looked up one at a time
+            size, wide = len(self._advances), self._wide
+            sizes = [
+                (self._advances[c], self._heights[c])
+                if c < size
+                else wide.get(c, self._defaultSize)
+                for c in codes
+            ]
+            return (
+                sum(a for a, h in sizes),
+                max((h for a, h in sizes), default=self.lineHeight),
+            )
+        if not self._tall:
+            return (x, self.lineHeight)
+        heights = map(self._heights.__getitem__, codes)
+        return (x, max(heights, default=self.lineHeight))
+
+    def multilineSize(self, text, spacing=0):
+        """
+        Get the size that text will require when drawn by PIL.ImageDraw.
+
+        Matches the size of `PIL.ImageDraw.ImageDraw.textbbox` without
+        measuring the text through PIL.  Each line starts the height of 'A'
+        plus spacing pixels below the line before it.
+
+        :param text: The text value to measure
+        :type text: str
+        :param spacing: The number of pixels added between lines
+        :type spacing: int
+        :returns: The size in pixels (x, y)
+        :rtype: (int, int)
+        """
+        lines = text.split("\n")
+        if len(lines) == 1:
+            return self._lineSize(text)
+
+        step = self._lineSize("A")[1] + spacing
+        top = bottom = right = 0
+        for i, line in enumerate(lines):
+            x, y = self._lineSize(line)
+            right = max(right, x)
+            top = min(top, i * step)
+            bottom = max(bottom, i * step + y)
+        return (right, bottom - top)
+
+    def cellWidth(self, text):
+        """
+        Return the width of the character cells that text is drawn in.
+
+        When every glyph of the text has the same advance and is drawn
+        within its cell (its advance by the font's lineHeight), changing a
+        character only changes the pixels of its own cell.
+
+        :param text: The text to check
+        :type text: str
+        :returns: The advance shared by the characters of text, or None if
+            their advances differ or a glyph extends outside of its cell
+        :rtype: int
+        """
+        widths = self._cellWidths
+        width = None
+        for c in text:
+            w = widths.get(c, -1)
+            if w == -1:
+                atlas = self._glyphAtlas("1")
+                ch = ord(c) if ord(c) in atlas else ord(self._defaultChar)
+                dx, l, t, w, h, bitmap = atlas[ch]
+                y = self.lineHeight + t
+                fits = 0 <= l and l + w <= dx and 0 <= y and y + h <= (
+                    self.lineHeight
                 )
-                yLineSize = max(yLineSize, self.tdGlyphs[i][2][3])
-            xsize = max(xsize, xLineSize)
-            ysize += yLineSize
-        return (xsize, ysize)
+                w = widths[c] = dx if fits else None
+            if w is None or (width is not None and w != width):
+                return None
+            width = w
+        return width
 
     def getmask(self, text, mode="1", *args, **kwargs):
         """
@@ -171,26 +577,322 @@ class bmImageFont(ImageFont.ImageFont):
             The `PIL.ImageFont.getmask` method uses more than one version of getmask
             but bmImageFont.getmask only requires the text and mode arguments.  The
             inclusion of args and kwargs is to prevent an exception if getmask is passed arguments that it does not need.
+
+        ..note:
+            The most recently rendered strings are cached (see maskCacheSize)
+            so the returned mask is shared and must not be modified.
         """
-        img = Image.new(mode, self.getsize(text))
-        yp = 0
-        for line in text.split("\n"):
-            ls = self.getsize(line)
-            xp = 0
-            yp += ls[1]
-            for s in line:
-                i = (
-                    ord(s)
-                    if ord(s) in self.tdGlyphs
-                    else ord(self._defaultChar)
-                )
-                img.paste(
-                    self.tdGlyphs[i][3],
-                    (xp + self.tdGlyphs[i][1][0], yp + self.tdGlyphs[i][1][1]),
-                )
-                xp += (
-                    self.xadvance if self.xadvance else self.tdGlyphs[i][0][0]
-                )
-        img.load()
-        self.gmImage = img
+        key = (text, mode)
+        with self._lock:
+            img = self._masks.get(key)
+            if img is not None:
+                self._masks.move_to_end(key)
+        if img is None:
+            img = self._renderText(text, mode)
+            with self._lock:
+                self._masks[key] = img
+                if len(self._masks) > self._maskCacheSize:
+                    self._masks.popitem(last=False)
+        self._local.image = img
         return img.im
+
+    @property
+    def gmImage(self):
+        """
+        Return the image of the last text rendered by getmask.
+
+        Each thread sees the image of its own last call to getmask.
+
+        :rtype: `PIL.Image.Image`
+        """
+        return getattr(self._local, "image", None)
+
+    def _glyphCells(self, mode, height):
+        """
+        Return glyphs drawn into cells that are one line high.
+
+        Each cell is as wide as the glyph's advance and holds the glyph at
+        its offset from the bottom of the line, stored column by column.  A
+        line whose glyphs all have cells is rendered by joining the cells
+        and transposing the result.
+
+        :param mode: The image mode (one of _BYTEMODES)
+        :type mode: str
+        :param height: The height of the line
+        :type height: int
+        :returns: The cell for each character or None for glyphs that
+            extend outside of their cell
+        :rtype: dict
+        """
+        key = (mode, height)
+        cells = self._cells.get(key)
+        if cells is not None:
+            return cells
+
+        with self._lock:
+            cells = self._cells.get(key)
+            if cells is not None:
+                return cells
+
+            cells = {}
+            atlas = self._glyphAtlas(mode)
+            for ch, (dx, l, t, w, h, bitmap) in atlas.items():
+                y = height + t
+                if l < 0 or l + w > dx or y < 0 or y + h > height:
+                    cells[ch] = None
+                    continue
+                cell = bytearray(dx * height)
+                for r in range(h):
+                    o = (y + r) * dx + l
+                    cell[o : o + w] = bitmap[r * w : (r + 1) * w]
+                cells[ch] = (
+                    Image.frombytes("L", (dx, height), bytes(cell))
+                    .transpose(Image.Transpose.TRANSPOSE)
+                    .tobytes()
+                    if dx and height
+                    else b""
+                )
+            self._cells[key] = cells
+            return cells
+
+    def _renderText(self, text, mode):
+        # Each line is as tall as the font's lineHeight or its tallest glyph
+        # and glyphs are placed relative to the bottom of their line
+        atlas = self._glyphAtlas(mode)
+        default = ord(self._defaultChar)
+        lines = []
+        width = height = 0
+        for line in text.split("\n"):
+            chars = [ord(c) if ord(c) in atlas else default for c in line]
+            glyphs = [atlas[ch] for ch in chars]
+            lineWidth = sum(g[0] for g in glyphs)
+            lineHeight = max([self.lineHeight] + [g[4] for g in glyphs])
+            lines.append((chars, glyphs, lineWidth, lineHeight))
+            width = max(width, lineWidth)
+            height += lineHeight
+
+        if mode not in _BYTEMODES:
+            img = Image.new(mode, (width, height))
+            y = 0
+            for chars, glyphs, lineWidth, lineHeight in lines:
+                y += lineHeight
+                x = 0
+                for dx, l, t, w, h, bitmap in glyphs:
+                    img.paste(bitmap, (x + l, y + t))
+                    x += dx
+            img.load()
+            return img
+
+        if not width:
+            return Image.new(mode, (width, height))
+        rawMode = _BYTEMODES[mode]
+
+        # Glyphs that fit within their cells cannot overlap so each line can
+        # be assembled by joining the cells of its glyphs
+        rendered = []
+        for chars, glyphs, lineWidth, lineHeight in lines:
+            cells = self._glyphCells(mode, lineHeight)
+            data = [cells[ch] for ch in chars]
+            if None in data:
+                break
+            rendered.append(
+                Image.frombytes(
+                    mode,
+                    (lineHeight, lineWidth),
+                    b"".join(data),
+                    "raw",
+                    rawMode,
+                ).transpose(Image.Transpose.TRANSPOSE)
+                if lineWidth
+                else None
+            )
+        else:
+            if len(lines) == 1:
+                return rendered[0]
+            img = Image.new(mode, (width, height))
+            y = 0
+            for lineImg, (chars, glyphs, lineWidth, lineHeight) in zip(
+                rendered, lines
+            ):
+                if lineImg is not None:
+                    img.paste(lineImg, (0, y))
+                y += lineHeight
+            return img
+
+        # Otherwise copy each glyph's rows into the buffer.  Later glyphs
+        # overwrite earlier ones and glyphs are clipped to the image as paste
+        # would.
+        buf = bytearray(width * height)
+        y = 0
+        for chars, glyphs, lineWidth, lineHeight in lines:
+            y += lineHeight
+            x = 0
+            for dx, l, t, w, h, bitmap in glyphs:
+                x0, x1 = max(x + l, 0), min(x + l + w, width)
+                top = y + t
+                if x0 < x1:
+                    for r in range(max(0, -top), min(h, height - top)):
+                        o = (top + r) * width
+                        src = r * w - x - l
+                        buf[o + x0 : o + x1] = bitmap[src + x0 : src + x1]
+                x += dx
+        return Image.frombytes(
+            mode, (width, height), bytes(buf), "raw", rawMode
+        )
+
+
+class fontRegistry:
+    """
+    Process wide registry of loaded fonts.
+
+    Fonts are loaded the first time they are acquired and shared by every
+    later request for the same file, size, type and options.  Each acquire
+    must be matched by a release.  Fonts that are no longer referenced are
+    kept until keepIdle other fonts have been released so that reloading a
+    page file does not load its fonts again.
+
+    :param keepIdle: The number of unreferenced fonts to keep loaded
+    :type keepIdle: int
+    """
+
+    def __init__(self, keepIdle=8):
+        self._keepIdle = keepIdle
+        self._active = {}
+        self._idle = OrderedDict()
+        self._keys = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+
+    @staticmethod
+    def _key(fileName, size=None, type=None, **kwargs):
+        fileName = str(fileName)
+        if type is None:
+            bitmap = fileName.lower().endswith(".fnt")
+            type = "BMFONT" if bitmap else "TRUETYPE"
+        type = type.upper()
+        if size is None and type == "TRUETYPE":
+            size = _TTFSIZE
+        path = os.path.realpath(fileName)
+        return (
+            path if os.path.exists(path) else fileName,
+            None if size is None else int(size),
+            type,
+            tuple(sorted(kwargs.items())),
+        )
+
+    @staticmethod
+    def _load(key):
+        fileName, size, type, kwargs = key
+        if type == "BMFONT":
+            return bmImageFont(fileName, **dict(kwargs))
+        if type == "TRUETYPE":
+            return ImageFont.truetype(fileName, size, **dict(kwargs))
+        raise ValueError(f"Unknown font type {type}")
+
+    def acquire(self, fileName, size=None, type=None, **kwargs):
+        """
+        Return a font, loading it if it is not already loaded.
+
+        :param fileName: The font file
+        :type fileName: str or `pathlib.Path`
+        :param size: The size of a TrueType font (default 10)
+        :type size: int
+        :param type: 'BMFONT' or 'TRUETYPE'.  If not provided, files ending
+            in '.fnt' are bitmap fonts and all others TrueType fonts.
+        :type type: str
+        :param kwargs: Options passed to the font when it is loaded (e.g.
+            xadvance)
+        :returns: The font
+        :rtype: `bmImageFont` or `PIL.ImageFont.FreeTypeFont`
+        """
+        key = self._key(fileName, size, type, **kwargs)
+        with self._lock:
+            entry = self._active.get(key)
+            if entry is None:
+                font = self._idle.pop(key, None)
+                if font is None:
+                    font = self._load(key)
+                    self._loads += 1
+                entry = self._active[key] = [font, 0]
+                self._keys[id(font)] = key
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, font):
+        """
+        Release a font returned by `acquire`.
+
+        :param font: The font to release
+        """
+        with self._lock:
+            key = self._keys.get(id(font))
+            entry = self._active.get(key)
+            if entry is None or entry[0] is not font:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._active[key]
+            self._idle[key] = font
+            self._trimIdle()
+
+    def get(self, fileName, size=None, type=None, **kwargs):
+        """
+        Return a font without taking a reference to it.
+
+        The arguments are the same as `acquire`.  The font does not need to
+        be released.
+
+        ..note:
+            A font that is not referenced is kept with the idle fonts, so it
+            is shared with later requests until keepIdle other fonts have
+            been released.
+        """
+        key = self._key(fileName, size, type, **kwargs)
+        with self._lock:
+            entry = self._active.get(key)
+            if entry is not None:
+                return entry[0]
+            font = self._idle.pop(key, None)
+            if font is None:
+                font = self._load(key)
+                self._loads += 1
+                self._keys[id(font)] = key
+            self._idle[key] = font
+            self._trimIdle()
+            return font
+
+    def _trimIdle(self):
+        # Unload the least recently idle fonts beyond keepIdle
+        while len(self._idle) > self._keepIdle:
+            idle = self._idle.popitem(last=False)[1]
+            del self._keys[id(idle)]
+
+    def refCount(self, font):
+        """
+        Return the number of unreleased acquires of a font.
+
+        :param font: The font
+        :rtype: int
+        """
+        entry = self._active.get(self._keys.get(id(font)))
+        return entry[1] if entry is not None and entry[0] is font else 0
+
+    @property
+    def stats(self):
+        """
+        Return the registry's usage statistics.
+
+        :returns: The number of fonts loaded since the registry was created
+            along with the number currently referenced and idle
+        :rtype: dict
+        """
+        return {
+            "loads": self._loads,
+            "active": len(self._active),
+            "idle": len(self._idle),
+        }
+
+
+# Fonts shared by the whole process
+fonts = fontRegistry()
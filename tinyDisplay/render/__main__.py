@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""Entry point for ``python -m tinyDisplay.render``."""
+import sys
+
+from tinyDisplay.render.batch import main
+
+
+sys.exit(main())
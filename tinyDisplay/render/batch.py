@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Render a page file without a display and report its throughput.
+
+The batch renderer loads a page file, renders it as fast as possible for a
+fixed number of ticks (optionally replaying recorded dataset updates) and
+reports the rendering and overall frame rates, per-frame latency
+percentiles and peak memory.
+Frames can be written to disk as PNG files, raw pixel data or an animated
+GIF, or discarded.
+
+Usage::
+    python -m tinyDisplay.render page.yaml --ticks 1000 --data data.yaml \\
+        --replay updates.yaml --format png --output frames/
+
+.. versionadded:: 0.1.4
+"""
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+import yaml
+
+from tinyDisplay.cfg import load
+
+
+FORMATS = ("none", "png", "raw", "gif")
+
+
+def _loadFile(filename):
+    # YAML is a superset of JSON so both file types can be read with it
+    with open(filename) as fp:
+        return yaml.safe_load(fp)
+
+
+def _loadReplay(replay):
+    # Return the replayed updates indexed by the tick they are applied on
+    updates = {}
+    for u in replay or []:
+        try:
+            entry = (u["db"], u["update"], u.get("merge", False))
+            updates.setdefault(int(u.get("tick", 0)), []).append(entry)
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Invalid replay entry: {u}")
+    return updates
+
+
+def _percentile(values, pct):
+    # Nearest-rank percentile of an already sorted list
+    if not values:
+        return 0.0
+    k = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+    return values[k]
+
+
+def _peakRSS():
+    # Peak resident set size in bytes (None when unavailable)
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class _pngWriter:
+    def __init__(self, output):
+        os.makedirs(output, exist_ok=True)
+        self._output = output
+
+    def write(self, tick, img):
+        img.save(os.path.join(self._output, f"frame{tick:06d}.png"))
+
+    def close(self):
+        pass
+
+
+class _rawWriter:
+    def __init__(self, output):
+        self._fp = open(output, "wb")
+
+    def write(self, tick, img):
+        self._fp.write(img.tobytes())
+
+    def close(self):
+        self._fp.close()
+
+
+class _gifWriter:
+    def __init__(self, output, rate):
+        self._output = output
+        self._duration = int(round(1000 / rate))
+        self._frames = []
+
+    def write(self, tick, img):
+        # Rendered images are not modified once returned so keeping a
+        # reference is enough
+        self._frames.append(img)
+
+    def close(self):
+        if self._frames:
+            self._frames[0].save(
+                self._output,
+                save_all=True,
+                append_images=self._frames[1:],
+                duration=self._duration,
+                loop=0,
+            )
+
+
+def _writer(format, output, rate):
+    if format == "none":
+        return None
+    if output is None:
+        raise ValueError(f"An output is required for the {format} format")
+    if format == "png":
+        return _pngWriter(output)
+    if format == "raw":
+        return _rawWriter(output)
+    if format == "gif":
+        return _gifWriter(output, rate)
+    raise ValueError(f"Unknown output format {format}")
+
+
+def run(
+    pageFile,
+    ticks=100,
+    data=None,
+    replay=None,
+    demo=False,
+    format="none",
+    output=None,
+    rate=30,
+    traceMemory=False,
+):
+    """
+    Render a page file for a number of ticks as fast as possible.
+
+    :param pageFile: The page file to render
+    :type pageFile: str
+    :param ticks: The number of frames to render
+    :type ticks: int
+    :param data: The initial contents of the dataset ({dbName: {key: value}})
+    :type data: dict
+    :param replay: Dataset updates to apply while rendering.  Each entry is a
+        dict containing 'tick', 'db', 'update' and optionally 'merge'.
+        Updates are applied immediately before their tick is rendered.
+    :type replay: list
+    :param demo: Populate the dataset with the sample values from the page file
+    :type demo: bool
+    :param format: How to save each frame ('none', 'png', 'raw' or 'gif')
+    :type format: str
+    :param output: The directory (png) or file (raw, gif) to write frames to
+    :type output: str
+    :param rate: The frame rate used for gif output
+    :type rate: float
+    :param traceMemory: Report peak Python memory allocations measured with
+        tracemalloc instead of the peak resident set size
+    :type traceMemory: bool
+    :returns: The statistics for the run
+    :rtype: dict
+
+    ..note:
+        Frame latency covers applying any replayed updates and rendering the
+        frame.  Time spent writing frames is excluded.  'fps' is computed
+        from the frame latencies so it measures rendering alone, while
+        'wallFps' is computed from the elapsed time of the whole run and
+        includes writing frames.
+    """
+    updates = _loadReplay(replay)
+    writer = _writer(format, output, rate)
+
+    if traceMemory:
+        tracemalloc.start()
+    try:
+        display = load(pageFile, dataset=data, demo=demo)
+        ds = display._dataset
+
+        latencies = []
+        changes = 0
+        start = perf_counter()
+        for tick in range(ticks):
+            frameStart = perf_counter()
+            for dbName, update, merge in updates.get(tick, ()):
+                ds.update(dbName, update, merge=merge)
+            img, changed = display.render(force=tick == 0)
+            latencies.append(perf_counter() - frameStart)
+            changes += changed
+            if writer is not None:
+                writer.write(tick, img)
+        elapsed = perf_counter() - start
+
+        peak = tracemalloc.get_traced_memory()[1] if traceMemory else None
+    finally:
+        if traceMemory:
+            tracemalloc.stop()
+        if writer is not None:
+            writer.close()
+
+    rendering = sum(latencies)
+    latencies.sort()
+    return {
+        "pageFile": str(pageFile),
+        "ticks": ticks,
+        "changed": changes,
+        "size": list(display.image.size),
+        "mode": display.image.mode,
+        "elapsed": elapsed,
+        "fps": ticks / rendering if rendering > 0 else 0.0,
+        "wallFps": ticks / elapsed if elapsed > 0 else 0.0,
+        "latency": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": _percentile(latencies, 50),
+            "p90": _percentile(latencies, 90),
+            "p99": _percentile(latencies, 99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "peakMemory": peak if traceMemory else _peakRSS(),
+        "memorySource": "tracemalloc" if traceMemory else "maxrss",
+    }
+
+
+def report(stats):
+    """
+    Format the statistics returned by `run` for display.
+
+    :param stats: The statistics to format
+    :type stats: dict
+    :returns: The formatted report
+    :rtype: str
+    """
+    lat = stats["latency"]
+    mem = stats["peakMemory"]
+    lines = [
+        f"Page file:   {stats['pageFile']}",
+        f"Frames:      {stats['ticks']} ({stats['changed']} changed) "
+        f"{stats['size'][0]}x{stats['size'][1]} {stats['mode']}",
+        f"Elapsed:     {stats['elapsed']:.3f} s",
+        f"Throughput:  {stats['fps']:.1f} frames/s rendering, "
+        f"{stats['wallFps']:.1f} frames/s overall",
+        "Latency:     "
+        + "  ".join(
+            f"{k} {lat[k] * 1000:.3f} ms"
+            for k in ("mean", "p50", "p90", "p99", "max")
+        ),
+        "Peak memory: "
+        + (
+            f"{mem / 1048576:.1f} MiB ({stats['memorySource']})"
+            if mem is not None
+            else "unavailable"
+        ),
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Run the batch renderer from the command line.
+
+    :param argv: The command line arguments (default is sys.argv[1:])
+    :type argv: list
+    :returns: The exit status
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m tinyDisplay.render",
+        description="Render a page file without a display and report "
+        "its throughput.",
+    )
+    parser.add_argument("pageFile", help="The page file to render")
+    parser.add_argument(
+        "--ticks", type=int, default=100, help="Number of frames to render"
+    )
+    parser.add_argument(
+        "--data", help="YAML or JSON file with the initial dataset contents"
+    )
+    parser.add_argument(
+        "--replay",
+        help="YAML or JSON file with a list of {tick, db, update, merge} "
+        "dataset updates to apply while rendering",
+    )
+    parser.add_argument(
+        "--demo",
+        action="store_true",
+        help="Populate the dataset with the page file's sample values",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="none",
+        help="How to save rendered frames (default discards them)",
+    )
+    parser.add_argument(
+        "--output", help="Directory (png) or file (raw, gif) for frames"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=30, help="Frame rate for gif output"
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Report peak Python allocations instead of peak RSS",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the results as JSON"
+    )
+    args = parser.parse_args(argv)
+
+    if args.format != "none" and args.output is None:
+        parser.error(f"--output is required for the {args.format} format")
+
+    stats = run(
+        args.pageFile,
+        ticks=args.ticks,
+        data=_loadFile(args.data) if args.data else None,
+        replay=_loadFile(args.replay) if args.replay else None,
+        demo=args.demo,
+        format=args.format,
+        output=args.output,
+        rate=args.rate,
+        traceMemory=args.tracemalloc,
+    )
+    print(json.dumps(stats, indent=2) if args.json else report(stats))
+    return 0
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Drive HD44780 style character displays without rendering pixels.
+
+An `hd44780` maps each frame to the character codes of the display's ROM
+and sends only the cells that changed.  Characters that are not in the ROM
+are loaded into the eight custom character (CGRAM) slots, replacing the
+least recently used glyph when every slot is taken.
+
+Frames can be given as text, as the widgets of a page placed on the
+character grid, or as images drawn with the HD44780 font, which are
+converted a cell at a time.
+
+.. versionadded:: 0.1.4
+"""
+from collections import OrderedDict
+from pathlib import Path
+from weakref import finalize
+
+from PIL import Image
+
+from tinyDisplay.exceptions import DataError
+from tinyDisplay.font import fonts
+from tinyDisplay.render.widget import text, widget
+
+
+HD44780FONT = Path(__file__).parent / "fonts/hd44780.fnt"
+
+# Number of custom character slots in CGRAM
+CGRAMSLOTS = 8
+
+# Size in pixels of an HD44780 character cell
+CELLSIZE = (5, 8)
+
+# HD44780 instructions
+_SETCGRAM = 0x40
+_SETDDRAM = 0x80
+
+# Codes that hold the same ASCII characters in every HD44780 ROM
+_ASCII = frozenset(range(0x20, 0x7E)) - {0x5C}
+
+# Maps image pixels to the mode '1' values used to read cells
+_THRESHOLD = [0] + [255] * 255
+
+
+def _romCodes(fileName, page):
+    # Return {character: code} for the characters of a BMFONT that are in
+    # the ROM drawn on page.  Each page image is a 16x16 grid of the ROM's
+    # characters so a glyph's code is its position in the grid.  ASCII
+    # glyphs drawn on other pages are included when they sit at their own
+    # code as they are common to every ROM.
+    codes = {}
+    pitch = None
+    with open(fileName) as fp:
+        for s in fp:
+            fields = s.split("#")[0].split()
+            if not fields:
+                continue
+            db = dict(f.split("=", 1) for f in fields[1:] if "=" in f)
+            if fields[0] == "common":
+                pitch = (int(db["scaleW"]) // 16, int(db["scaleH"]) // 16)
+            elif fields[0] == "char":
+                try:
+                    ch = int(db["id"])
+                except ValueError:
+                    ch = int(db["id"], 16)
+                code = (int(db["y"]) // pitch[1]) * 16 + (
+                    int(db["x"]) // pitch[0]
+                )
+                if code < 0x10 or code > 0xFF:
+                    continue
+                if int(db["page"]) == page or (code == ch and ch in _ASCII):
+                    codes.setdefault(chr(ch), code)
+    return codes
+
+
+class hd44780:
+    """
+    Character mode output for an HD44780 style display.
+
+    :param size: The number of (columns, rows) of the display
+    :type size: (int, int)
+    :param interface: The device interface.  Instructions are sent with
+        `interface.command(value)` and character codes or CGRAM rows with
+        `interface.data(values)` (the interface used by luma.core).  If
+        None, frames are tracked but not sent anywhere.
+    :param font: The BMFONT file holding the glyphs of the display's ROM
+    :type font: str or `pathlib.Path`
+    :param page: The page of the font that holds the display's ROM (0 is
+        the A02 ROM and 1 the A00 ROM of the included font)
+    :type page: int
+    :param defaultChar: Character shown in place of characters that can
+        not be displayed
+    :type defaultChar: str
+
+    ..note:
+        Characters that are not in the ROM are drawn with the font and
+        loaded into CGRAM.  A frame can show at most eight of them at once;
+        any others are shown as defaultChar.
+
+    ..note:
+        The interface must already be initialized (function set, display on
+        and entry mode increment).  Only changed cells are written so call
+        `reset` if the display may have been changed by something else.
+    """
+
+    def __init__(
+        self,
+        size=(16, 2),
+        interface=None,
+        font=HD44780FONT,
+        page=0,
+        defaultChar=" ",
+    ):
+        self._columns, self._rows = size
+        self._interface = interface
+        self._font = fonts.acquire(font)
+        finalize(self, fonts.release, self._font)
+        self._rom = _romCodes(font, page)
+        self._default = self._rom.get(defaultChar, 0x20)
+
+        if self._font.cellWidth("".join(self._rom)) != CELLSIZE[0] or (
+            self._font.lineHeight != CELLSIZE[1]
+        ):
+            raise ValueError(
+                f"{font} does not have {CELLSIZE[0]}x{CELLSIZE[1]} "
+                "character cells"
+            )
+
+        # Glyph patterns of the ROM used to read cells from images
+        self._patterns = {}
+        for ch, code in sorted(self._rom.items(), key=lambda i: i[1]):
+            self._patterns.setdefault(self._glyph(ch), code)
+
+        # Character to code or CGRAM pattern
+        self._chars = dict(self._rom)
+
+        self._stats = {"frames": 0, "cells": 0, "cgram": 0}
+        self.reset()
+
+    def reset(self):
+        """
+        Forget what the display is showing.
+
+        The next frame rewrites every cell and reloads CGRAM.
+        """
+        self._shown = [[None] * self._columns for _ in range(self._rows)]
+        self._cgram = OrderedDict()
+
+    @property
+    def size(self):
+        """
+        Return the size of the display.
+
+        :returns: (columns, rows)
+        :rtype: (int, int)
+        """
+        return (self._columns, self._rows)
+
+    @property
+    def stats(self):
+        """
+        Return the output statistics of the display.
+
+        :returns: The number of frames shown, character cells written and
+            CGRAM slots loaded
+        :rtype: dict
+        """
+        return dict(self._stats)
+
+    def display(self, frame):
+        """
+        Show a frame, sending only the cells that changed.
+
+        :param frame: The frame to show.  Text (lines separated by '\\n'), a
+            list of lines, or an image drawn with the display's font (one
+            cell for each 5x8 block of pixels)
+        :type frame: str, list or `PIL.Image.Image`
+        :returns: The number of cells written
+        :rtype: int
+        """
+        if isinstance(frame, Image.Image):
+            cells = self._blank()
+            self._imageCells(cells, frame, 0, 0)
+        else:
+            if isinstance(frame, str):
+                frame = frame.split("\n")
+            cells = self._blank()
+            for y, line in enumerate(frame):
+                self._textCells(cells, line, 0, y)
+        return self._show(cells)
+
+    def displayWidgets(self, placements):
+        """
+        Show widgets placed on the character grid.
+
+        Text widgets are converted straight to characters from their current
+        value and never drawn.  Other widgets are rendered and their images
+        converted a cell at a time.
+
+        :param placements: (widget, (column, row)) for each widget, in the
+            order they should be drawn
+        :type placements: list
+        :returns: The number of cells written
+        :rtype: int
+        """
+        cells = self._blank()
+        for w, (x, y) in placements:
+            if isinstance(w, text):
+                self._widgetCells(cells, w, x, y)
+            else:
+                self._imageCells(cells, w.render()[0], x, y)
+        return self._show(cells)
+
+    def _blank(self):
+        return [[self._rom.get(" ", 0x20)] * self._columns for _ in range(
+            self._rows
+        )]
+
+    def _glyph(self, ch):
+        # Return the CGRAM rows (5 bits each) of a character drawn with the
+        # font
+        self._font.getmask(ch)
+        img = self._font.gmImage.crop((0, 0) + CELLSIZE)
+        return bytes(b >> 3 for b in img.convert("1").tobytes())
+
+    def _cell(self, ch):
+        cell = self._chars.get(ch)
+        if cell is None:
+            if ord(ch) in self._font.tdGlyphs:
+                cell = self._glyph(ch)
+                cell = self._patterns.get(cell, cell)
+            else:
+                cell = self._default
+            self._chars[ch] = cell
+        return cell
+
+    def _textCells(self, cells, line, x, y):
+        if not 0 <= y < self._rows:
+            return
+        row = cells[y]
+        for i, ch in enumerate(line, x):
+            if 0 <= i < self._columns:
+                row[i] = self._cell(ch)
+
+    def _widgetCells(self, cells, w, x, y):
+        # Place the current value of a text widget without drawing it
+        try:
+            w._evalAll()
+        except DataError:
+            pass
+        value = str(w._value)
+        width = w._width if w._width is not None else (w._size or (None,))[0]
+        if w._wrap and width is not None:
+            value = w._makeWrapped(value, width)
+        lines = value.split("\n")
+        size = (
+            max(len(line) for line in lines),
+            len(lines),
+        )
+        area = (
+            size[0] if width is None else width // CELLSIZE[0],
+            size[1] if not w._size else w._size[1] // CELLSIZE[1],
+        )
+        dx, dy = widget._position(area, size, (0, 0), w.just)
+        for i, line in enumerate(lines):
+            if 0 <= dy + i < area[1]:
+                lx = max(0, -dx)
+                self._textCells(
+                    cells, line[lx : lx + area[0]], x + dx + lx, y + dy + i
+                )
+
+    def _imageCells(self, cells, img, x, y):
+        # Read the characters of an image into cells starting at (x, y)
+        if img.mode != "1":
+            img = img.convert("L").point(_THRESHOLD, "1")
+        columns = min(img.size[0] // CELLSIZE[0], self._columns - x)
+        rows = min(img.size[1] // CELLSIZE[1], self._rows - y)
+        if columns <= 0 or rows <= 0:
+            return
+
+        stride = (img.size[0] + 7) // 8
+        data = img.tobytes()
+        # Image rows above the display are not shown
+        for r in range(max(0, -y), rows):
+            patterns = [bytearray(CELLSIZE[1]) for _ in range(columns)]
+            for py in range(CELLSIZE[1]):
+                start = (r * CELLSIZE[1] + py) * stride
+                bits = int.from_bytes(data[start : start + stride], "big")
+                shift = stride * 8
+                for c in range(columns):
+                    shift -= CELLSIZE[0]
+                    patterns[c][py] = (bits >> shift) & 0x1F
+            row = cells[y + r]
+            for c, pattern in enumerate(patterns):
+                if x + c >= 0:
+                    pattern = bytes(pattern)
+                    row[x + c] = self._patterns.get(pattern, pattern)
+
+    def _load(self, needed):
+        # Give each custom pattern of a frame a CGRAM slot, returning the
+        # slot of each.  Patterns already loaded are kept and the least
+        # recently used patterns that are not needed are replaced.
+        cgram = self._cgram
+        for pattern in needed:
+            if pattern in cgram:
+                cgram.move_to_end(pattern)
+
+        free = sorted(set(range(CGRAMSLOTS)) - set(cgram.values()))
+        for pattern in needed:
+            if pattern in cgram:
+                continue
+            if free:
+                slot = free.pop(0)
+            else:
+                old = next((p for p in cgram if p not in needed), None)
+                if old is None:
+                    break
+                slot = cgram.pop(old)
+            cgram[pattern] = slot
+            self._stats["cgram"] += 1
+            if self._interface is not None:
+                self._interface.command(_SETCGRAM | slot << 3)
+                self._interface.data(list(pattern))
+        return cgram
+
+    def _address(self, x, y):
+        # Rows 2 and 3 continue rows 0 and 1 in display memory
+        return (0x40 if y % 2 else 0) + (self._columns if y > 1 else 0) + x
+
+    def _show(self, cells):
+        needed = dict.fromkeys(
+            cell for row in cells for cell in row if type(cell) is bytes
+        )
+        cgram = self._load(needed)
+
+        written = 0
+        for y, row in enumerate(cells):
+            codes = [
+                cell
+                if type(cell) is int
+                else cgram.get(cell, self._default)
+                for cell in row
+            ]
+            shown = self._shown[y]
+            x = 0
+            while x < self._columns:
+                if codes[x] == shown[x]:
+                    x += 1
+                    continue
+                # Extend the run across single unchanged cells, which cost
+                # no more to rewrite than a new address
+                end = x + 1
+                while end < self._columns and (
+                    codes[end] != shown[end]
+                    or end + 1 < self._columns
+                    and codes[end + 1] != shown[end + 1]
+                ):
+                    end += 1
+                if self._interface is not None:
+                    self._interface.command(_SETDDRAM | self._address(x, y))
+                    self._interface.data(codes[x:end])
+                shown[x:end] = codes[x:end]
+                written += end - x
+                x = end
+
+        self._stats["frames"] += 1
+        self._stats["cells"] += written
+        return written
@@ -8,17 +8,54 @@ Collection widgets to present, and animate the display canvases.
 .. versionadded:: 0.0.1
 """
 import bisect
+from concurrent.futures import ThreadPoolExecutor
 from inspect import currentframe, getargvalues, getfullargspec, isclass
 import logging
+import threading
+from math import ceil
+from time import monotonic
 
 from PIL import Image
 
 from tinyDisplay.render import collection
-from tinyDisplay.render.widget import image, widget, PARAMS
+from tinyDisplay.render.widget import (
+    _childTimes,
+    _earliest,
+    image,
+    widget,
+    PARAMS,
+)
 from tinyDisplay.utility import getArgDecendents, getNotDynamicDecendents
 
 logger = logging.getLogger("tinyDisplay")
 
+# Widget states that a canvas can wait on (see marquee's `wait` argument)
+_WAITSTATES = ("atStart", "atPause", "atPauseEnd")
+
+# Image modes that are pasted using their transparency (see widget._place)
+_TRANSLUCENTMODES = ("RGBA", "LA", "L")
+
+# Thread pool shared by all threaded canvases.  It is created when first used.
+_threadPool = None
+_threadPoolLock = threading.Lock()
+_threadState = threading.local()
+
+
+def _markPoolThread():
+    _threadState.inPool = True
+
+
+def _getThreadPool():
+    global _threadPool
+    with _threadPoolLock:
+        if _threadPool is None:
+            _threadPool = ThreadPoolExecutor(
+                thread_name_prefix="tinyDisplay",
+                initializer=_markPoolThread,
+            )
+    return _threadPool
+
+
 class canvas(widget):
     """
     The Canvas class allows a group of widgets to be displayed together.
@@ -28,21 +65,51 @@ class canvas(widget):
     in relation to each other.  A canvas can contain any subclass of widget
     including other canvases.
 
+    :param threaded: Render the canvas's widgets concurrently on a shared
+        thread pool.  Pillow releases the GIL for much of its pixel work so
+        canvases containing several expensive widgets (e.g. TrueType text)
+        can render faster on multi-core systems.
+    :type threaded: bool
     :param *args: Additional arguments to pass to parent `widget`
     :param **kwargs: Additional keyword arguments to pass to parent `widget`
+
+    ..note:
+        Widgets of a threaded canvas are composited in z-order after all of
+        them have rendered.  Canvases that are rendered by the thread pool
+        render their own widgets sequentially.
     """
 
+    RENDERSTATE = ["_activeList", "_visibleList", "_shownList", "_newWidget"]
+
     # Standard Z levels
     ZSTD = 100
     ZHIGH = 1000
     ZVHIGH = 10000
 
-    def __init__(self, *args, **kwargs):
+    __slots__ = (
+        "_threaded",
+        "_widgets_dict",
+        "_placements",
+        "_activeList",
+        "_visibleList",
+        "_shownList",
+        "_newWidget",
+        "_geometry",
+        "_priorities",
+        "_renderPlan",
+    )
+
+    def __init__(self, *args, threaded=False, **kwargs):
         super().__init__(*args, **kwargs)
+        self._threaded = threaded
         self._widgets_dict = {}
         self._placements = []
         self._activeList = []
+        self._visibleList = []
+        self._shownList = []
+        self._geometry = []
         self._priorities = []
+        self._renderPlan = None
         self._reprVal = "no widgets"
         self._tick = 0  # Add tick counter
 
@@ -98,100 +165,482 @@ class canvas(widget):
         self._newWidget = True
 
         offset, just = self._convertPlacement(placement)
+        self._checkJust(just or "lt")
         item._parent = self
+        item._computeLocalDB()
 
         # Place widget according to its z value
         pos = bisect.bisect_left(self._priorities, z)
         self._priorities.insert(pos, z)
         self._placements.insert(pos, (item, offset, just))
         self._activeList.insert(pos, True)
+        self._visibleList.insert(pos, True)
+        self._shownList.insert(pos, None)
+        self._geometry.insert(pos, None)
+        self._renderPlan = None
 
         self._reprVal = f'{len(self._placements) or "no"} widgets'
 
         self.render(reset=True)
 
+    def _children(self):
+        return [p[0] for p in self._placements]
+
+    def _buildRenderPlan(self):
+        """
+        Build the plan used to render the canvas's widgets.
+
+        The plan lists each placement along with whether the widget supports
+        waiting (e.g. a marquee) and whether its size is fixed so that the
+        render loop does not need to inspect each widget on every frame.
+
+        :returns: The placements as (index, widget, offset, justification,
+            canWait, fixed) tuples and the widgets that can wait
+        :rtype: (list, list)
+
+        ..note:
+            Each canvas keeps its own plan.  A nested canvas is rendered as
+            a single entry of its parent's plan and follows its own plan to
+            composite its widgets.
+
+        ..note:
+            A widget's size is fixed if it was given a size that is not
+            dynamic and it is not trimmed.  The canvas knows where the image
+            of such a widget will be placed before rendering it, which allows
+            it to skip widgets that cannot be seen.
+        """
+        entries = []
+        waiters = []
+        for i, (wid, off, anc) in enumerate(self._placements):
+            canWait = hasattr(wid, "_wait")
+            size = wid._dV._statements.get("_size")
+            fixed = (
+                wid._size is not None
+                and wid._trim is None
+                and size is not None
+                and not size.dynamic
+            )
+            entries.append((i, wid, off, anc or "lt", canWait, fixed))
+            if canWait:
+                waiters.append(wid)
+        self._renderPlan = (entries, waiters)
+        return self._renderPlan
+
+    def compileRenderPlan(self):
+        """Prepare the render plans for this canvas and its children."""
+        self._buildRenderPlan()
+        super().compileRenderPlan()
+
+    @staticmethod
+    def _atWaitState(wid, wait):
+        return getattr(wid, wait) if wait in _WAITSTATES else None
+
+    def _holding(self, wid, canWait, notReady, force):
+        # True if a widget has reached its wait state and must hold its
+        # image until every widget of the same wait type is ready
+        wait = wid._wait if canWait else None
+        return (
+            not force
+            and wait is not None
+            and notReady[wait]
+            and self._atWaitState(wid, wait)
+        )
+
+    def _due(self, wid, force):
+        """
+        Determine whether a widget's update period has elapsed.
+
+        Widgets without an update period are always due.  When a widget is
+        due the start of its next period is recorded.
+
+        :param wid: The widget to test
+        :type wid: `tinyDisplay.render.widget`
+        :param force: True if the canvas is being force rendered
+        :type force: bool
+        :returns: True if the widget should render on this tick
+        :rtype: bool
+        """
+        nxt = wid._nextUpdate
+        if wid._updateTicks is not None:
+            if not force and nxt is not None and self._tick < nxt:
+                return False
+            wid._nextUpdate = self._tick + wid._updateTicks
+            return True
+
+        period = wid._updateSeconds
+        if period is None:
+            return True
+        now = monotonic()
+        if not force and nxt is not None and now < nxt:
+            return False
+        # Stay on schedule unless a whole period has been missed
+        if nxt is None or now >= nxt + period:
+            nxt = now
+        wid._nextUpdate = nxt + period
+        return True
+
+    def _ticksUntilDue(self, wid, rate):
+        # The number of ticks before a resting widget is next due
+        nxt = wid._nextUpdate
+        if nxt is None:
+            return 1
+        if wid._updateTicks is not None:
+            return max(1, nxt - self._tick)
+        if rate is None:
+            return 1
+        return max(1, ceil((nxt - monotonic()) * rate))
+
+    def _renderConcurrently(
+        self, entries, notReady, force, size, args, kwargs
+    ):
+        # Render the widgets on the shared thread pool.  Returns the
+        # (image, updated) result for each entry in z-order or None for
+        # widgets that were culled.  Widgets are only culled when they are
+        # off the canvas as occlusion depends on the widgets above.
+        pool = _getThreadPool()
+        start = monotonic()
+        futures = []
+        for i, wid, off, anc, canWait, fixed in entries:
+            if self._culled(
+                i, wid, off, anc, canWait, fixed, notReady, force, size, ()
+            ):
+                futures.append(False)
+            elif self._holding(
+                wid, canWait, notReady, force
+            ) or not self._due(wid, force):
+                futures.append(None)
+            else:
+                futures.append(
+                    pool.submit(wid.render, *args, force=force, **kwargs)
+                )
+        rendered = [
+            (
+                None
+                if f is False
+                else (wid.image, False) if f is None else f.result()
+            )
+            for f, (i, wid, off, anc, canWait, fixed) in zip(
+                futures, entries
+            )
+        ]
+
+        # Time spent waiting on the pool belongs to the widgets, not the canvas
+        _childTimes()[-1] += monotonic() - start
+        return rendered
+
+    def _placeAt(self, i, size, wSize, offset, just):
+        """
+        Return where a placement's image is pasted and the part that is seen.
+
+        Results are cached for each placement and only recomputed when the
+        size of the canvas or of the widget's image changes.
+
+        :param i: The index of the placement
+        :type i: int
+        :param size: The size of the canvas
+        :type size: (int, int)
+        :param wSize: The size of the widget's image
+        :type wSize: (int, int)
+        :param offset: The placement's offset
+        :type offset: (int, int)
+        :param just: The placement's justification
+        :type just: str
+        :returns: The paste position and the (left, top, right, bottom)
+            bounds of the image on the canvas (None if it is off the canvas)
+        :rtype: ((int, int), (int, int, int, int))
+        """
+        g = self._geometry[i]
+        if g is not None and g[0] == size and g[1] == wSize:
+            return g[2]
+
+        x, y = widget._position(size, wSize, offset, just)
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + wSize[0], size[0]), min(y + wSize[1], size[1])
+        rect = (
+            (left, top, right, bottom)
+            if left < right and top < bottom
+            else None
+        )
+        self._geometry[i] = (size, wSize, ((x, y), rect))
+        return ((x, y), rect)
+
+    @staticmethod
+    def _covered(rect, covers):
+        # True if rect lies completely within one of the covering rectangles
+        left, top, right, bottom = rect
+        for cl, ct, cr, cb in covers:
+            if cl <= left and ct <= top and right <= cr and bottom <= cb:
+                return True
+        return False
+
+    def _culled(
+        self, i, wid, off, anc, canWait, fixed, notReady, force, size, covers
+    ):
+        """
+        Skip a widget that cannot be seen.
+
+        A widget whose size is fixed is not rendered if its image would lie
+        completely outside of the canvas or beneath an opaque widget that is
+        above it.  Instead it is skipped (see `widget.skip`) so that its
+        animations and activity timers stay on schedule.  Widgets whose
+        image may change on this tick are rendered as usual as skipping
+        cannot stand in for the render.
+
+        :returns: True if the widget was culled
+        :rtype: bool
+        """
+        if force or not fixed:
+            return False
+        pos, rect = self._placeAt(i, size, wid.image.size, off, anc)
+        if rect is not None and not self._covered(rect, covers):
+            return False
+
+        # Only advance widgets that would have rendered
+        if not self._holding(wid, canWait, notReady, force):
+            ticks = wid.nextChange()
+            if ticks is not None and ticks <= 1:
+                return False
+            if self._due(wid, force):
+                wid.skip(1)
+
+        # The widget's active state is still followed while it is hidden
+        statement = wid._dV._statements["_activeWhen"]
+        value = statement.eval()
+        if statement._changed:
+            wid._setEvaluated("_activeWhen", value)
+        return True
+
+    def _notReady(self, waiters):
+        # Determine, for each wait type, whether any widget has not reached it
+        notReady = {}
+        for wid in waiters:
+            wait = wid._wait
+            if wait is not None:
+                notReady[wait] = not self._atWaitState(
+                    wid, wait
+                ) or notReady.get(wait, False)
+        return notReady
+
+    def _nextChange(self, rate):
+        if getattr(self, "_newWidget", False):
+            return 1
+        ticks = super()._nextChange(rate)
+
+        # Widgets with an update period may change when they are next due
+        for i, wid, off, anc, canWait, fixed in (
+            self._renderPlan or self._buildRenderPlan()
+        )[0]:
+            if wid._updateTicks is not None or wid._updateSeconds is not None:
+                ticks = _earliest(ticks, self._ticksUntilDue(wid, rate))
+        return ticks
+
+    def _scheduledChildren(self):
+        # Widgets that are holding at their wait state do not render and
+        # widgets with an update period do not render before they are due
+        entries, waiters = self._renderPlan or self._buildRenderPlan()
+        notReady = self._notReady(waiters)
+        return [
+            wid
+            for i, wid, off, anc, canWait, fixed in entries
+            if not self._holding(wid, canWait, notReady, False)
+            and wid._updateTicks is None
+            and wid._updateSeconds is None
+        ]
+
+    def _skip(self, ticks):
+        super()._skip(ticks)
+        self._tick += ticks
+
     def _renderWidgets(self, force=False, *args, **kwargs):
         # Increment tick counter
         self._tick += 1
 
-        notReady = {}
+        entries, waiters = self._renderPlan or self._buildRenderPlan()
+
         # Check wait status for any widgets that have wait settings
-        for i in self._placements:
-            wid, off, anc = i
-            if hasattr(wid, "_wait") and wid._wait is not None:
-                waiting = {
-                    "atStart": wid.atStart,
-                    "atPause": wid.atPause,
-                    "atPauseEnd": wid.atPauseEnd,
-                }.get(wid._wait)
-                notReady[wid._wait] = not waiting or notReady.get(
-                    wid._wait, False
-                )
+        notReady = self._notReady(waiters)
 
         changed = (
             False if not force and not self._newWidget and self.image else True
         )
         results = []
+        activeList = self._activeList
+        visibleList = self._visibleList
+        shownList = self._shownList
+        size = tuple(self._size or self.image.size)
+
+        # The areas of the canvas that changed (None if it must be redrawn)
+        damage = None if changed or self.image.size != size else []
+
+        rendered = None
+        if (
+            self._threaded
+            and len(entries) > 1
+            and not getattr(_threadState, "inPool", False)
+        ):
+            rendered = self._renderConcurrently(
+                entries, notReady, force, size, args, kwargs
+            )
 
-        for i, p in enumerate(self._placements):
-            wid, off, anc = p
-
-            if not force:
-                # If widget has wait setting
-                if hasattr(wid, "_wait"):
-                    # Check to see if any widgets of this widgets wait type are not ready
-                    if notReady[wid._wait]:
-                        # If there are widgets waiting, see if this widget should still be
-                        # rendered because it has not reached the point it should wait
-                        if not {
-                            "atStart": wid.atStart,
-                            "atPause": wid.atPause,
-                            "atPauseEnd": wid.atPauseEnd,
-                        }.get(wid._wait):
-                            img, updated = wid.render(
-                                force=force, *args, **kwargs
-                            )
-                        else:
-                            img = wid.image
-                            updated = False
-                    else:
-                        # If everyone is ready, then it's ok to render all of the waiting widgets
-                        img, updated = wid.render(force=force, *args, **kwargs)
-                else:
-                    # If this widget isn't part of a wait type, then it always gets rendered
-                    img, updated = wid.render(force=force, *args, **kwargs)
+        # Widgets are visited from the top down so that the areas covered by
+        # opaque widgets are known before the widgets beneath them render
+        covers = []
+        for i, wid, off, anc, canWait, fixed in reversed(entries):
+            if rendered is not None:
+                result = rendered[i]
+            elif self._culled(
+                i, wid, off, anc, canWait, fixed, notReady, force, size, covers
+            ):
+                result = None
+                activeList[i] = wid.active
             else:
-                # If force then all widgets get rendered
-                img, updated = wid.render(force=force, *args, **kwargs)
-
-            if updated:
+                # Widgets that have reached their wait state hold their
+                # current image until every widget of the same wait type is
+                # ready.  Widgets with an update period hold their image
+                # until it has elapsed.
+                if self._holding(
+                    wid, canWait, notReady, force
+                ) or not self._due(wid, force):
+                    result = (wid.image, False)
+                else:
+                    result = wid.render(force=force, *args, **kwargs)
+
+            # Only display active widgets that can be seen
+            visible = False
+            if result is not None:
+                img, updated = result
+                activeList[i] = active = wid.active
+                placed = self._geometry[i]
+                pos, rect = (
+                    self._placeAt(i, size, img.size, off, anc)
+                    if active
+                    else (None, None)
+                )
+                if rect is not None and not self._covered(rect, covers):
+                    visible = True
+                    translucent = img.mode in _TRANSLUCENTMODES
+                    opaque = (
+                        not translucent if wid._opaque is None else wid._opaque
+                    )
+                    if opaque:
+                        covers.append(rect)
+                    mask = img if translucent and not opaque else None
+                    results.append((img, pos, mask))
+                    if updated:
+                        changed = True
+
+                        # Widgets that stay in place and report the areas
+                        # they redrew over the image this canvas last showed
+                        # only damage those areas of the canvas
+                        wDamage = wid._damage
+                        if (
+                            damage is None
+                            or wDamage is None
+                            or wDamage[0] is not shownList[i]
+                            or placed is None
+                            or placed[1] != img.size
+                            or placed[2][0] != pos
+                        ):
+                            damage = None
+                        else:
+                            x, y = pos
+                            damage += [
+                                (l + x, t + y, r + x, b + y)
+                                for l, t, r, b in wDamage[1]
+                            ]
+                    elif img is not shownList[i]:
+                        damage = None
+                    shownList[i] = img
+
+            if not visible:
+                shownList[i] = None
+            if visible != visibleList[i]:
                 changed = True
+                damage = None
+                visibleList[i] = visible
 
-            # Only display active widgets
-            if wid.active:
-                if not self._activeList[i]:
-                    changed = True
-                    self._activeList[i] = True
-                results.append((img, off, anc))
-            else:
-                if self._activeList[i]:
-                    changed = True
-                    self._activeList[i] = False
-
-        return (results, changed)
+        results.reverse()
+        return (results, changed, damage)
 
     def _render(self, force=False, newData=None, *args, **kwargs):
-        results, changed = self._renderWidgets(force, *args, **kwargs)
+        results, changed, damage = self._renderWidgets(force, *args, **kwargs)
+
+        # Redraw just the damaged areas when they are a small part of the
+        # canvas
+        if changed and not newData and damage is not None:
+            w, h = self.image.size
+            area = sum((r - l) * (b - t) for l, t, r, b in damage)
+            if area * 2 < w * h:
+                self._recomposite(results, damage)
+                return (self.image, changed)
 
         # If any have changed, render a fresh canvas
         if changed or newData:
             self._newWidget = False
-            self.clear()
-            for img, off, just in results:
-                self._place(wImage=img, offset=off, just=just)
+            self._composite(results)
 
         return (self.image, changed)
 
+    def _composite(self, results):
+        """
+        Draw the canvas from the images of the visible widgets.
+
+        Paste positions and masks were resolved by _renderWidgets (see
+        `_placeAt`) so the images are pasted directly rather than through
+        `widget._place`.
+
+        :param results: The image, position and mask of each visible widget
+            from bottom to top
+        :type results: list
+        """
+        self.clear()
+        paste = self._ownImage().paste
+        for img, pos, mask in results:
+            paste(img, pos, mask)
+
+    def _recomposite(self, results, damage):
+        """
+        Redraw areas of the canvas from the images of the visible widgets.
+
+        :param results: The image, position and mask of each visible widget
+            from bottom to top
+        :type results: list
+        :param damage: The (left, top, right, bottom) areas to redraw
+        :type damage: list
+        """
+        # Stored frames are never modified so the areas are drawn on a copy
+        image = self.image.copy()
+        w, h = image.size
+        clipped = []
+        for left, top, right, bottom in damage:
+            left, top = max(left, 0), max(top, 0)
+            right, bottom = min(right, w), min(bottom, h)
+            if left >= right or top >= bottom:
+                continue
+            clipped.append((left, top, right, bottom))
+            image.paste(
+                Image.new(
+                    image.mode, (right - left, bottom - top), self._background
+                ),
+                (left, top),
+            )
+            for img, (x, y), mask in results:
+                l, t = max(left, x), max(top, y)
+                r = min(right, x + img.size[0])
+                b = min(bottom, y + img.size[1])
+                if l < r and t < b:
+                    box = (l - x, t - y, r - x, b - y)
+                    part = img.crop(box)
+                    image.paste(
+                        part,
+                        (l, t),
+                        None
+                        if mask is None
+                        else part if mask is img else mask.crop(box),
+                    )
+        self._damage = (self.image, clipped)
+        self.image = image
+
 
 class stack(canvas):
     """
@@ -209,6 +658,10 @@ class stack(canvas):
     :param **kwargs: Additional keyword arguments to pass to parent `widget`
     """
 
+    RENDERSTATE = ["_cached_size"]
+
+    __slots__ = ("_orientation", "_gap", "_cached_size", "_widgets")
+
     def __init__(self, orientation="horizontal", gap=0, *args, **kwargs):
 
         super().__init__(*args, **kwargs)
@@ -241,6 +694,15 @@ class stack(canvas):
             self._cached_size = None  # Invalidate size cache
             self._render(force=True)
 
+    def _children(self):
+        return [w for w, g in self._widgets]
+
+    def _scheduledChildren(self):
+        return self._children()
+
+    def _skip(self, ticks):
+        widget._skip(self, ticks)
+
     def _computeSize(self):
         # Only recompute if widgets have changed or cache is None
         if self._cached_size is not None and not self._newWidget:
@@ -313,6 +775,8 @@ class index(canvas):
     :param **kwargs: Additional keyword arguments to pass to parent `widget`
     """
 
+    __slots__ = ("_value", "_max", "_widgets")
+
     def __init__(self, value=0, *args, **kwargs):
 
         super().__init__(*args, **kwargs)
@@ -342,6 +806,19 @@ class index(canvas):
         self._reprVal = f'{len(self._widgets) or "no"} widgets'
         self.render(force=True)
 
+    def _children(self):
+        return list(self._widgets)
+
+    def _scheduledChildren(self):
+        # Only the selected widget is rendered
+        try:
+            return [self._widgets[self._value]]
+        except (IndexError, TypeError):
+            return []
+
+    def _skip(self, ticks):
+        widget._skip(self, ticks)
+
     def _calculateSize(self):
         if self._size is None:
             x, y = 0, 0
@@ -388,6 +865,10 @@ class sequence(canvas):  # noqa: D101
     # noqa: DAR101
     """
 
+    RENDERSTATE = ["_currentCanvas"]
+
+    __slots__ = ("_canvases", "_defaultCanvas", "_currentCanvas")
+
     def __init__(
         self,
         defaultCanvas=None,
@@ -430,6 +911,27 @@ class sequence(canvas):  # noqa: D101
         self._currentCanvas = 0
         self.render(force=True)
 
+    def _children(self):
+        return list(self._canvases)
+
+    def _nextChange(self, rate):
+        # An inactive canvas causes the next render to look for another one
+        if (
+            self._currentCanvas is not None
+            and not self._canvases[self._currentCanvas]._currentActiveState
+        ):
+            return 1
+        return super()._nextChange(rate)
+
+    def _scheduledChildren(self):
+        # Only the current canvas is rendered
+        if self._currentCanvas is None:
+            return [self._defaultCanvas]
+        return [self._canvases[self._currentCanvas]]
+
+    def _skip(self, ticks):
+        widget._skip(self, ticks)
+
     def _computeSize(self):
         mx, my = self._size or (0, 0)
         if len(self._canvases) == 0:
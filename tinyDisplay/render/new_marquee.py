@@ -50,9 +50,40 @@ class new_marquee(widget):
     """
 
     NOTDYNAMIC = ["widget", "resetOnChange", "program", "shared_events", "shared_sync_events"]
+    RENDERSTATE = ["_curPos", "_lastPos"]
     # Class variable to track if timelines have been resolved during initialization
     _timelines_initialized = False
 
+    __slots__ = (
+        "ast",
+        "errors",
+        "_widget",
+        "_program",
+        "_resetOnChange",
+        "_variables",
+        "_moveWhen",
+        "_position_reset_mode",
+        "_shared_events",
+        "_shared_sync_events",
+        "_executor",
+        "_timeline",
+        "_last_tick",
+        "_curPos",
+        "_lastPos",
+        "_pauses",
+        "_pauseEnds",
+        "_widget_content_hash",
+        "_last_widget_size",
+        "_need_recompute",
+        "_widget_id",
+        "_timeline_resolved",
+        "_aWI",
+        "_gap_size",
+        "_scroll_canvas",
+        "_scroll_dimensions",
+        "_widget_dimensions",
+    )
+
     def __init__(
         self,
         widget=None,
@@ -622,6 +653,57 @@ class new_marquee(widget):
             
         return (self.image, moved)
 
+    def _children(self):
+        """Return the widget being animated."""
+        return [self._widget]
+
+    def _nextTick(self, tick):
+        # The tick that follows tick during a render (mirrors _update_tick)
+        if not self._moveWhen:
+            return tick
+        timeline = self._timeline
+        if tick < len(timeline) and getattr(timeline[tick], "terminal", False):
+            return tick
+        return (tick + 1) % len(timeline)
+
+    def _nextChange(self, rate):
+        ticks = super()._nextChange(rate)
+        if ticks == 1:
+            return 1
+
+        # Timelines that are waiting for events from other marquees or are
+        # about to be recomputed can change at any time
+        if (
+            not self._timeline
+            or self._need_recompute
+            or not self._timeline_resolved
+            or self._widget_id not in timeline_manager.resolved
+            or self._executor.context.waiting_for_events
+        ):
+            return 1
+
+        # Follow the timeline to the next render that moves the widget
+        terminal = self._find_terminal_index()
+        tick = self._tick
+        n = len(self._timeline)
+        limit = n if ticks is None else min(n, ticks - 1)
+        for r in range(1, limit + 1):
+            nextTick = self._nextTick(tick)
+            if nextTick == tick:
+                # The widget has stopped moving
+                return ticks
+            tick = nextTick
+            atTerminal = terminal is not None and tick >= terminal
+            pos = self._timeline[terminal if atTerminal else tick % n]
+            if pos != self._lastPos:
+                return r
+        return ticks
+
+    def _skip(self, ticks):
+        super()._skip(ticks)
+        for _ in range(ticks):
+            self._tick = self._nextTick(self._tick)
+
     def _find_terminal_index(self):
         """Find the index of the terminal position in the timeline, if any."""
         if not self._timeline:
@@ -1557,8 +1639,9 @@ class new_marquee(widget):
         # Create the image with the determined size
         self._logger.debug(f"Creating image with size {self._size}")
         self.image = Image.new(self._mode, self._size, self._background)
-        
-        return self.image 
+        self._resized()
+
+        return self.image
 
     def _withinDisplayArea(self, pos, container_size):
         """Check if the given position is at least partially within the display area."""
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Render independent widget trees in separate processes.
+
+A `renderPool` runs a set of worker processes.  Each subtree added to the
+pool is built and rendered inside one of the workers and is represented in
+the parent's widget tree by a `remote` widget.  Rendered pixels are returned
+through shared memory instead of being pickled.
+
+.. versionadded:: 0.1.4
+"""
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+from PIL import Image
+
+from tinyDisplay.render.widget import widget
+from tinyDisplay.utility import dataset as Dataset
+
+
+def _writeImage(img, shm):
+    # Copy img into shared memory, allocating a larger block when needed
+    data = img.tobytes()
+    if shm is None or shm.size < len(data):
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[: len(data)] = data
+    return shm, len(data)
+
+
+def _worker(conn, data):
+    # Main loop for a renderPool worker process
+    ds = Dataset(data)
+    subtrees = {}
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            cmd, updates, arg = msg
+            for dbName, db in updates.items():
+                ds.update(dbName, db)
+
+            if cmd == "add":
+                key, factory = arg
+                subtrees[key] = [factory(ds), None, 0]
+                keys, kwargs = [key], {}
+            else:
+                keys, kwargs = list(subtrees), arg
+
+            results = {}
+            for key in keys:
+                entry = subtrees[key]
+                wid = entry[0]
+                img, changed = wid.render(**kwargs)
+                if changed or cmd == "add":
+                    entry[1], entry[2] = _writeImage(img, entry[1])
+                results[key] = (
+                    changed or cmd == "add",
+                    img.mode,
+                    img.size,
+                    entry[1].name,
+                    entry[2],
+                    wid.active,
+                )
+            conn.send(results)
+    finally:
+        for wid, shm, n in subtrees.values():
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        conn.close()
+
+
+class _process:
+    """Parent side of a renderPool worker process."""
+
+    def __init__(self, context, data):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker, args=(child, data), daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.remotes = {}
+        self.pending = False
+        self.sent = {}
+
+        # Number of render requests sent.  Each remote records the frame it
+        # last returned so that a frame rendered for one of the process's
+        # remotes is used by the others rather than rendered again.
+        self.frame = 0
+
+    def request(self, cmd, updates, arg):
+        self.conn.send((cmd, updates, arg))
+        self.pending = True
+        if cmd == "render":
+            self.frame += 1
+
+    def receive(self):
+        results = self.conn.recv()
+        self.pending = False
+        for key, result in results.items():
+            self.remotes[key]._update(*result)
+
+    def close(self):
+        try:
+            if self.pending:
+                self.receive()
+            self.conn.send(None)
+        except (BrokenPipeError, EOFError, OSError):
+            pass
+        self.process.join()
+        self.conn.close()
+
+
+class remote(widget):
+    """
+    Stand-in for a widget tree that is rendered by a `renderPool`.
+
+    remote widgets are created by `renderPool.subtree` and can be placed
+    within any collection like any other widget.  When rendered they return
+    the most recent image produced by their worker process.
+
+    :param *args: Additional arguments to pass to parent `widget`
+    :param **kwargs: Additional keyword arguments to pass to parent `widget`
+    """
+
+    __slots__ = (
+        "_pool",
+        "_process",
+        "_key",
+        "_shm",
+        "_remoteActive",
+        "_imageChanged",
+        "_frame",
+    )
+
+    def __init__(self, *args, **kwargs):
+        self._pool = None
+        self._process = None
+        self._key = None
+        self._shm = None
+        self._remoteActive = True
+        self._imageChanged = False
+        self._frame = 0
+        super().__init__(*args, **kwargs)
+
+    @property
+    def active(self):
+        """
+        Return the active state reported by the remote widget tree.
+
+        :returns: True when the remote widget is active
+        :rtype: bool
+        """
+        return self._remoteActive
+
+    def _update(self, changed, mode, size, shmName, nbytes, active):
+        # Apply a result received from the worker process
+        if self._shm is None or self._shm.name != shmName:
+            if self._shm is not None:
+                self._shm.close()
+            self._shm = shared_memory.SharedMemory(name=shmName)
+        if changed:
+            with self._shm.buf[:nbytes] as buf:
+                self.image = Image.frombytes(mode, size, buf)
+            self._imageChanged = True
+        self._remoteActive = active
+
+    def _nextChange(self, rate):
+        # The subtree's state is held by the worker process
+        return 1
+
+    def _close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def _render(self, force=False, tick=None, move=True, newData=False):
+        proc = self._process
+        if proc is not None:
+            if not proc.pending and self._frame == proc.frame:
+                # Rendered outside of renderPool.render so request it now
+                proc.request(
+                    "render",
+                    self._pool._updates(proc),
+                    {"force": force, "tick": tick, "move": move},
+                )
+            if proc.pending:
+                proc.receive()
+            self._frame = proc.frame
+
+        changed = self._imageChanged or force
+        self._imageChanged = False
+        return (self.image, changed)
+
+
+class renderPool:
+    """
+    Render independent widget trees in a pool of worker processes.
+
+    Each subtree is built by calling a factory within a worker process.  The
+    factory receives the worker's copy of the dataset and must return the
+    widget to render.  Each frame, databases that have been updated in the
+    parent's dataset are sent to the workers, every worker renders its
+    subtrees in parallel and the results are returned through shared memory
+    to the `remote` widgets that represent them.
+
+    :param dataset: The dataset shared by the parent widget tree
+    :type dataset: `tinyDisplay.utility.dataset`
+    :param processes: The number of worker processes (default is the number of CPUs)
+    :type processes: int
+    :param context: The multiprocessing start method (e.g. 'fork' or 'spawn')
+    :type context: str
+
+    Example::
+        pool = renderPool(dataset=ds, processes=4)
+        page = canvas(size=(256, 64), dataset=ds)
+        page.append(pool.subtree(makeAlbumArt), placement=(0, 0))
+        page.append(pool.subtree(makeLyrics), placement=(64, 0))
+        img, changed = pool.render(page)
+        pool.close()
+
+    ..note:
+        Factories are sent to the worker processes so they must be picklable
+        (e.g. module level functions or functools.partial objects).  A
+        subtree only has access to the data within the dataset.  Rendering
+        a `remote` widget any other way than `render` renders its subtree
+        synchronously.
+    """
+
+    def __init__(self, dataset=None, processes=None, context=None):
+        self._dataset = (
+            dataset if isinstance(dataset, Dataset) else Dataset(dataset)
+        )
+        self._context = multiprocessing.get_context(context)
+        processes = processes or multiprocessing.cpu_count()
+
+        # Share one resource tracker with the workers so that shared memory
+        # released by a worker is not reported as leaked by the parent
+        resource_tracker.ensure_running()
+        self._processes = [
+            _process(self._context, self._data())
+            for _ in range(max(1, processes))
+        ]
+        self._count = 0
+
+    def _data(self):
+        return {k: self._dataset[k] for k in self._dataset.keys()}
+
+    def _updates(self, proc):
+        # Return the databases that have changed since they were sent to proc
+        updates = {}
+        for k in self._dataset.keys():
+            db = self._dataset[k]
+            if proc.sent.get(k) is not db:
+                updates[k] = db
+                proc.sent[k] = db
+        return updates
+
+    def subtree(self, factory, name=None):
+        """
+        Add a widget tree to be rendered by the pool.
+
+        :param factory: Callable that accepts a dataset and returns a widget
+        :type factory: callable
+        :param name: The name for the returned `remote` widget
+        :type name: str
+        :returns: The widget that represents the subtree
+        :rtype: `tinyDisplay.render.parallel.remote`
+        """
+        proc = self._processes[self._count % len(self._processes)]
+        key = self._count
+        self._count += 1
+
+        r = remote(name=name, dataset=self._dataset)
+        r._pool, r._process, r._key = self, proc, key
+        proc.remotes[key] = r
+
+        if proc.pending:
+            proc.receive()
+        proc.request("add", self._updates(proc), (key, factory))
+        proc.receive()
+        r._frame = proc.frame
+        return r
+
+    def render(
+        self, wid, force=False, tick=None, move=True, reset=False, newData=False
+    ):
+        """
+        Render a widget tree that contains remote widgets.
+
+        All of the pool's workers begin rendering before `wid` is rendered so
+        that the subtrees render in parallel with each other and with the
+        parent.
+
+        :param wid: The widget to render
+        :type wid: `tinyDisplay.render.widget.widget`
+        :returns: The result of `wid.render`
+        :rtype: (PIL.Image, bool)
+        """
+        for proc in self._processes:
+            if not proc.remotes:
+                continue
+            if proc.pending:
+                proc.receive()
+            proc.request(
+                "render",
+                self._updates(proc),
+                {"force": force or reset, "tick": tick, "move": move},
+            )
+        return wid.render(
+            force=force, tick=tick, move=move, reset=reset, newData=newData
+        )
+
+    def close(self):
+        """Shut down the worker processes."""
+        for proc in self._processes:
+            for r in proc.remotes.values():
+                r._close()
+                r._process = None
+            proc.close()
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -13,9 +13,13 @@ import os
 import pathlib
 import queue
 import threading
+import warnings
+from bisect import bisect_right
 from collections import deque
 from inspect import currentframe, getargvalues, getfullargspec, isclass
-from time import monotonic
+from math import ceil
+from time import monotonic, time
+from weakref import WeakKeyDictionary, finalize
 from urllib.request import urlopen
 import textwrap
 
@@ -23,20 +27,216 @@ from PIL import Image, ImageChops, ImageColor, ImageDraw, ImageFont
 
 from tinyDisplay import globalVars
 from tinyDisplay.exceptions import DataError, RenderError
-from tinyDisplay.font import bmImageFont
+from tinyDisplay.font import bmImageFont, fonts
 from tinyDisplay.render import widget as Widgets
 from tinyDisplay.utility import (
     dataset as Dataset,
     evaluator,
     getArgDecendents,
     getNotDynamicDecendents,
+    getRenderStateDecendents,
     image2Text,
+    lruCache,
     okPath,
 )
 
 
 # from IPython.core.debugger import set_trace
 
+# Widget attributes that hold colors.  Colors supplied as lists (e.g. from
+# a page file or an evaluated expression) are converted to tuples for PIL.
+_COLORATTRS = ("_background", "_foreground", "_fill", "_outline")
+
+# Cache of the RENDERSTATE attributes for each widget class
+_renderStateAttrs = {}
+
+def _earliest(ticks, other):
+    # The earlier of two nextChange results (None means never)
+    if ticks is None or (other is not None and other < ticks):
+        return other
+    return ticks
+
+
+def _parseUpdatePeriod(value):
+    # Convert an updateEvery value into (ticks, seconds).  Numbers are ticks
+    # and strings ending in 's' are seconds (e.g. '0.5s').
+    if value is None:
+        return (None, None)
+    try:
+        if type(value) is str and value.strip().lower().endswith("s"):
+            seconds = float(value.strip()[:-1])
+            if seconds > 0:
+                return (None, seconds)
+        else:
+            ticks = int(value)
+            if ticks > 0 and ticks == float(value):
+                return (ticks, None)
+    except ValueError:
+        pass
+    raise ValueError(
+        f"updateEvery must be a positive number of ticks or seconds "
+        f"(e.g. '1s'), not {value!r}"
+    )
+
+
+# Per-thread stack of accumulated child render time.  Each active render
+# pushes an entry so that a widget's exclusive time can be separated from
+# the time spent rendering the widgets it contains.
+_renderState = threading.local()
+
+
+def _childTimes():
+    try:
+        return _renderState.childTimes
+    except AttributeError:
+        _renderState.childTimes = []
+        return _renderState.childTimes
+
+
+class renderStats:
+    """
+    Render timing statistics for a single widget.
+
+    :ivar calls: Number of times the widget has been rendered
+    :ivar changed: Number of renders that produced a changed image
+    :ivar inclusive: Total time (seconds) spent rendering including children
+    :ivar exclusive: Total time (seconds) spent rendering excluding children
+    :ivar max: Longest single render (seconds, inclusive)
+    :ivar last: Duration of the most recent render (seconds, inclusive)
+    :ivar slow: Number of renders that exceeded the widget's slow render limit
+    """
+
+    __slots__ = (
+        "calls",
+        "changed",
+        "inclusive",
+        "exclusive",
+        "max",
+        "last",
+        "slow",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all accumulated statistics."""
+        self.calls = 0
+        self.changed = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.slow = 0
+
+    def asDict(self):
+        """
+        Return statistics as a dictionary.
+
+        :returns: The accumulated statistics including averages and the
+            ratio of renders that changed the widget's image
+        :rtype: dict
+        """
+        calls = self.calls
+        return {
+            "calls": calls,
+            "changed": self.changed,
+            "changedRatio": self.changed / calls if calls else 0,
+            "inclusive": self.inclusive,
+            "exclusive": self.exclusive,
+            "average": self.inclusive / calls if calls else 0,
+            "max": self.max,
+            "last": self.last,
+            "slow": self.slow,
+        }
+
+
+class frameBuffer:
+    """
+    Ring buffer of rendered frames.
+
+    Frames are stored by reference rather than copied.  Consecutive renders
+    that return the same unchanged image are collapsed into a single run of
+    (frame, changed, count) so an idle widget costs one entry regardless of
+    how many times it is rendered.
+
+    Iterating the buffer (or using len) behaves like a deque of
+    (image, changed) tuples with one entry per render.
+
+    :param maxlen: The number of renders to retain
+    :type maxlen: int
+
+    ..note:
+        Widgets replace their image whenever it changes so a stored frame
+        is never modified by later renders.  The one place a widget writes
+        into its existing image (`widget._place`) checks `holds` and copies
+        the image before writing to it (copy-on-write).
+    """
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._runs = deque()
+        self._len = 0
+
+    def append(self, entry):
+        """
+        Add a rendered frame to the buffer.
+
+        :param entry: The rendered image and whether it changed
+        :type entry: (`PIL.Image`, bool)
+        """
+        img, changed = entry
+        runs = self._runs
+        if runs and not changed and runs[-1][0] is img:
+            runs[-1][2] += 1
+        else:
+            runs.append([img, changed, 1])
+        self._len += 1
+
+        if self._len > self.maxlen:
+            first = runs[0]
+            if first[2] > 1:
+                # Only the first render of a run can be a changed one
+                first[2] -= 1
+                first[1] = False
+            else:
+                runs.popleft()
+            self._len -= 1
+
+    def holds(self, img):
+        """
+        Return whether img is the most recently stored frame.
+
+        :param img: The image to test
+        :type img: `PIL.Image`
+        :returns: True if the image is referenced by the buffer
+        :rtype: bool
+        """
+        return bool(self._runs) and self._runs[-1][0] is img
+
+    def clear(self):
+        """Remove all frames from the buffer."""
+        self._runs.clear()
+        self._len = 0
+
+    def runs(self):
+        """
+        Return the run-length encoded contents of the buffer.
+
+        :returns: A list of (image, changed, count) tuples
+        :rtype: list
+        """
+        return [tuple(r) for r in self._runs]
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for img, changed, count in list(self._runs):
+            yield (img, changed)
+            for _ in range(count - 1):
+                yield (img, False)
+
 
 class widget(metaclass=abc.ABCMeta):
     """
@@ -70,6 +270,22 @@ class widget(metaclass=abc.ABCMeta):
     :type time: str
     :param bufferSize: Number of past rendered images to store (for testing)
     :type bufferSize: int
+    :param updateEvery: How often the widget is rendered when it is placed on
+        a canvas.  Either a number of the canvas's ticks (e.g. 30) or a number
+        of seconds given as a string ending in 's' (e.g. '1s').  Between
+        updates the canvas reuses the widget's last image.  By default the
+        widget renders on every tick of its canvas.
+    :type updateEvery: int or str
+    :param opaque: Whether the widget's image hides everything beneath it
+        when it is placed on a canvas.  Opaque widgets are pasted without
+        transparency and the canvas does not render widgets that they
+        completely cover.  By default images in modes 'RGBA', 'LA' and 'L'
+        (which is pasted as its own mask) are translucent and all others
+        (e.g. '1' and 'RGB') are opaque.
+    :type opaque: bool
+    :param frozen: Render the widget once and then reuse its image until it
+        is thawed or invalidated (see `freeze`)
+    :type frozen: bool
     
     .. note::
        When bufferSize > 1, a ring buffer is created to store the last N render results.
@@ -77,9 +293,81 @@ class widget(metaclass=abc.ABCMeta):
        - image: The PIL Image that was rendered
        - changed: Boolean flag indicating if the image changed during that render
        This allows tracking not only the images but also when they changed or stayed the same.
+       Images are stored by reference and consecutive unchanged renders share
+       a single stored frame (see `frameBuffer`).
     """
 
-    NOTDYNAMIC = ["name", "dataset", "bufferSize"]
+    NOTDYNAMIC = [
+        "name",
+        "dataset",
+        "bufferSize",
+        "updateEvery",
+        "opaque",
+        "frozen",
+    ]
+
+    # Attributes that change from frame to frame as a widget renders.  These
+    # are captured by `saveRenderState` so that rendering can be rewound.
+    RENDERSTATE = [
+        "image",
+        "_tick",
+        "_currentDuration",
+        "_currentMinDuration",
+        "_currentCoolingPeriod",
+        "_currentActiveState",
+        "_overRunning",
+        "_nextUpdate",
+    ]
+
+    # Widgets do not have an instance dictionary.  Each subclass declares
+    # the state it adds, including the attributes set from its arguments.
+    __slots__ = (
+        "name",
+        "just",
+        "image",
+        "_parent",
+        "_reprVal",
+        "_size",
+        "_activeWhen",
+        "_duration",
+        "_minDuration",
+        "_coolingPeriod",
+        "_overRun",
+        "_mode",
+        "_foreground",
+        "_background",
+        "_just",
+        "_trim",
+        "_debug",
+        "_localDB",
+        "_dataset",
+        "_dV",
+        "type",
+        "current",
+        "_bufferSize",
+        "_imageBuffer",
+        "_logger",
+        "_cache",
+        "_tick",
+        "_normalDuration",
+        "_currentDuration",
+        "_currentMinDuration",
+        "_currentCoolingPeriod",
+        "_currentActiveState",
+        "_overRunning",
+        "_slowRender",
+        "_renderTime",
+        "_renderStats",
+        "_evalPlan",
+        "_updateTicks",
+        "_updateSeconds",
+        "_nextUpdate",
+        "_opaque",
+        "_frozen",
+        "_stale",
+        "_damage",
+        "__weakref__",
+    )
 
     def __init__(
         self,
@@ -97,10 +385,14 @@ class widget(metaclass=abc.ABCMeta):
         just="lt",
         trim=None,
         bufferSize=1,
+        updateEvery=None,
+        opaque=None,
+        frozen=False,
         **kwargs,
     ):
 
         self._debug = globalVars.__DEBUG__
+        self._evalPlan = None
         self._localDB = {"__self__": {}, "__parent__": {}}
         self._dataset = (
             dataset if isinstance(dataset, Dataset) else Dataset(dataset)
@@ -113,11 +405,15 @@ class widget(metaclass=abc.ABCMeta):
         self.just = just.lower()
         self.type = self.__class__.__name__
         self.current = None
+        self.image = None
+        self._parent = None
         self._reprVal = None
         
         # Initialize the ring buffer for storing past rendered images
         self._bufferSize = max(1, bufferSize)
-        self._imageBuffer = deque(maxlen=self._bufferSize) if self._bufferSize > 1 else None
+        self._imageBuffer = (
+            frameBuffer(self._bufferSize) if self._bufferSize > 1 else None
+        )
 
         # Initialize logging system
         self._logger = logging.getLogger("tinyDisplay")
@@ -136,8 +432,20 @@ class widget(metaclass=abc.ABCMeta):
         self._currentActiveState = False
         self._overRunning = False
 
+        # Update period (see canvas._due)
+        self._updateTicks, self._updateSeconds = _parseUpdatePeriod(
+            updateEvery
+        )
+        self._nextUpdate = None
+        self._opaque = opaque
+        self._frozen = frozen
+        self._stale = False
+        self._damage = None
+
         # Perf problem alerting
         self._slowRender = 0.1
+        self._renderTime = None
+        self._renderStats = renderStats()
 
         assert mode in (
             "1",
@@ -226,6 +534,7 @@ class widget(metaclass=abc.ABCMeta):
             validator=validator,
             dynamic=dynamic,
         )
+        self._evalPlan = None
         setattr(self, name, default)
 
     def _eval(self, name):
@@ -249,10 +558,9 @@ class widget(metaclass=abc.ABCMeta):
             value = statement.eval()
             
             # Direct attribute access is faster than property access
-            if hasattr(statement, "_changed") and statement._changed:
-                # Using __dict__ directly avoids the overhead of setattr
-                self.__dict__[name] = value
-                
+            if statement._changed:
+                self._setEvaluated(name, value)
+
             return value
         except KeyError as ex:
             # It's a KeyError from the perspective of the evaluator but from the
@@ -268,18 +576,16 @@ class widget(metaclass=abc.ABCMeta):
         :raises: `tinyDisplay.exceptions.EvaluationError`
         :raises: `tinyDisplay.exceptions.ValidationError`
         """
+        plan = self._evalPlan
+        if plan is None:
+            plan = self._buildEvalPlan()
+
         changed = False
-        # Use direct dictionary access for better performance
-        dv_dict = self._dV._statements
-        
-        # Iterate directly over dictionary for better performance
-        for name, statement in dv_dict.items():
+        for name, statement in plan:
             try:
                 value = statement.eval()
-                # Direct attribute access is faster than property access
-                if hasattr(statement, "_changed") and statement._changed:
-                    # Use direct dictionary access to set attribute
-                    self.__dict__[name] = value
+                if statement._changed:
+                    self._setEvaluated(name, value)
                     changed = True
             except KeyError:
                 continue
@@ -287,63 +593,119 @@ class widget(metaclass=abc.ABCMeta):
                 # Log errors but continue processing other values
                 self._logger.debug(f"Error evaluating {name}: {ex}")
                 continue
-                
+
         return changed
 
-    def _fixColors(self):
-        # Create a set of color attributes for faster lookup
-        color_attrs = {"_background", "_foreground", "_fill", "_outline"}
+    def _buildEvalPlan(self):
+        """
+        Determine which dynamicValues need to be evaluated during render.
 
-        # Only process attributes that exist
-        for attr in color_attrs & set(dir(self)):
-            value = getattr(self, attr)
+        Static values never change once they have been evaluated so they are
+        left out of the plan.  The plan is only retained once every static
+        value has been evaluated and is discarded whenever a new value is
+        compiled.
+
+        :returns: (name, dynamicValue) pairs in evaluation order
+        :rtype: list
+        """
+        plan = []
+        final = True
+        for name, statement in self._dV._statements.items():
+            if statement.static:
+                if hasattr(statement, "prevValue"):
+                    continue
+                final = False
+            plan.append((name, statement))
+        if final:
+            self._evalPlan = plan
+        return plan
+
+    def _setEvaluated(self, name, value):
+        """
+        Store a newly changed dynamicValue result on the widget.
+
+        Color values are normalized and the local database is refreshed
+        when the widget's size changes so that neither has to be recomputed
+        on every render.
+        """
+        if name in _COLORATTRS and isinstance(value, list):
+            value = tuple(value)
+        setattr(self, name, value)
+        if name == "_size":
+            self._computeLocalDB()
+
+    def _fixColors(self):
+        # Normalize any color attributes that were assigned directly
+        for attr in _COLORATTRS:
+            value = getattr(self, attr, None)
             if isinstance(value, list):
                 setattr(self, attr, tuple(value))
 
     def __getattr__(self, name):
         """
-        Handle attribute access for widget objects.
-        Delegates to the underlying image object for image-specific attributes.
+        Handle access to attributes that have not been set.
+
+        Public attributes of the widget's image can still be reached from
+        the widget but doing so is deprecated.  Use the size, width and
+        height properties or the widget's `image` instead.
 
         :param name: The name of the attribute to get
         :type name: str
-        :returns: The value of the attribute
+        :returns: The attribute of the widget's image
         :raises: AttributeError
         """
-        # First check if we're looking for image-related attributes
-        if name == "image" or name == "_image_attrs":
-            raise AttributeError(
-                f"{self.__class__.__name__} object {self.name} has no attribute {name}"
+        try:
+            img = object.__getattribute__(self, "image")
+        except AttributeError:
+            img = None
+        if img is not None and not name.startswith("_") and hasattr(img, name):
+            warnings.warn(
+                f"{name} is an attribute of the widget's image.  Use "
+                f"{self.type}.image.{name} instead",
+                DeprecationWarning,
+                stacklevel=2,
             )
+            return getattr(img, name)
 
-        # Check for direct dictionary access to avoid recursion
-        if name == "_parent" and "_parent" not in self.__dict__:
-            return None
+        raise AttributeError(
+            f"{self.__class__.__name__} object has no attribute {name}"
+        )
 
-        # Only try to access image attributes if we have an image
-        if "image" in self.__dict__:
-            # Initialize image attributes cache if needed
-            if "_image_attrs" not in self.__dict__:
-                # Create a set for faster lookups
-                self.__dict__["_image_attrs"] = set(dir(self.__dict__["image"]))
+    @property
+    def size(self):
+        """
+        Return the size of the widget's current image.
 
-            # Use the cached attribute set for faster lookups
-            if name in self.__dict__["_image_attrs"]:
-                # Direct access to image via __dict__ to avoid recursive __getattr__ calls
-                return getattr(self.__dict__["image"], name)
+        :returns: The size in pixels (x, y)
+        :rtype: (int, int)
+        """
+        return self.image.size
 
-        msg = f"{self.__class__.__name__} object {self.name} has no attribute {name}"
-        if "image" in self.__dict__:
-            msg += f". image is type({type(self.__dict__['image'])})"
-        raise AttributeError(msg)
+    @property
+    def width(self):
+        """
+        Return the width of the widget's current image.
+
+        :returns: The width in pixels
+        :rtype: int
+        """
+        return self.image.size[0]
+
+    @property
+    def height(self):
+        """
+        Return the height of the widget's current image.
+
+        :returns: The height in pixels
+        :rtype: int
+        """
+        return self.image.size[1]
 
     def __repr__(self):
         cw = ""
         n = self.name if self.name else "unnamed"
         v = f"value({self._reprVal}) " if self._reprVal else ""
-        if "size" in dir(self) or (
-            "image" in dir(self) and "size" in dir(self.image)
-        ):
+        if self.image is not None:
             return (
                 f"<{n}.{self.type} {v}size{self.size} {cw}at 0x{id(self):x}>"
             )
@@ -356,29 +718,37 @@ class widget(metaclass=abc.ABCMeta):
         return "image empty"
 
     def _computeLocalDB(self):
-        """Compute the local database for the widget."""
-        wdb = {
-            "name": self.name,
-            "just": self.just,
-        }
+        """
+        Compute the local database for the widget.
 
-        # Use direct dictionary access to avoid recursion
-        if "_size" in self.__dict__:
+        The `__self__` and `__parent__` entries are updated in place.  This
+        is called when the widget is created, when it is placed within a
+        canvas, and when its size or its parent's size changes.
+        """
+        wdb = self._localDB["__self__"]
+        wdb["name"] = self.name
+        wdb["just"] = self.just
+
+        if hasattr(self, "_size"):
             wdb["size"] = self._size
-        elif "image" in self.__dict__ and hasattr(self.image, "size"):
+        elif self.image is not None:
             wdb["size"] = self.image.size
 
-        # Use direct dictionary access to check for parent
-        pdb = {}
-        if "_parent" in self.__dict__ and self._parent is not None:
-            pdb = {
-                "size": self._parent.size,
-                "name": self._parent.name,
-                "just": self._parent.just,
-            }
+        pdb = self._localDB["__parent__"]
+        parent = self._parent
+        if parent is not None:
+            pdb["size"] = parent.size
+            pdb["name"] = parent.name
+            pdb["just"] = parent.just
+        else:
+            pdb.clear()
 
-        self._localDB["__self__"] = wdb
-        self._localDB["__parent__"] = pdb
+    def _resized(self):
+        """Refresh the local databases that depend on this widget's size."""
+        self._computeLocalDB()
+        for child in self._children():
+            if child._parent is self:
+                child._computeLocalDB()
 
     def clear(self, size=(0, 0)):
         """
@@ -397,6 +767,7 @@ class widget(metaclass=abc.ABCMeta):
             the widget was originally created.  If no size was originally
             provided, clear will produce a blank image that has size (0, 0).
         """
+        old = self.image
         self.image = None
         size = (
             self._size
@@ -407,6 +778,13 @@ class widget(metaclass=abc.ABCMeta):
         if self.image is None:
             raise RuntimeError(f"Clear resulted in `None` for {self.name}")
 
+        # Widgets are cleared during __init__ before their local DB exists
+        if old is not None and (
+            old.size != size
+            or self._localDB["__self__"].get("size") != self._size
+        ):
+            self._resized()
+
     @property
     def active(self):
         """
@@ -552,39 +930,84 @@ class widget(metaclass=abc.ABCMeta):
                 "vertical": (bbox[0], 0, bbox[2], size[1]),
             }.get(region, (bbox[0], bbox[1], bbox[2], bbox[3]))
             self.image = self.image.crop(cropd)
+            if self.image.size != size:
+                self._resized()
         return self.image
 
-    def _place(self, wImage=None, offset=(0, 0), just="lt"):
-        just = just or "lt"
-        offset = offset or (0, 0)
+    @staticmethod
+    def _position(size, wSize, offset, just):
+        """
+        Compute where an image is pasted on an image of a given size.
+
+        :param size: The size of the image being pasted onto
+        :type size: (int, int)
+        :param wSize: The size of the image being pasted
+        :type wSize: (int, int)
+        :param offset: The offset to add to the justified position
+        :type offset: (int, int)
+        :param just: The justification to use (see `widget`)
+        :type just: str
+        :returns: The position of the upper left corner of the pasted image
+        :rtype: (int, int)
+        """
+        mh = round((size[0] - wSize[0]) / 2)
+        r = size[0] - wSize[0]
+
+        mv = round((size[1] - wSize[1]) / 2)
+        b = size[1] - wSize[1]
+
+        a = (
+            0
+            if just[0] == "l"
+            else mh if just[0] == "m" else r if just[0] == "r" else 0
+        )
+        b = (
+            0
+            if just[1] == "t"
+            else mv if just[1] == "m" else b if just[1] == "b" else 0
+        )
+
+        return (offset[0] + a, offset[1] + b)
+
+    @staticmethod
+    def _checkJust(just):
         assert (
             just[0] in "lmr" and just[1] in "tmb"
         ), f"Requested justification \"{just}\" is invalid.  Valid values are left top ('lt'), left middle ('lm'), left bottom ('lb'), middle top ('mt'), middle middle ('mm'), middle bottom ('mb'), right top ('rt'), right middle ('rm'), and right bottom ('rb')"
 
+    def _ownImage(self):
+        """
+        Return the widget's image, ready to be drawn on.
+
+        Images held by the frame buffer are never modified so the image is
+        copied first if it is one of them.
+
+        :rtype: `PIL.Image.Image`
+        """
+        if self._imageBuffer is not None and self._imageBuffer.holds(
+            self.image
+        ):
+            self.image = self.image.copy()
+        return self.image
+
+    def _place(self, wImage=None, offset=(0, 0), just="lt", opaque=False):
+        just = just or "lt"
+        offset = offset or (0, 0)
+        self._checkJust(just)
+
         if self.image is None:
             self._logger.error(f"WIDGET._PLACE 'image' is None in {self.name}")
             raise RuntimeError(f"WIDGET._PLACE 'image' is None in {self.name}")
         # if there is an image to place
         if wImage:
-            mh = round((self.image.size[0] - wImage.size[0]) / 2)
-            r = self.image.size[0] - wImage.size[0]
-
-            mv = round((self.image.size[1] - wImage.size[1]) / 2)
-            b = self.image.size[1] - wImage.size[1]
-
-            a = (
-                0
-                if just[0] == "l"
-                else mh if just[0] == "m" else r if just[0] == "r" else 0
+            self._ownImage()
+            pos = self._position(self.image.size, wImage.size, offset, just)
+            # Opaque images replace everything beneath them
+            mask = (
+                wImage
+                if not opaque and wImage.mode in ["RGBA", "LA", "L"]
+                else None
             )
-            b = (
-                0
-                if just[1] == "t"
-                else mv if just[1] == "m" else b if just[1] == "b" else 0
-            )
-
-            pos = (offset[0] + a, offset[1] + b)
-            mask = wImage if wImage.mode in ["RGBA", "L"] else None
             self.image.paste(wImage, pos, mask=mask)
             return (pos[0], pos[1])
         else:
@@ -620,19 +1043,36 @@ class widget(metaclass=abc.ABCMeta):
         :raises Exception: When any other exception occurs during render (debug
             mode only)
         """
-        self._renderTime = monotonic()
+        # Frozen widgets reuse their image unless forced or invalidated
+        if self._frozen and not (force or reset or self._stale):
+            return (self.image, False)
+        self._stale = False
+
+        start = self._renderTime = monotonic()
+        childTimes = _childTimes()
+        childTimes.append(0.0)
+        img, changed = self.image, False
+        try:
+            img, changed = self._timedRender(force, tick, move, reset, newData)
+        finally:
+            elapsed = monotonic() - start
+            childTime = childTimes.pop()
+            if childTimes:
+                childTimes[-1] += elapsed
+            self._recordRender(elapsed, elapsed - childTime, changed)
+
+        return (img, changed)
+
+    def _timedRender(self, force, tick, move, reset, newData):
         if self.image is None:
             raise RuntimeError(
                 f"Starting Render for {repr(self)}:{self.name}.  Image is None"
             )
-        self._computeLocalDB()
-
         if reset:
             force = True
 
         try:
             nd = self._evalAll()
-            self._fixColors()  # Refix colors if they have changed because of eval
         except DataError as ex:
             if self._debug:
                 raise
@@ -649,17 +1089,18 @@ class widget(metaclass=abc.ABCMeta):
         changed = False
 
         try:
+            self._damage = None
             img, changed = self._render(
                 force=force, tick=tick, move=move, newData=nd or newData
             )
             # If any trim is selected, perform trim if image has changed
             if self._trim is not None and changed:
                 img = self.trim(self._trim)
+                self._damage = None
                 
             # Store the image in the buffer regardless of whether it changed
             if self._imageBuffer is not None:
-                # Store a copy to avoid reference issues
-                self._imageBuffer.append((img.copy(), changed))
+                self._imageBuffer.append((img, changed))
         except Exception as ex:
             if self._debug:
                 raise
@@ -672,6 +1113,319 @@ class widget(metaclass=abc.ABCMeta):
 
         return (img, changed)
 
+    def _recordRender(self, elapsed, exclusive, changed):
+        stats = self._renderStats
+        stats.calls += 1
+        stats.inclusive += elapsed
+        stats.exclusive += exclusive
+        stats.last = elapsed
+        if elapsed > stats.max:
+            stats.max = elapsed
+        if changed:
+            stats.changed += 1
+        if self._slowRender is not None and exclusive > self._slowRender:
+            stats.slow += 1
+            self._logger.warning(
+                f"Slow render for {self.name or 'unnamed'}.{self.type}: "
+                f"{exclusive * 1000:.1f}ms exclusive, "
+                f"{elapsed * 1000:.1f}ms inclusive "
+                f"(limit {self._slowRender * 1000:.1f}ms)"
+            )
+
+    @property
+    def slowRender(self):
+        """
+        Return the slow render limit for the widget.
+
+        Renders whose exclusive time (the time not spent rendering contained
+        widgets) exceeds this limit are counted and logged as warnings.
+
+        :returns: The limit in seconds or None if slow render alerts are disabled
+        :rtype: float
+        """
+        return self._slowRender
+
+    @slowRender.setter
+    def slowRender(self, value):
+        self._slowRender = value
+
+    @property
+    def renderStats(self):
+        """
+        Return render timing statistics for this widget.
+
+        :returns: The statistics accumulated since the widget was created or
+            since `resetRenderStats` was last called
+        :rtype: dict
+        """
+        return self._renderStats.asDict()
+
+    def _children(self):
+        """
+        Return the widgets contained within this widget.
+
+        :returns: The contained widgets
+        :rtype: list
+        """
+        return []
+
+    def freeze(self):
+        """
+        Render the widget and keep its image.
+
+        A frozen widget returns its current image from `render` without
+        evaluating its dynamic values, updating its timers or rendering the
+        widgets it contains.  This removes the per-frame cost of widgets that
+        never change after they are loaded (e.g. labels, borders and splash
+        screens).
+
+        ..note:
+            A frozen widget still renders when it is forced (e.g. when a
+            widget is appended to a frozen canvas) or after `invalidate` is
+            called.  Use `thaw` to return it to normal rendering.
+        """
+        # Render before freezing so the kept image reflects the current data
+        self._frozen = False
+        self.render()
+        self._frozen = True
+
+    def thaw(self):
+        """Return a frozen widget to rendering on every call to `render`."""
+        self._frozen = False
+        self._stale = False
+
+    def invalidate(self):
+        """
+        Render a frozen widget again on its next render.
+
+        The widget stays frozen once it has rendered.  The widgets that
+        contain it are also invalidated so that a change within a frozen
+        canvas reaches the display.
+        """
+        wid = self
+        while wid is not None:
+            wid._stale = True
+            wid = wid._parent
+
+    @property
+    def frozen(self):
+        """
+        Return whether the widget is frozen.
+
+        :returns: True if the widget is frozen (see `freeze`)
+        :rtype: bool
+        """
+        return self._frozen
+
+    @property
+    def damage(self):
+        """
+        Return the parts of the widget's image changed by its last render.
+
+        :returns: The (left, top, right, bottom) rectangles that differ from
+            the image the widget had before the render, or None if any part
+            of the image may have changed
+        :rtype: list
+
+        ..note:
+            Only meaningful when the last render reported a change.  Widgets
+            that do not track the areas they redraw always return None.
+        """
+        return None if self._damage is None else self._damage[1]
+
+    def resetRenderStats(self):
+        """Clear the render statistics for this widget and its children."""
+        self._renderStats.reset()
+        for child in self._children():
+            child.resetRenderStats()
+
+    def saveRenderState(self):
+        """
+        Capture the animation state of this widget and its children.
+
+        The state includes the current image, the activity timers and any
+        attributes listed in the RENDERSTATE of the widget's classes (e.g. a
+        marquee's position).  It can be passed to `restoreRenderState` to
+        return the widget tree to this point.
+
+        :returns: The captured state
+        :rtype: list
+        """
+        state = []
+        self._saveRenderState(state)
+        return state
+
+    def _saveRenderState(self, state):
+        cls = self.__class__
+        attrs = _renderStateAttrs.get(cls)
+        if attrs is None:
+            attrs = _renderStateAttrs[cls] = getRenderStateDecendents(cls)
+        values = []
+        for attr in attrs:
+            value = getattr(self, attr, None)
+            values.append(value[:] if type(value) is list else value)
+        state.append((self, attrs, values))
+        for child in self._children():
+            child._saveRenderState(state)
+
+    @staticmethod
+    def restoreRenderState(state):
+        """
+        Return a widget tree to a previously captured state.
+
+        :param state: A state returned by `saveRenderState`
+        :type state: list
+
+        ..note:
+            Dynamic values are not rewound.  They are re-evaluated against
+            the current dataset during the next render.
+        """
+        for wid, attrs, values in state:
+            for attr, value in zip(attrs, values):
+                setattr(wid, attr, value[:] if type(value) is list else value)
+
+    def nextChange(self, rate=None):
+        """
+        Return how many ticks until the widget's image may next change.
+
+        Each widget reports the earliest render at which its own state (e.g.
+        a marquee's timeline, its activity timers or a dynamic value that
+        reads the clock) may change its image.  The earliest of this and the
+        values reported by the widgets it renders is returned.  Changes
+        caused by dataset updates are not predicted.
+
+        :param rate: The number of ticks per second.  Used to convert dynamic
+            values that read the clock (e.g. time.strftime('%H:%M')) into
+            ticks.  If not provided these values may change every tick.
+        :type rate: float
+        :returns: The number of renders until the first one that may change
+            the image (1 is the next render) or None if the image cannot
+            change until a dataset is updated
+        :rtype: int
+
+        ..note:
+            Dynamic values provided as functions are assumed to depend only
+            on the dataset and the state of the widget.  The result is only
+            valid immediately after a render.
+        """
+        if self._frozen:
+            return 1 if self._stale else None
+        ticks = self._nextChange(rate)
+        if ticks == 1:
+            return 1
+        for child in self._scheduledChildren():
+            ticks = _earliest(ticks, child.nextChange(rate))
+            if ticks == 1:
+                break
+        return ticks
+
+    def _nextChange(self, rate):
+        # The earliest change caused by this widget's own state
+        ticks = None
+        for name, statement in self._evalPlan or self._buildEvalPlan():
+            # A value that just changed can change others during the next
+            # render (e.g. through the local database) so let it settle
+            if getattr(statement, "_changed", True) or statement.clock == 0:
+                return 1
+            if statement.clock == 1:
+                if rate is None:
+                    return 1
+                nextSecond = max(1, ceil((1 - time() % 1) * rate))
+                ticks = _earliest(ticks, nextSecond)
+
+        # Timer boundaries (see _updateTimers and active).  The duration
+        # timer only affects the active state while activeWhen is True.
+        if self._normalDuration is not None and self._activeWhen:
+            ticks = _earliest(ticks, max(1, self._currentDuration))
+        if self._minDuration is not None and self._currentMinDuration > 0:
+            ticks = _earliest(ticks, self._currentMinDuration)
+        if self._coolingPeriod is not None and self._currentCoolingPeriod > 0:
+            ticks = _earliest(ticks, self._currentCoolingPeriod)
+        return ticks
+
+    def _scheduledChildren(self):
+        """
+        Return the contained widgets that render when this widget renders.
+
+        :returns: The widgets
+        :rtype: list
+        """
+        return self._children()
+
+    def skip(self, ticks):
+        """
+        Advance the widget as if it had been rendered `ticks` times.
+
+        Renders that `nextChange` reports cannot change the image can be
+        skipped.  Skipping advances animations and activity timers so that
+        they stay on schedule.
+
+        :param ticks: The number of renders to skip.  It must be less than
+            the value most recently returned by `nextChange`.
+        :type ticks: int
+        """
+        if ticks < 1 or self._frozen:
+            return
+        children = self._scheduledChildren()
+        self._skip(ticks)
+        for child in children:
+            child.skip(ticks)
+
+    def _skip(self, ticks):
+        # Advance this widget's timers (mirrors _updateTimers)
+        if self._normalDuration is not None:
+            # The duration timer restarts each time it expires
+            d = self._currentDuration
+            self._currentDuration = (
+                d - ticks
+                if d >= ticks
+                else self._normalDuration
+                - (ticks - max(d, 0) - 1) % (self._normalDuration + 1)
+            )
+        if self._minDuration is not None:
+            self._currentMinDuration -= ticks
+        if self._coolingPeriod is not None and self._currentCoolingPeriod > 0:
+            self._currentCoolingPeriod = self._coolingPeriod = (
+                self._currentCoolingPeriod - ticks
+            )
+
+    def compileRenderPlan(self):
+        """
+        Prepare the render plans for this widget and its children.
+
+        Each widget keeps a plan of the dynamicValues that must be evaluated
+        when it renders and each canvas keeps a plan of how its widgets are
+        rendered and composited.  Plans are built the first time they are
+        needed and rebuilt after the widget tree changes (e.g. `append`).
+        Calling this once a page has been assembled moves that work ahead of
+        the first frame.
+        """
+        self._buildEvalPlan()
+        for child in self._children():
+            child.compileRenderPlan()
+
+    def renderReport(self):
+        """
+        Return a tree-shaped report of render timing statistics.
+
+        Each node of the report contains the name and type of the widget,
+        the values reported by `renderStats` and a list of reports for the
+        widgets it contains.
+
+        :returns: The report for this widget and all of its children
+        :rtype: dict
+
+        ..example::
+            report = display.renderReport()
+            report["inclusive"] / report["calls"]  # Average time per frame
+        """
+        return {
+            "name": self.name,
+            "type": self.type,
+            **self._renderStats.asDict(),
+            "children": [c.renderReport() for c in self._children()],
+        }
+
     @abc.abstractmethod
     def _render(self, *args, **kwargs):
         pass  # pragma: no cover
@@ -890,15 +1644,141 @@ class widget(metaclass=abc.ABCMeta):
             "size": len(buffer),
             "max_size": self._bufferSize,
             "changes": changes,
-            "change_ratio": changes / len(buffer) if buffer else 0
+            "change_ratio": changes / len(buffer) if buffer else 0,
+            "runs": len(self._imageBuffer.runs()),
         }
 
 
-_textDefaultFont = bmImageFont(
+_textDefaultFont = fonts.acquire(
     pathlib.Path(__file__).parent / "fonts/hd44780.fnt"
 )
 
 
+# Text measurement caches shared by the text widgets that use a font.  Maps
+# each font to {(lineSpacing, fontMode): (size, character advance)}.
+_measureCaches = WeakKeyDictionary()
+
+
+def _textMeasureCaches(font, lineSpacing, fontMode):
+    # Return the (size, character advance) caches for a font
+    try:
+        byFont = _measureCaches.setdefault(font, {})
+    except TypeError:
+        # Fonts that do not support weak references get private caches
+        byFont = {}
+    key = (lineSpacing, fontMode)
+    caches = byFont.get(key)
+    if caches is None:
+        caches = byFont.setdefault(
+            key, tuple(lruCache(text.MEASURECACHESIZE) for _ in range(2))
+        )
+    return caches
+
+
+def _imageBytes(img):
+    # Approximate memory used by an image (Pillow stores mode '1' images with
+    # a byte per pixel)
+    return img.width * img.height * len(img.getbands())
+
+
+# Rendered text images shared by every text widget.  Keyed by the font,
+# text and drawing settings and limited by the memory the images use.
+_textImages = lruCache(maxSize=None, maxBytes=1 << 20, sizeOf=_imageBytes)
+
+
+class textTiles:
+    """
+    A line of text drawn a tile at a time as it is shown.
+
+    Used by virtual text widgets (see `text`) so that a very long line is
+    never drawn as a single image.  The text is divided on character
+    boundaries into tiles about TILEWIDTH pixels wide.  Tiles are drawn the
+    first time part of them is pasted and the last MAXTILES drawn are kept.
+
+    :param widget: The text widget whose font and settings draw the text
+    :type widget: `text`
+    :param value: The text
+    :type value: str
+    :param settings: The background, foreground, font mode, line spacing and
+        alignment used to draw the text
+    :type settings: tuple
+    """
+
+    # Approximate width in pixels of each tile
+    TILEWIDTH = 256
+
+    # Number of drawn tiles to keep
+    MAXTILES = 8
+
+    def __init__(self, widget, value, settings):
+        self._widget = widget
+        self.font = widget._font
+        self.value = value
+        self.settings = settings
+        self.size = widget._sizeLine(value)
+
+        # Index of the first character and position of each tile
+        advances = widget._advances(set(value))
+        self._starts = [0]
+        self._offsets = [0]
+        x = width = 0
+        for i, c in enumerate(value):
+            if width >= self.TILEWIDTH:
+                self._starts.append(i)
+                self._offsets.append(round(x))
+                width = 0
+            x += advances[c]
+            width += advances[c]
+        self._starts.append(len(value))
+        self._tiles = lruCache(self.MAXTILES)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    @property
+    def stats(self):
+        """
+        Return the usage statistics of the drawn tile cache.
+
+        :rtype: dict
+        """
+        return self._tiles.stats
+
+    def _tile(self, i):
+        tile = self._tiles.get(i)
+        if tile is None:
+            # Each tile spans the advance of its characters so the edge of
+            # its last glyph is not clipped to its own ink width
+            offsets = self._offsets
+            end = offsets[i + 1] if i + 1 < len(offsets) else self.size[0]
+            tile = self._widget._drawText(
+                self.value[self._starts[i] : self._starts[i + 1]],
+                *self.settings,
+                size=(end - offsets[i], self.size[1]),
+            )
+            self._tiles.put(i, tile)
+        return tile
+
+    def paste(self, image, pos):
+        """
+        Paste the part of the text that lands on an image.
+
+        :param image: The image to paste onto
+        :type image: `PIL.Image.Image`
+        :param pos: The position on image of the start of the text
+        :type pos: (int, int)
+        """
+        x, y = pos
+        if y >= image.size[1] or y + self.size[1] <= 0:
+            return
+        offsets = self._offsets
+        i = max(bisect_right(offsets, -x) - 1, 0)
+        while i < len(offsets) and x + offsets[i] < image.size[0]:
+            tile = self._tile(i)
+            image.paste(tile, (x + offsets[i], y), tile)
+            i += 1
+
+
 class text(widget):
     """
     text widget.
@@ -908,18 +1788,71 @@ class text(widget):
     :param value: The value to evaluate
     :type value: str
     :param font: the font that should be used to render the value.  If not supplied
-        a default font will be used which is similar to fonts used on HD44780 style devices
-    :type font: `PIL.ImageFont`
+        a default font will be used which is similar to fonts used on HD44780 style devices.
+        A font file name is loaded through `tinyDisplay.font.fonts` so it is
+        shared with other widgets.  TrueType files are loaded at size 10.
+    :type font: `PIL.ImageFont` or str
     :param lineSpacing: The number of pixels to add between lines of text (default 0)
     :type lineSpacing: int
     :param wrap: Wrap text if true
     :type wrap: bool
+    :param virtual: Draw the text a tile at a time as it is shown instead of
+        as one image (see `textTiles`).  Intended for very long lines
+        scrolled by a `scroll` widget; elsewhere the text is drawn in full.
+    :type virtual: bool
 
     ..note:
         If wrap is True, you must provide a size.  Otherwise wrap is ignored.
+
+    ..note:
+        Once a virtual text widget is placed in a `scroll`, its image only
+        holds the start of the text (up to its width, or
+        `textTiles.TILEWIDTH` if no width was provided) and the scroll pastes
+        the tiles that are visible each frame so memory and drawing time do
+        not grow with the length of the text.  Anywhere else the text is
+        drawn in full.  Virtual is ignored for text that is wrapped or has
+        more than one line.
+
+    ..note:
+        Text measurements are cached in LRU caches shared by every text
+        widget that uses the same font, line spacing and font mode.  Each
+        cache holds up to `text.MEASURECACHESIZE` entries (see
+        `text.setMeasureCacheSize` and `text.measureCacheStats`).
+
+    ..note:
+        Rendered text is kept in a cache shared by every text widget so a
+        string that has already been drawn in the same font, mode, colors,
+        line spacing and alignment is not drawn again.  The cache is limited
+        to `text.IMAGECACHEBYTES` bytes of images (see
+        `text.setImageCacheBytes` and `text.imageCacheStats`).
     """
 
-    NOTDYNAMIC = ["font", "antiAlias", "lineSpacing", "wrap"]
+    NOTDYNAMIC = ["font", "antiAlias", "lineSpacing", "wrap", "virtual"]
+
+    # Capacity of each shared text measurement cache
+    MEASURECACHESIZE = 1024
+
+    # Memory available to the shared rendered text cache
+    IMAGECACHEBYTES = 1 << 20
+
+    __slots__ = (
+        "_value",
+        "_width",
+        "_height",
+        "_font",
+        "_lineSpacing",
+        "_antiAlias",
+        "_wrap",
+        "_virtual",
+        "_tiled",
+        "_tiles",
+        "_cells",
+        "_tsDraw",
+        "_size_cache",
+        "_advance_cache",
+        "_last_value",
+        "_is_bitmap_font",
+    )
 
     def __init__(
         self,
@@ -930,6 +1863,7 @@ class text(widget):
         wrap=False,
         width=None,
         height=None,
+        virtual=False,
         *args,
         **kwargs,
     ):
@@ -942,25 +1876,104 @@ class text(widget):
         )
         self._evalAll()
 
-        # Initialize font
+        # Initialize font.  Fonts given as a file name are shared through
+        # the font registry and released when the widget is discarded.
+        if isinstance(font, (str, os.PathLike)):
+            font = fonts.acquire(font)
+            finalize(self, fonts.release, font)
         self._font = font or _textDefaultFont
         self._lineSpacing = lineSpacing
         self._antiAlias = antiAlias
         self._wrap = wrap
-        
+        self._virtual = virtual
+        self._tiled = False
+        self._tiles = None
+        self._cells = None
+
         # Setup drawing surface
         self._tsDraw = ImageDraw.Draw(Image.new(self._mode, (1, 1)))
         self._tsDraw.fontmode = self._fontMode
 
-        # Pre-initialize caches for better performance
-        self.__dict__['_size_cache'] = {}
-        self.__dict__['_word_width_cache'] = {}
-        self.__dict__['_combined_width_cache'] = {}
-        self.__dict__['_last_value'] = None
-        self.__dict__['_is_bitmap_font'] = "getmetrics" in dir(self._font)
+        # Measurement caches shared with other widgets using this font
+        self._initMeasureCaches()
+        self._last_value = None
+        self._is_bitmap_font = "getmetrics" in dir(self._font)
 
         self.render(reset=True)
 
+    def _initMeasureCaches(self):
+        self._size_cache, self._advance_cache = _textMeasureCaches(
+            self._font, self._lineSpacing, self._fontMode
+        )
+
+    @classmethod
+    def setMeasureCacheSize(cls, size):
+        """
+        Set the capacity of the shared text measurement caches.
+
+        :param size: The maximum number of entries in each cache
+        :type size: int
+        """
+        cls.MEASURECACHESIZE = size
+        for byFont in list(_measureCaches.values()):
+            for caches in byFont.values():
+                for cache in caches:
+                    cache.resize(size)
+
+    @staticmethod
+    def measureCacheStats(reset=False):
+        """
+        Return usage statistics for the shared text measurement caches.
+
+        :param reset: Reset the counts after reading them
+        :type reset: bool
+        :returns: The hits, misses, evictions and size of the line size
+            ('size') and character advance ('advances') caches totalled
+            across every font
+        :rtype: dict
+        """
+        names = ("size", "advances")
+        totals = {
+            n: {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+            for n in names
+        }
+        for byFont in list(_measureCaches.values()):
+            for caches in byFont.values():
+                for n, cache in zip(names, caches):
+                    for k, v in cache.stats.items():
+                        if k in totals[n]:
+                            totals[n][k] += v
+                    if reset:
+                        cache.resetStats()
+        return totals
+
+    @classmethod
+    def setImageCacheBytes(cls, size):
+        """
+        Set the memory available to the shared rendered text cache.
+
+        :param size: The maximum size in bytes of the cached images
+        :type size: int
+        """
+        cls.IMAGECACHEBYTES = size
+        _textImages.resize(maxBytes=size)
+
+    @staticmethod
+    def imageCacheStats(reset=False):
+        """
+        Return usage statistics for the shared rendered text cache.
+
+        :param reset: Reset the counts after reading them
+        :type reset: bool
+        :returns: The hits, misses, evictions, number of images and bytes
+            used by the cache (see `lruCache.stats`)
+        :rtype: dict
+        """
+        stats = _textImages.stats
+        if reset:
+            _textImages.resetStats()
+        return stats
+
     @property
     def font(self):
         """
@@ -968,115 +1981,115 @@ class text(widget):
 
         :returns: The current font used in the text widget
         """
-        if "_font" in dir(self):
-            return self._font
-        return None
+        return getattr(self, "_font", None)
 
     @property
     def _fontMode(self):
-        if "_antiAlias" in dir(self):
-            return "L" if self._antiAlias else "1"
-        return "1"
+        return "L" if getattr(self, "_antiAlias", False) else "1"
 
     def _makeWrapped(self, value, width):
-        # Split the input into words only once
-        vl = value.split(" ")
+        # Break value into lines that fit within width.  Lines break at
+        # spaces and at every newline.  Bitmap fonts do not kern so line
+        # widths are accumulated from the advance of each character and the
+        # text is only scanned once.  Other fonts measure each candidate
+        # line so that kerning between its characters is included.
+        font = self._font
+        kerned = not isinstance(font, bmImageFont) and hasattr(
+            font, "getlength"
+        )
+        if kerned:
+            mode = self._fontMode
+
+            def measure(s):
+                return font.getlength(s, mode)
+
+        else:
+            advances = self._advances(set(value) | {" "})
+            advance = advances.__getitem__
+            space_width = advances[" "]
+
+            def measure(s):
+                return sum(map(advance, s))
+
         lines = []
-        line = ""
-        
-        # Initialize word width cache if needed
-        if not hasattr(self, '_word_width_cache'):
-            self.__dict__['_word_width_cache'] = {}
-            
-        # Cache for combined text sizes to avoid repeated _sizeLine calls
-        if not hasattr(self, '_combined_width_cache'):
-            self.__dict__['_combined_width_cache'] = {}
-            
-        # Get word widths with caching - process all words at once
-        word_widths = {}
-        for w in vl:
-            # Use direct dictionary access for better performance
-            cache = self.__dict__['_word_width_cache']
-            if w not in cache:
-                cache[w] = self._sizeLine(w)[0]
-            word_widths[w] = cache[w]
-        
-        # Cache space width - calculated only once
-        if " " not in self.__dict__['_word_width_cache']:
-            self.__dict__['_word_width_cache'][" "] = self._sizeLine(" ")[0]
-        space_width = self.__dict__['_word_width_cache'][" "]
-        
-        for w in vl:
-            # If the line is empty, just add the word
-            if len(line) == 0:
-                line = w
-                continue
-                
-            # Use a unique key for the combined text
-            combined_key = line + " " + w
-            combined_width_cache = self.__dict__['_combined_width_cache']
-            
-            # Check if we already know the width of this combined text
-            if combined_key not in combined_width_cache:
-                # If not in cache, calculate using individual word widths when possible
-                if line in self.__dict__['_word_width_cache']:
-                    # We can calculate the width without calling _sizeLine again
-                    current_width = self.__dict__['_word_width_cache'][line]
+        for paragraph in value.split("\n"):
+            line = ""
+            line_width = 0
+            for w in paragraph.split(" "):
+                # If the line is empty, just add the word
+                if not line:
+                    line = w
+                    line_width = 0 if kerned else measure(w)
+                    continue
+
+                # Add the word to the current line or start a new line
+                candidate = f"{line} {w}"
+                combined_width = (
+                    measure(candidate)
+                    if kerned
+                    else line_width + space_width + measure(w)
+                )
+                if combined_width <= width:
+                    line = candidate
+                    line_width = combined_width
                 else:
-                    # We need to calculate the width of the current line
-                    current_width = self._sizeLine(line)[0]
-                    self.__dict__['_word_width_cache'][line] = current_width
-                
-                # Calculate the combined width and cache it
-                combined_width = current_width + space_width + word_widths[w]
-                combined_width_cache[combined_key] = combined_width
-            else:
-                # Use cached combined width
-                combined_width = combined_width_cache[combined_key]
-            
-            # Decide whether to add word to current line or start a new line
-            if combined_width <= width:
-                line = combined_key
-            else:
+                    lines.append(line)
+                    line = w
+                    line_width = 0 if kerned else measure(w)
+
+            # Keep the last line unless it is only spaces
+            if line or not paragraph:
                 lines.append(line)
-                line = w
-        
-        # Don't forget the last line
-        if len(line) > 0:
-            lines.append(line)
 
         return "\n".join(lines)
 
+    def _advances(self, chars):
+        """
+        Return the horizontal advance of each character.
+
+        Advances are kept in a cache shared by the text widgets that use
+        the same font.  Bitmap fonts report the advance from their glyph
+        tables and TrueType fonts from `getlength`.
+
+        :param chars: The characters to measure
+        :type chars: set
+        :returns: The advance of each character in pixels
+        :rtype: dict
+        """
+        cache = self._advance_cache
+        font = self._font
+        result = {}
+        for c in chars:
+            a = cache.get(c)
+            if a is None:
+                if isinstance(font, bmImageFont):
+                    a = font.getsize(c)[0]
+                elif hasattr(font, "getlength"):
+                    a = font.getlength(c, self._fontMode)
+                else:
+                    a = self._sizeLine(c)[0]
+                cache.put(c, a)
+            result[c] = a
+        return result
+
     def _sizeLine(self, value):
         # Fast path for empty strings
         if value == "" or value is None:
             return (0, 0)
-            
-        # Use direct dictionary access for caches
-        dict_self = self.__dict__
-            
-        # Initialize cache if needed - using direct dictionary access
-        if '_size_cache' not in dict_self:
-            dict_self['_size_cache'] = {}
-            
-        # Return cached size if text hasn't changed - using direct dictionary access
-        size_cache = dict_self['_size_cache']
-        if value in size_cache:
-            return size_cache[value]
 
-        # Cache font reference to avoid repeated lookups
-        font = dict_self['_font']
-        
-        # Cache whether we're using a bitmap or TrueType font - compute only once
-        if '_is_bitmap_font' not in dict_self:
-            dict_self['_is_bitmap_font'] = "getmetrics" in dir(font)
-            
-        # Cache drawing object - create only once
-        if '_tsDraw' not in dict_self:
-            dict_self['_tsDraw'] = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
-        tsDraw = dict_self['_tsDraw']
+        # Return the cached size if this text has been measured before
+        size_cache = self._size_cache
+        tSize = size_cache.get(value)
+        if tSize is not None:
+            return tSize
 
-        if dict_self['_is_bitmap_font']:
+        font = self._font
+        tsDraw = self._tsDraw
+
+        if isinstance(font, bmImageFont):
+            # Measured from the font's tables exactly as textbbox would
+            tSize = font.multilineSize(value, self._lineSpacing)
+        elif self._is_bitmap_font:
             # Bitmap font path - get metrics once
             ascent, descent = font.getmetrics()
             h = 0
@@ -1096,90 +2109,259 @@ class text(widget):
             tSize = (w, h)
         else:
             # TrueType font path
-            # Cache line spacing to avoid attribute lookup
-            line_spacing = dict_self.get('_lineSpacing', 0)
             bbox = tsDraw.textbbox(
-                (0, 0), value, font=font, spacing=line_spacing
+                (0, 0), value, font=font, spacing=self._lineSpacing
             )
             tSize = (bbox[2] - bbox[0], bbox[3] - bbox[1])
 
         # Ensure valid size
         tSize = (0, 0) if tSize[0] == 0 else tSize
         
-        # Cache the result using direct dictionary access
-        size_cache[value] = tSize
+        # Cache the result in the shared cache
+        size_cache.put(value, tSize)
         return tSize
 
     def _render(self, force=False, newData=False, *args, **kwargs):
-        # Use direct dictionary access for better performance
-        dict_self = self.__dict__
-        
-        # Convert value to string - cache dictionary lookup
-        value = str(dict_self['_value'])
-        
-        # Initialize last_value if needed
-        if '_last_value' not in dict_self:
-            dict_self['_last_value'] = None
-        
+        value = str(self._value)
+
         # Quick return if nothing changed - avoid unnecessary rendering
-        if not newData and not force and value == dict_self.get('_last_value') and 'image' in dict_self:
-            return (dict_self['image'], False)
-            
-        # Update representation value and last value cache
-        dict_self['_reprVal'] = f"'{value}'"
-        dict_self['_last_value'] = value
+        if (
+            not newData
+            and not force
+            and value == self._last_value
+            and self.image is not None
+        ):
+            return (self.image, False)
 
-        # Access width and wrap settings with direct dictionary access
-        width = dict_self.get('_width')
-        
-        # Only wrap if necessary
-        if dict_self.get('_wrap', False) and width is not None:
+        self._reprVal = f"'{value}'"
+        self._last_value = value
+
+        width = self._width
+        if self._wrap and width is not None:
             value = self._makeWrapped(value, width)
 
+        # Text is drawn without anti-aliasing
+        background = self._background
+        foreground = self._foreground
+        fontmode = "1"
+        spacing = self._lineSpacing
+        just_map = {"l": "left", "r": "right", "m": "center"}
+        just = just_map.get(self.just[0], "left")
+
+        # Very long lines are drawn a tile at a time when shown by a scroll
+        if (
+            self._virtual
+            and self._tiled
+            and not self._wrap
+            and "\n" not in value
+        ):
+            return self._renderTiles(
+                value, (background, foreground, fontmode, spacing, just)
+            )
+        self._tiles = None
+
+        # Reuse the image if this text has already been drawn the same way
+        key = (
+            self._font,
+            value,
+            self._mode,
+            foreground,
+            background,
+            spacing,
+            just,
+            fontmode,
+        )
+        try:
+            img = _textImages.get(key)
+        except TypeError:
+            # Unhashable settings (e.g. a color given as a list)
+            img = key = None
+
+        # Monospaced bitmap text only redraws the characters that changed.
+        # The cells are only reused while the widget keeps its size and
+        # justification.
+        cells = self._cells
+        settings = None if key is None else key[:1] + key[2:] + (
+            width,
+            self._height,
+            self._size,
+            self.just,
+        )
+        if (
+            img is None
+            and not force
+            and cells is not None
+            and settings is not None
+            and cells[0] == settings
+            and cells[4] is self.image
+        ):
+            updated = self._renderCells(value, key, cells)
+            if updated is not None:
+                return updated
+
+        if img is None:
+            img = self._drawText(
+                value, background, foreground, fontmode, spacing, just
+            )
+            if key is not None:
+                _textImages.put(key, img)
+
+        # Calculate the final size
+        size = (
+            width if width is not None else img.size[0],
+            self._height if self._height is not None else img.size[1],
+        )
+
+        # Clear and place the image
+        self.clear(size)
+        pos = self._place(wImage=img, just=self.just)
+
+        # Remember how the text was drawn so that later values can be
+        # updated a character at a time
+        self._cells = (
+            None
+            if key is None
+            else (settings, value, pos, img.size, self.image)
+        )
+
+        return (self.image, True)
+
+    def _renderCells(self, value, key, cells):
+        """
+        Update the image by redrawing only the characters that changed.
+
+        Only possible for a single line of the same length as the previous
+        value, drawn in a bitmap font whose glyphs share an advance and stay
+        within their cells.  The redrawn cells are reported by `damage`.
+
+        :param value: The new text
+        :type value: str
+        :param key: The font, text and drawing settings (see _render)
+        :type key: tuple
+        :param cells: The settings, text, position, size and resulting image
+            of the previous render
+        :type cells: tuple
+        :returns: The updated image and True, or None if the text must be
+            drawn in full
+        :rtype: (`PIL.Image`, bool)
+        """
+        settings, previous, (x, y), tSize, image = cells
+        font, _, mode, foreground, background, spacing, just, fontmode = key
+        if (
+            len(value) != len(previous)
+            or "\n" in value
+            or not isinstance(font, bmImageFont)
+        ):
+            return None
+        advance = font.cellWidth(value)
+        if advance is None or advance != font.cellWidth(previous):
+            return None
+
+        changed = [i for i, c in enumerate(value) if c != previous[i]]
+        glyphs = {}
+        for i in changed:
+            c = value[i]
+            if c in glyphs:
+                continue
+            cKey = (font, c) + key[2:]
+            glyph = _textImages.get(cKey)
+            if glyph is None:
+                glyph = self._drawText(
+                    c, background, foreground, fontmode, spacing, just
+                )
+                _textImages.put(cKey, glyph)
+            if glyph.size != (advance, tSize[1]):
+                return None
+            glyphs[c] = glyph
+
+        # Stored frames are never modified so the cells are drawn on a copy
+        img = image.copy()
+        damage = []
+        for i in changed:
+            left = x + i * advance
+            img.paste(glyphs[value[i]], (left, y))
+            if damage and damage[-1][2] == left:
+                damage[-1][2] = left + advance
+            else:
+                damage.append([left, y, left + advance, y + tSize[1]])
+
+        # Report the changed cells clipped to the image
+        w, h = img.size
+        self._damage = (
+            image,
+            [
+                (max(l, 0), max(t, 0), min(r, w), min(b, h))
+                for l, t, r, b in damage
+                if l < w and r > 0 and t < h and b > 0
+            ],
+        )
+        self.image = img
+        self._cells = (settings, value, (x, y), tSize, img)
+        return (img, True)
+
+    def _renderTiles(self, value, settings):
+        """
+        Prepare the tiles of a virtual text widget.
+
+        The tiles are kept while the text and settings stay the same.  Only
+        the start of the text is drawn on the widget's own image.
+
+        :param value: The text
+        :type value: str
+        :param settings: The background, foreground, font mode, line spacing
+            and alignment used to draw the text
+        :type settings: tuple
+        :returns: The widget's image and True
+        :rtype: (`PIL.Image`, bool)
+        """
+        tiles = self._tiles
+        if (
+            tiles is None
+            or tiles.value != value
+            or tiles.settings != settings
+            or tiles.font is not self._font
+        ):
+            tiles = self._tiles = textTiles(self, value, settings)
+
+        width = self._width
+        height = self._height
+        self.clear(
+            (
+                width
+                if width is not None
+                else min(tiles.size[0], textTiles.TILEWIDTH),
+                height if height is not None else tiles.size[1],
+            )
+        )
+        tiles.paste(
+            self.image,
+            self._position(self.image.size, tiles.size, (0, 0), self.just),
+        )
+        self._cells = None
+        return (self.image, True)
+
+    def _drawText(
+        self, value, background, foreground, fontmode, spacing, just, size=None
+    ):
         # Get the text size - this will use the cached size if available
-        tSize = self._sizeLine(value)
-        
-        # Cache the result
-        dict_self['_last_tSize'] = tSize
-        
-        # Get background color directly
-        background = dict_self.get('_background', (0, 0, 0, 0))
-        
+        tSize = size or self._sizeLine(value)
+
         # Create a new image for the text
-        img = Image.new(dict_self['_mode'], tSize, background)
-        
+        img = Image.new(self._mode, tSize, background)
+
         # Only draw text if the image has width
         if img.size[0] != 0:
             d = ImageDraw.Draw(img)
-            
-            # Get the font mode directly
-            d.fontmode = dict_self.get('_fontMode', '1')
-            
-            # Get justification directly
-            just_map = {"l": "left", "r": "right", "m": "center"}
-            just = just_map.get(dict_self.get('just', 'lt')[0], "left")
-            
-            # Draw the text
+            d.fontmode = fontmode
             d.text(
                 (0, 0),
                 value,
-                font=dict_self['_font'],
-                fill=dict_self.get('_foreground', 'white'),
-                spacing=dict_self.get('_lineSpacing', 0),
+                font=self._font,
+                fill=foreground,
+                spacing=spacing,
                 align=just,
             )
-
-        # Calculate the final size
-        size = (
-            width if width is not None else img.size[0],
-            dict_self.get('_height') if dict_self.get('_height') is not None else img.size[1],
-        )
-        
-        # Clear and place the image
-        self.clear(size)
-        self._place(wImage=img, just=dict_self.get('just', 'lt'))
-        
-        return (dict_self['image'], True)
+        return img
 
 
 class progressBar(widget):
@@ -1207,6 +2389,15 @@ class progressBar(widget):
 
     NOTDYNAMIC = ["mask, direction"]
 
+    __slots__ = (
+        "_value",
+        "_range",
+        "_mask",
+        "_direction",
+        "_fill",
+        "_opacity",
+    )
+
     def __init__(
         self,
         value=None,
@@ -1367,6 +2558,24 @@ class marquee(widget):
     """
 
     NOTDYNAMIC = ["widget", "actions"]
+    RENDERSTATE = ["_curPos", "_lastPos"]
+
+    __slots__ = (
+        "_widget",
+        "_actions",
+        "_resetOnChange",
+        "_speed",
+        "_distance",
+        "_moveWhen",
+        "_wait",
+        "_gap",
+        "_timeline",
+        "_curPos",
+        "_lastPos",
+        "_pauses",
+        "_pauseEnds",
+        "_aWI",
+    )
 
     def __init__(
         self,
@@ -1414,6 +2623,9 @@ class marquee(widget):
     def _shouldIMove(self, *args, **kwargs):
         pass  # pragma: no cover
 
+    def _children(self):
+        return [self._widget]
+
     @abc.abstractmethod
     def _computeTimeline(self):
         pass  # pragma: no cover
@@ -1502,11 +2714,47 @@ class marquee(widget):
         self._pauses = []
         self._pauseEnds = []
         self._adjustWidgetSize()
-        tx, ty = self._place(wImage=self._aWI, just=self.just)
+        if self._aWI is None:
+            # Virtual text is pasted a tile at a time (see scroll)
+            tx, ty = self._position(
+                self.image.size, self._aWS, (0, 0), self.just
+            )
+            self._widget._tiles.paste(self.image, (tx, ty))
+        else:
+            tx, ty = self._place(wImage=self._aWI, just=self.just)
         self._curPos = self._lastPos = (tx, ty)
         self._timeline = []
         self._computeTimeline()
 
+    def _nextChange(self, rate):
+        ticks = super()._nextChange(rate)
+        if ticks == 1:
+            return 1
+
+        # Find the next render that moves the widget.  If the marquee waits
+        # (see canvas), reaching or leaving its wait state can also release
+        # or hold other widgets.
+        timeline = self._timeline
+        n = len(timeline)
+        waits = {
+            "atStart": (0,),
+            "atPause": self._pauses,
+            "atPauseEnd": self._pauseEnds,
+        }.get(self._wait)
+        waiting = waits is not None and (self._tick - 1) % n in waits
+        limit = n if ticks is None else min(n, ticks - 1)
+        for r in range(1, limit + 1):
+            i = (self._tick + r - 1) % n
+            if timeline[i] != self._lastPos:
+                return r
+            if waits is not None and (i in waits) != waiting:
+                return r
+        return ticks
+
+    def _skip(self, ticks):
+        super()._skip(ticks)
+        self._tick = (self._tick + ticks) % len(self._timeline)
+
     @staticmethod
     def _withinDisplayArea(pos, d):
         if (
@@ -1566,6 +2814,8 @@ class marquee(widget):
 class slide(marquee):
     """Slides a widget from side to side or top to bottom."""
 
+    __slots__ = ()
+
     def _shouldIMove(self, *args, **kwargs):
         return self._enclosedWithinDisplayArea(
             (
@@ -1641,7 +2891,7 @@ class slide(marquee):
                         distance, a[0], curPos, tickCount
                     )
         else:
-            self.reprVal = "not sliding"
+            self._reprVal = "not sliding"
             self._timeline.append(self._curPos)
 
     def _paintScrolledWidget(self):
@@ -1667,6 +2917,8 @@ class popUp(slide):
     :type delay: (int, int)
     """
 
+    __slots__ = ()
+
     def __init__(
         self, widget=widget, size=(0, 0), delay=(10, 10), *args, **kwargs
     ):
@@ -1708,8 +2960,15 @@ class scroll(marquee):
     :param size: The size of the scrolling container. If not provided, will calculate based on
         scroll direction and contained widget size.
     :type size: (int, int)
+    
+    ..note:
+        When the contained widget is a virtual `text` widget, only the
+        tiles of the text that are visible are drawn and pasted each frame
+        (see `textTiles`).
     """
 
+    __slots__ = ("_movement", "_size_warning_shown", "_aWS")
+
     def __init__(self, actions=[("rtl",)], size=None, *args, **kwargs):
         # Figure out which directions the scroll will move so that we can inform the _computeShadowPlacements method
         dirs = [
@@ -1728,13 +2987,25 @@ class scroll(marquee):
         # Flag to track if we've already warned about missing size
         self._size_warning_shown = False
 
+        # Only a scroll pastes virtual text a tile at a time.  Other
+        # widgets use the text's image so it is drawn in full until then.
+        w = kwargs.get("widget")
+        if isinstance(w, text) and w._virtual:
+            w._tiled = True
+            w.render(force=True)
+
         super().__init__(actions=actions, size=size, *args, **kwargs)
 
+    def _contentSize(self):
+        # Virtual text is only drawn where it is shown so its size comes
+        # from its tiles rather than its image
+        tiles = getattr(self._widget, "_tiles", None)
+        return tiles.size if tiles is not None else self._widget.image.size
+
     def _shouldIMove(self, *args, **kwargs):
         # If no size was provided, adjust size based on scroll direction
         if self.size == (0, 0):
-            widget_width = self._widget.image.size[0]
-            widget_height = self._widget.image.size[1]
+            widget_width, widget_height = self._contentSize()
             
             # For horizontal scrolling, default to a narrower width to force scrolling
             # For vertical scrolling, default to a shorter height to force scrolling
@@ -1750,11 +3021,11 @@ class scroll(marquee):
         # Now check if scrolling is needed - ensure consistent behavior for tests
         # Check horizontal scrolling need
         if ("rtl",) in self._actions or ("ltr",) in self._actions:
-            if self._widget.image.size[0] > self.size[0]:
+            if self._contentSize()[0] > self.size[0]:
                 return True
         # Check vertical scrolling need
         if ("btt",) in self._actions or ("ttb",) in self._actions:
-            if self._widget.image.size[1] > self.size[1]:
+            if self._contentSize()[1] > self.size[1]:
                 return True
         
         return False
@@ -1765,9 +3036,12 @@ class scroll(marquee):
 
         gapX = round(float(gap[0]))
         gapY = round(float(gap[1]))
-        sizeX = self._widget.size[0] + gapX
-        sizeY = self._widget.size[1] + gapY
-        self._aWI = self._widget.image.crop((0, 0, sizeX, sizeY))
+        width, height = self._contentSize()
+        self._aWS = (width + gapX, height + gapY)
+        if getattr(self._widget, "_tiles", None) is not None:
+            self._aWI = None
+        else:
+            self._aWI = self._widget.image.crop((0, 0) + self._aWS)
         
         # If no size was provided, adjust it based on scroll direction
         if self.size == (0, 0):
@@ -1781,8 +3055,7 @@ class scroll(marquee):
                 )
                 self._size_warning_shown = True
             
-            widget_width = self._widget.image.size[0]
-            widget_height = self._widget.image.size[1]
+            widget_width, widget_height = width, height
             
             # For horizontal scrolling, default to a narrower width to force scrolling
             # For vertical scrolling, default to a shorter height to force scrolling
@@ -1811,9 +3084,9 @@ class scroll(marquee):
                     tickCount = self._addPause(a[1], curPos, tickCount)
                 else:
                     aws = (
-                        self._aWI.size[0]
+                        self._aWS[0]
                         if a[0] in ["ltr", "rtl"]
-                        else self._aWI.size[1]
+                        else self._aWS[1]
                     )
                     curPos, tickCount = self._addMovement(
                         aws, a[0], curPos, tickCount
@@ -1840,25 +3113,27 @@ class scroll(marquee):
 
     def _computeShadowPlacements(self):
         lShadows = []
+        aWS = self._aWS
+        wSize = self._contentSize()
         x = (
-            self._curPos[0] - self._aWI.size[0],
+            self._curPos[0] - aWS[0],
             self._curPos[0],
-            self._curPos[0] + self._aWI.size[0],
+            self._curPos[0] + aWS[0],
         )
         y = (
-            self._curPos[1] - self._aWI.size[1],
+            self._curPos[1] - aWS[1],
             self._curPos[1],
-            self._curPos[1] + self._aWI.size[1],
+            self._curPos[1] + aWS[1],
         )
         a = (
-            x[0] + self._widget.size[0] - 1,
-            x[1] + self._widget.size[0] - 1,
-            x[2] + self._widget.size[0] - 1,
+            x[0] + wSize[0] - 1,
+            x[1] + wSize[0] - 1,
+            x[2] + wSize[0] - 1,
         )
         b = (
-            y[0] + self._widget.size[1] - 1,
-            y[1] + self._widget.size[1] - 1,
-            y[2] + self._widget.size[1] - 1,
+            y[0] + wSize[1] - 1,
+            y[1] + wSize[1] - 1,
+            y[2] + wSize[1] - 1,
         )
 
         # Determine which dimensions need to be shadowed
@@ -1877,7 +3152,10 @@ class scroll(marquee):
         self.clear()
         pasteList = self._computeShadowPlacements()
         for p in pasteList:
-            self.image.paste(self._aWI, p, self._aWI)
+            if self._aWI is None:
+                self._widget._tiles.paste(self.image, p)
+            else:
+                self.image.paste(self._aWI, p, self._aWI)
         return self.image
 
 
@@ -1896,6 +3174,15 @@ class image(widget):
 
     NOTDYNAMIC = ["allowedDirs"]
 
+    __slots__ = (
+        "_image",
+        "_url",
+        "_file",
+        "_allowedDirs",
+        "_fetchSet",
+        "_response",
+    )
+
     def __init__(
         self,
         image=None,
@@ -1958,6 +3245,12 @@ class image(widget):
             except queue.Empty:
                 break
 
+    def _nextChange(self, rate):
+        # Images that are still being fetched appear when they arrive
+        if self._url and self._url not in self._cache:
+            return 1
+        return super()._nextChange(rate)
+
     def _render(self, force=False, newData=False, *args, **kwargs):
 
         typeImage = (
@@ -2071,6 +3364,14 @@ class shape(widget):
 
     NOTDYNAMIC = ["shape"]
 
+    __slots__ = (
+        "_shape",
+        "_xy",
+        "_fill",
+        "_outline",
+        "_width",
+    )
+
     def __init__(
         self,
         xy=[],
@@ -2124,6 +3425,8 @@ class line(shape):
     :type width: int
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs, shape="line")
         self.render(reset=True)
@@ -2141,6 +3444,8 @@ class rectangle(shape):
     :type outline: str
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs, shape="rectangle")
         self.render(reset=True)
@@ -2163,9 +3468,12 @@ for k, v in PARAMS.items():
 def create_font(size=14):
     """
     Try to get a default font, with reasonable fallbacks.
+
+    The font is shared through `tinyDisplay.font.fonts` without taking a
+    reference so it does not need to be released.
     """
     try:
-        return ImageFont.truetype("DejaVuSans.ttf", size)
+        return fonts.get("DejaVuSans.ttf", size)
     except IOError:
         # Fall back to default font
         try:
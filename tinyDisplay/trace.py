@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Ron Ritchey and contributors
+# See License.rst for details
+
+"""
+Trace rendering activity in the Chrome trace-event format.
+
+Traces can be loaded into Perfetto (https://ui.perfetto.dev) or
+chrome://tracing to see where the time goes within each frame.
+
+.. versionadded:: 0.1.4
+"""
+import functools
+import json
+import os
+import threading
+from collections import deque
+from time import perf_counter
+
+from tinyDisplay.render.widget import widget
+from tinyDisplay.utility import dataset
+
+
+# Methods that are instrumented while a tracer is running.  They are wrapped
+# wherever they are defined within the widget and dataset class hierarchies.
+_WIDGETSPANS = (
+    "render",
+    "_evalAll",
+    "_render",
+    "_place",
+    "_placeAt",
+    "_composite",
+    "_recomposite",
+    "_computeTimeline",
+)
+_DATASETSPANS = ("_baseUpdate",)
+
+_lock = threading.Lock()
+_activeTracer = None
+
+
+def _subclasses(cls):
+    classes = [cls]
+    for sc in cls.__subclasses__():
+        for c in _subclasses(sc):
+            if c not in classes:
+                classes.append(c)
+    return classes
+
+
+class tracer:
+    """
+    Record nested spans for the render pipeline as Chrome trace events.
+
+    While running, the tracer wraps `render`, `_evalAll`, `_render`,
+    `_place` and `_computeTimeline` for every widget class, the placement
+    and compositing steps of canvases (`_placeAt`, `_composite` and
+    `_recomposite`) and dataset updates.  When stopped, the original methods are restored so
+    there is no cost to the render path when tracing is disabled.
+
+    :param maxEvents: The maximum number of events to retain.  Once full,
+        the oldest events are discarded.
+    :type maxEvents: int
+
+    Example::
+        t = tracer()
+        with t:
+            for _ in range(100):
+                display.render()
+        t.save("frames.json")
+
+    ..note:
+        Only widget classes that have been imported when `start` is called
+        are instrumented.  Only one tracer can run at a time.
+    """
+
+    def __init__(self, maxEvents=100000):
+        self._events = deque(maxlen=maxEvents)
+        self._originals = []
+        self._origin = perf_counter()
+        self._pid = os.getpid()
+
+    @property
+    def running(self):
+        """
+        Return whether this tracer is currently recording.
+
+        :returns: True if recording
+        :rtype: bool
+        """
+        return _activeTracer is self
+
+    def start(self):
+        """
+        Begin recording spans.
+
+        :raises RuntimeError: if another tracer is already running
+        """
+        global _activeTracer
+        with _lock:
+            if _activeTracer is self:
+                return
+            if _activeTracer is not None:
+                raise RuntimeError("A tracer is already running")
+            for cls in _subclasses(widget):
+                self._instrument(cls, _WIDGETSPANS, "widget")
+            for cls in _subclasses(dataset):
+                self._instrument(cls, _DATASETSPANS, "dataset")
+            _activeTracer = self
+
+    def stop(self):
+        """Stop recording spans and restore the original methods."""
+        global _activeTracer
+        with _lock:
+            if _activeTracer is not self:
+                return
+            for cls, name, func in reversed(self._originals):
+                setattr(cls, name, func)
+            self._originals = []
+            _activeTracer = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def clear(self):
+        """Discard all recorded events."""
+        self._events.clear()
+
+    def _instrument(self, cls, names, category):
+        for name in names:
+            if name in cls.__dict__:
+                func = cls.__dict__[name]
+                self._originals.append((cls, name, func))
+                setattr(cls, name, self._wrap(func, cls, name, category))
+
+    def _wrap(self, func, cls, name, category):
+        spanName = (
+            "dataset.update"
+            if category == "dataset"
+            else name if cls is widget else f"{cls.__name__}.{name}"
+        )
+        events = self._events
+        origin = self._origin
+        pid = self._pid
+
+        @functools.wraps(func)
+        def traced(obj, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                end = perf_counter()
+                events.append(
+                    {
+                        "name": spanName,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": (start - origin) * 1e6,
+                        "dur": (end - start) * 1e6,
+                        "pid": pid,
+                        "tid": threading.get_ident(),
+                        "args": (
+                            {"db": args[0] if args else kwargs.get("dbName")}
+                            if category == "dataset"
+                            else {"widget": getattr(obj, "name", None)}
+                        ),
+                    }
+                )
+
+        return traced
+
+    def events(self):
+        """
+        Return the recorded events.
+
+        :returns: The recorded trace events ordered by completion time
+        :rtype: list
+        """
+        return list(self._events)
+
+    def toJSON(self):
+        """
+        Return the recorded events as a Chrome trace-event document.
+
+        :returns: The trace as a JSON string
+        :rtype: str
+        """
+        return json.dumps(
+            {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+        )
+
+    def save(self, filename):
+        """
+        Write the recorded events to a file.
+
+        :param filename: The name of the file to write the trace to
+        :type filename: str
+        """
+        with open(filename, "w") as fp:
+            fp.write(self.toJSON())
@@ -7,17 +7,18 @@ Utility functions to support tinyDisplay.
 
 .. versionadded:: 0.0.1
 """
+import ast
 import builtins
 import logging
 import math
 import os
 import time
 import warnings
-from collections import deque, ChainMap
+from collections import ChainMap, OrderedDict, deque
 from inspect import getfullargspec, getmro
 from pathlib import Path
 from queue import Empty, Full, Queue
-from threading import Event, Thread
+from threading import Condition, Event, Lock, Thread
 
 from PIL import ImageColor
 from simple_pid import PID
@@ -36,6 +37,182 @@ from tinyDisplay.exceptions import (
 
 # from IPython.core.debugger import set_trace
 
+# Notified whenever any dataset is updated so that threads waiting for new
+# data (e.g. an idle animate thread) can wake up
+_datasetUpdated = Condition()
+
+# Functions of the time module that read the clock.  Results computed from
+# _CLOCKFUNCS can change at any moment.  Results computed from _SECONDFUNCS
+# change at most once per second when they are not given a time to convert
+# (the value is the number of arguments that includes that time).
+_CLOCKFUNCS = (
+    "time",
+    "time_ns",
+    "monotonic",
+    "monotonic_ns",
+    "perf_counter",
+    "perf_counter_ns",
+    "process_time",
+)
+_SECONDFUNCS = {"strftime": 2, "localtime": 1, "gmtime": 1, "ctime": 1}
+
+
+def _findDatasets(wid, datasets=None):
+    # Return the distinct datasets used within a widget tree
+    datasets = [] if datasets is None else datasets
+    if not any(wid._dataset is ds for ds in datasets):
+        datasets.append(wid._dataset)
+    for child in wid._children():
+        _findDatasets(child, datasets)
+    return datasets
+
+
+def _dataVersion(datasets):
+    # Total number of updates applied to a list of datasets
+    return sum(ds._updateCount for ds in datasets)
+
+
+class lruCache:
+    """
+    Thread safe cache that discards its least recently used items when full.
+
+    :param maxSize: The maximum number of items to keep (None for no limit)
+    :type maxSize: int
+    :param maxBytes: The maximum total size of the items to keep (None for no
+        limit)
+    :type maxBytes: int
+    :param sizeOf: A function that returns the size in bytes of a value.
+        Required when maxBytes is given.
+    :type sizeOf: callable
+
+    ..note:
+        Lookups and insertions are counted (see stats) so the capacity of a
+        cache can be tuned from the hit rate it achieves.
+
+    ..note:
+        A value that is larger than maxBytes on its own is not cached.
+    """
+
+    def __init__(self, maxSize=1024, maxBytes=None, sizeOf=None):
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = Lock()
+        self._maxSize = maxSize
+        self._maxBytes = maxBytes
+        self._sizeOf = sizeOf
+        self.resetStats()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """
+        Return the value for key, marking it as recently used.
+
+        :param key: The key to look up
+        :param default: The value to return if key is not in the cache
+        :returns: The cached value or default
+        """
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._items.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Add value to the cache, discarding the least recently used items if
+        the cache is full.
+
+        :param key: The key to store value under
+        :param value: The value to cache
+        """
+        size = self._sizeOf(value) if self._sizeOf else 0
+        with self._lock:
+            if self._maxBytes is not None and size > self._maxBytes:
+                return
+            self._bytes += size - self._sizes.pop(key, 0)
+            if size:
+                self._sizes[key] = size
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._trim()
+
+    def clear(self):
+        """Remove every item from the cache."""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def resize(self, maxSize=None, maxBytes=None):
+        """
+        Change the capacity of the cache.
+
+        :param maxSize: The maximum number of items to keep (unchanged if
+            None)
+        :type maxSize: int
+        :param maxBytes: The maximum total size of the items to keep
+            (unchanged if None)
+        :type maxBytes: int
+        """
+        with self._lock:
+            if maxSize is not None:
+                self._maxSize = maxSize
+            if maxBytes is not None:
+                self._maxBytes = maxBytes
+            self._trim()
+
+    def _trim(self):
+        while self._items and (
+            (self._maxSize is not None and len(self._items) > self._maxSize)
+            or (self._maxBytes is not None and self._bytes > self._maxBytes)
+        ):
+            key, _ = self._items.popitem(last=False)
+            self._bytes -= self._sizes.pop(key, 0)
+            self._evictions += 1
+
+    def resetStats(self):
+        """Reset the hit, miss and eviction counts."""
+        self._hits = self._misses = self._evictions = 0
+
+    @property
+    def maxSize(self):
+        """
+        Return the capacity of the cache.
+
+        :rtype: int
+        """
+        return self._maxSize
+
+    @property
+    def stats(self):
+        """
+        Return the cache's usage statistics.
+
+        :returns: The number of hits, misses and evictions since the stats
+            were last reset along with the current and maximum size (in
+            items and bytes)
+        :rtype: dict
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "size": len(self._items),
+            "maxSize": self._maxSize,
+            "bytes": self._bytes,
+            "maxBytes": self._maxBytes,
+        }
+
 
 class animate(Thread):
     """
@@ -54,21 +231,42 @@ class animate(Thread):
     :type args: tuple
     :param kwargs:  The keyworded arguments to pass to the function
     :type kwargs: dict
+    :param widget: The widget that function renders.  When provided, animate
+        stops calling the function while the widget reports that its image
+        cannot change (see `widget.nextChange`) and sleeps until it may
+        change or until a dataset is updated.
+    :type widget: `tinyDisplay.render.widget.widget`
 
     To begin animation, call the start method.  Example::
         a = animate(function=func, cps=10)
         a.start
 
+    To only render when the display can change::
+        a = animate(function=display.render, cps=30, widget=display)
+
     ..note:
         The animate function uses a queue to pass results back.  This allows for the
         results to be consumed asynchronous.  If the queue fills up though,
         the function will no longer be called until space opens up in the queue.
+
+        When a widget is provided, no result is queued for the ticks that are
+        skipped.  The widget is advanced past them (see `widget.skip`) so its
+        animations stay on schedule and `fps` continues to count them.
     """
 
-    def __init__(self, function=None, cps=1, queueSize=100, *args, **kwargs):
+    def __init__(
+        self,
+        function=None,
+        cps=1,
+        queueSize=100,
+        *args,
+        widget=None,
+        **kwargs,
+    ):
         Thread.__init__(self)
         assert function, "You must supply a function to animate"
         self._speed = cps
+        self._widget = widget
 
         Kp = 5
         Ki = 0.2
@@ -122,6 +320,7 @@ class animate(Thread):
     def pause(self):
         """Temporarily pause calling the function."""
         self._event.clear()
+        self._wake()
 
     def restart(self):
         """
@@ -142,6 +341,7 @@ class animate(Thread):
         """Shut down the animate object including terminating its internal thread."""
         self._running = False
         self._event.set()
+        self._wake()
         self.get()
         self.join()
 
@@ -167,6 +367,9 @@ class animate(Thread):
         self._args = args
         self._kwargs = kwargs
 
+        # If needed, wake run if it is waiting for the widget to change
+        self._wake()
+
         # If needed, unblock run if the queue if full
         try:
             self._queue.get_nowait()
@@ -210,6 +413,56 @@ class animate(Thread):
             except Empty:
                 break
 
+    @staticmethod
+    def _wake():
+        # Interrupt _sleepUntilChange
+        with _datasetUpdated:
+            _datasetUpdated.notify_all()
+
+    def _sleepUntilChange(self, changes):
+        """
+        Wait while the animated widget cannot change.
+
+        :param changes: The widget's changed render count before the last call
+        :type changes: int
+        :returns: The number of ticks that were skipped
+        :rtype: int
+        """
+        wid = self._widget
+
+        # Let a changed frame settle before looking ahead
+        if wid._renderStats.changed != changes:
+            return 0
+        ticks = wid.nextChange(rate=self._speed)
+        if ticks == 1:
+            return 0
+
+        datasets = _findDatasets(wid)
+        version = _dataVersion(datasets)
+        limit = None if ticks is None else (ticks - 1) / self._speed
+        start = time.monotonic()
+        with _datasetUpdated:
+            while (
+                self._running
+                and self._event.is_set()
+                and not self._Force
+                and _dataVersion(datasets) == version
+            ):
+                remaining = (
+                    None
+                    if limit is None
+                    else limit - (time.monotonic() - start)
+                )
+                if remaining is not None and remaining <= 0:
+                    break
+                _datasetUpdated.wait(remaining)
+
+        skipped = int((time.monotonic() - start) * self._speed)
+        if ticks is not None:
+            skipped = min(skipped, ticks - 1)
+        wid.skip(skipped)
+        return skipped
+
     def _invoke(self, *args, **kwargs):
         # Invoke function
         if args and kwargs:
@@ -267,6 +520,11 @@ class animate(Thread):
 
             # Disable PID while trying to place new render in queue
             putStart = time.time()
+            changes = (
+                self._widget._renderStats.changed
+                if self._widget is not None
+                else None
+            )
             if self._Force:
                 self._Force = False
                 self._emptyQueue()
@@ -292,12 +550,137 @@ class animate(Thread):
                 except NoResult:
                     pass
 
-            # Correct startLoop to account for time blocked by full queue
+            if self._widget is not None:
+                renderCounter += self._sleepUntilChange(changes)
+
+            # Correct startLoop to account for time blocked by a full queue or
+            # spent waiting for the widget to change
             startLoop = startLoop + (time.time() - putStart)
 
             loopTime = time.time() - startLoop
 
 
+class prerender(Thread):
+    """
+    Render frames for a widget ahead of when they are needed.
+
+    Animations (e.g. marquees) are deterministic until the data they depend
+    upon changes.  prerender renders up to `frames` frames ahead into a
+    queue so that a slow data source or a garbage collection pause does not
+    delay the next frame.  When any dataset used by the widget tree is
+    updated, the queued frames are discarded, the widget tree is rewound to
+    the last frame that was delivered and rendering resumes from there.
+
+    :param widget: The widget (typically a canvas or sequence) to render
+    :type widget: `tinyDisplay.render.widget.widget`
+    :param frames: The number of frames to render ahead
+    :type frames: int
+    :param poll: How often (in seconds) the rendering thread checks for
+        dataset updates while the queue is full
+    :type poll: float
+
+    To begin rendering ahead, call the start method.  Example::
+        p = prerender(widget=display, frames=5)
+        p.start()
+        while True:
+            img, changed = p.render()
+
+    ..note:
+        Once started, the widget tree must only be rendered through
+        `prerender.render`.  Frames can also be rendered ahead without the
+        thread by calling `fill`.
+    """
+
+    def __init__(self, widget=None, frames=5, poll=0.01):
+        Thread.__init__(self, daemon=True)
+        assert widget, "You must supply a widget to prerender"
+        assert frames >= 1, "prerender requires at least one frame"
+        self._widget = widget
+        self._frames = frames
+        self._poll = poll
+
+        self._queue = deque()
+        self._condition = Condition()
+        self._running = True
+        self._datasets = _findDatasets(widget)
+        self._version = _dataVersion(self._datasets)
+
+        # State of the widget tree after the last delivered frame
+        self._state = widget.saveRenderState()
+
+        self.rendered = 0
+        self.discarded = 0
+
+    @property
+    def qsize(self):
+        """
+        Return the number of frames that have been rendered ahead.
+
+        :returns: The number of queued frames
+        :rtype: int
+        """
+        return len(self._queue)
+
+    def _checkForUpdates(self):
+        # Discard queued frames if any dataset has changed since they were rendered
+        version = _dataVersion(self._datasets)
+        if version != self._version:
+            self.discarded += len(self._queue)
+            self._queue.clear()
+            self._widget.restoreRenderState(self._state)
+            self._version = version
+
+    def _renderFrame(self):
+        img, changed = self._widget.render()
+        self._queue.append((img, changed, self._widget.saveRenderState()))
+        self.rendered += 1
+
+    def fill(self):
+        """Render frames until the queue is full."""
+        with self._condition:
+            self._checkForUpdates()
+            while len(self._queue) < self._frames:
+                self._renderFrame()
+
+    def render(self):
+        """
+        Return the next frame.
+
+        :returns: The widget's image and whether it changed since the
+            previously returned frame
+        :rtype: (PIL.Image, bool)
+        """
+        with self._condition:
+            self._checkForUpdates()
+            if not self._queue:
+                self._renderFrame()
+            img, changed, self._state = self._queue.popleft()
+            self._condition.notify()
+        return (img, changed)
+
+    def stop(self):
+        """Shut down the prerender thread."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        """
+        Prerender frames.
+
+        Main loop for the prerender thread
+        """
+        while self._running:
+            with self._condition:
+                self._checkForUpdates()
+                if len(self._queue) < self._frames:
+                    self._renderFrame()
+                else:
+                    self._condition.wait(self._poll)
+
+
 class evaluator:
     """
     Class to compile and evaluate values for a dataset.
@@ -306,6 +689,14 @@ class evaluator:
     :type dataset: `tinyDisplay.utility.dataset`
     """
 
+    __slots__ = (
+        "_dataset",
+        "_localDataset",
+        "_debug",
+        "_logger",
+        "_statements",
+    )
+
     def __init__(self, dataset, localDataset=None, debug=False):
         self._dataset = dataset
         self._localDataset = localDataset if localDataset is not None else {}
@@ -380,7 +771,7 @@ class evaluator:
             try:
                 dv.eval()
                 # Direct attribute access instead of property for better performance
-                if hasattr(dv, "_changed") and dv._changed:
+                if dv._changed:
                     changed = True
             except Exception:
                 # Silently continue on error - matches widget._evalAll behavior
@@ -534,6 +925,9 @@ class dataset:
         # Initialize prev dataset
         self._prevDS = {}
 
+        # Number of updates applied (used to detect changes to the dataset)
+        self._updateCount = 0
+
         # If data was provided during initialization, update the state of the dataset with it
         if dataset:
             for k in dataset:
@@ -1013,6 +1407,9 @@ class dataset:
         self.__dict__[dbName] = db
         self._dataset[dbName] = db
         self._ringBuffer.append({dbName: update})
+        with _datasetUpdated:
+            self._updateCount += 1
+            _datasetUpdated.notify_all()
 
         # If any cache values were for different databases, merge update them
         if len(self._cacheDB) > 0:
@@ -1133,6 +1530,8 @@ class dataset:
 
 Dataset = dataset  # Rename class due to parameter convlict in dynamicValue
 
+_NOVALUE = object()  # Marks a dynamicValue slot that has not been set
+
 
 class dynamicValue:
     """
@@ -1183,6 +1582,7 @@ class dynamicValue:
 
     _allowedBuiltIns["time"] = time
     _allowedBuiltIns["Path"] = Path
+    del m
 
     _allowedMethods = [
         "get",
@@ -1200,6 +1600,27 @@ class dynamicValue:
         "monotonic",
     ]
 
+    # dynamicValues are the most numerous objects in a widget tree so their
+    # state is kept in slots.  prevValue and _changed are left unset until
+    # the first eval.
+    __slots__ = (
+        "name",
+        "_dataset",
+        "_localDataset",
+        "_debug",
+        "_logger",
+        "_heldForIsChanged",
+        "source",
+        "default",
+        "validator",
+        "dynamic",
+        "func",
+        "static",
+        "clock",
+        "prevValue",
+        "_changed",
+    )
+
     def __init__(
         self, name=None, dataset=None, localDataset=None, debug=False
     ):
@@ -1213,13 +1634,7 @@ class dynamicValue:
 
         # Used to support methods that will be called by eval but need to be
         # able to distinguish which object is calling it (e.g. changed)
-        self._holdForIsChanged = {}
-        self._changeID = id(self)
-
-        # Defines allowable functions for compiled statements
-        self._allowedBuiltIns["changed"] = self._isChanged
-        self._allowedBuiltIns["history"] = self._dataset.history
-        self._allowedBuiltIns["store"] = self.store
+        self._heldForIsChanged = _NOVALUE
 
     def store(self, dbName=None, key=None, value=None, when=True):
         """
@@ -1248,16 +1663,9 @@ class dynamicValue:
         raise NoChangeToValue()
 
     def _isChanged(self, value):
-        ret = (
-            False
-            if self._changeID not in self._holdForIsChanged
-            else (
-                True
-                if self._holdForIsChanged.get(self._changeID) != value
-                else False
-            )
-        )
-        self._holdForIsChanged[self._changeID] = value
+        held = self._heldForIsChanged
+        ret = False if held is _NOVALUE else (True if held != value else False)
+        self._heldForIsChanged = value
         return ret
 
     def compile(self, source=None, default=None, validator=None, dynamic=True):
@@ -1302,13 +1710,26 @@ class dynamicValue:
         # If code is string then compile the string, otherwise return code unchanged
         # as it can also be either be a static value or a function
         self.func = None
+        self.clock = None
         if dynamic is True:
             if type(source) is str:
                 warnings.simplefilter("error")
                 try:
                     code = compile(source, "<string>", "eval")
+
+                    # Functions that act on this dynamicValue are given to
+                    # its statement alone so that statements evaluated on
+                    # different threads do not share them
+                    namespace = {"__builtins__": self._allowedBuiltIns}
+                    bound = {
+                        "changed": self._isChanged,
+                        "history": self._dataset.history,
+                        "store": self.store,
+                    }
                     for n in code.co_names:
-                        if (
+                        if n in bound:
+                            namespace[n] = bound[n]
+                        elif (
                             n not in self._allowedBuiltIns
                             and n not in self._allowedMethods
                             and n not in self._dataset
@@ -1318,9 +1739,9 @@ class dynamicValue:
                                 f"While compiling {name} with '{source}': '{n}' is not defined"
                             )
 
-                    self.func = lambda v: eval(
-                        code, {"__builtins__": self._allowedBuiltIns}, v
-                    )
+                    self.func = lambda v: eval(code, namespace, v)
+                    if "time" in code.co_names:
+                        self.clock = _clockResolution(source)
                 except (ValueError, SyntaxError) as ex:
                     raise CompileError(
                         f"While compiling {name} with '{source}' a {ex.__class__.__name__} error occured: {ex}"
@@ -1428,8 +1849,40 @@ class dynamicValue:
         :returns: True if the value of the statement changed during the last
             evaluation of it.
         """
-        # Direct dictionary access is faster than hasattr
-        return self.__dict__.get("_changed", False)
+        return getattr(self, "_changed", False)
+
+
+def _clockResolution(source):
+    """
+    Determine how often the value of an expression can change with time.
+
+    :param source: The expression to examine
+    :type source: str
+    :returns: None if the expression does not read the clock, 0 if its value
+        can change at any moment or 1 if it changes at most once per second
+    :rtype: int
+    """
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        return None
+
+    resolution = None
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "time"
+        ):
+            continue
+        name = node.func.attr
+        if name in _CLOCKFUNCS:
+            return 0
+        nArgs = len(node.args) + len(node.keywords)
+        if name in _SECONDFUNCS and nArgs < _SECONDFUNCS[name]:
+            resolution = 1
+    return resolution
 
 
 def image2Text(img, background="black"):
@@ -1551,3 +2004,19 @@ def getNotDynamicDecendents(c):
             for arg in i.NOTDYNAMIC:
                 args.append(arg)
     return args
+
+
+def getRenderStateDecendents(c):
+    """
+    Retrieve all of the RENDERSTATE attributes for all descendent classes.
+
+    :param c: The class to search
+    :type c: `class`
+    :returns: A list of attribute names
+    """
+    attrs = []
+    for i in getmro(c):
+        for attr in i.__dict__.get("RENDERSTATE", []):
+            if attr not in attrs:
+                attrs.append(attr)
+    return attrs